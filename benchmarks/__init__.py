@@ -0,0 +1,7 @@
+"""
+Performance benchmarks for ETS2 Truck Companion
+
+Run from the repository root, e.g. ``python -m benchmarks.payload_fanout``.
+``python -m benchmarks.http_bench --json run.json`` covers every web route;
+pass ``--baseline run.json`` on a later run to fail on regressions.
+"""
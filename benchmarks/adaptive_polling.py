@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+CPU cost of fixed vs adaptive monitor polling over a replayed session
+
+Replays a scripted session in real time (highway, highway with the
+dashboard open, town, parked, engine off, paused, highway again) through
+the background monitor, once with the fixed rates and once with
+core/poll_policy.py, and reports process CPU time, full frames per second
+in each phase and how long the monitor took to notice each phase change.
+
+    python -m benchmarks.adaptive_polling [--phase-seconds 4]
+"""
+
+import argparse
+import struct
+import time
+
+from config import Config
+from core.background_monitor import BackgroundMonitor
+from core.poll_policy import PollPolicy
+from benchmarks.synthetic import build_controller, make_telemetry
+
+# (name, telemetry overrides, dashboard open, truck standing still)
+SESSION = [
+    ('highway', {'speed': 88.0}, False, False),
+    ('highway+dash', {'speed': 88.0}, True, False),
+    ('town', {'speed': 35.0}, False, False),
+    ('parked', {'speed': 0.0, 'parkBrake': True}, False, True),
+    ('engine off', {'speed': 0.0, 'parkBrake': True, 'engineEnabled': False}, False, True),
+    ('paused', {'paused': True}, False, True),
+    ('highway', {'speed': 88.0}, False, False),
+]
+PHASE_OFFSET = 0.037
+
+
+class ReplayReader:
+    """Serves the scripted session by wall-clock time, noting every read"""
+
+    def __init__(self, phase_seconds):
+        self.phase_seconds = phase_seconds
+        self.start = None
+        self.full_reads = []  # (time, phase index)
+        self.position_reads = 0
+        self.marker_reads = 0
+
+    def is_connected(self):
+        return True
+
+    def _state(self):
+        now = time.perf_counter()
+        index = min(int((now - self.start) / self.phase_seconds), len(SESSION) - 1)
+        _, overrides, _, frozen = SESSION[index]
+        # A standing or paused truck keeps the position it stopped at
+        t = index * self.phase_seconds if frozen else now - self.start
+        telemetry = make_telemetry(t * 20)
+        telemetry.update(overrides)
+        return now, index, telemetry
+
+    def read_telemetry(self):
+        now, index, telemetry = self._state()
+        self.full_reads.append((now, index))
+        return telemetry
+
+    def read_coordinates(self):
+        self.position_reads += 1
+        _, _, telemetry = self._state()
+        return {'x': telemetry['coordinateX'], 'y': telemetry['coordinateY'],
+                'z': telemetry['coordinateZ'], 'timestamp': telemetry['timestamp']}
+
+    def read_frame_marker(self):
+        self.marker_reads += 1
+        _, _, t = self._state()
+        return struct.pack('<?f???dd', t['paused'], t['speed'], t['parkBrake'],
+                           t['electricEnabled'], t['engineEnabled'], t['coordinateX'], t['coordinateZ'])
+
+
+def replay(adaptive, phase_seconds):
+    controller, _, _ = build_controller()
+    reader = ReplayReader(phase_seconds)
+    monitor = BackgroundMonitor(reader, controller)
+    monitor.policy = PollPolicy() if adaptive else None
+
+    # Phase changes land 37 ms off the monitor's tick grid, as they would in a game
+    reader.start = time.perf_counter() - PHASE_OFFSET
+    monitor.start()
+    cpu = []
+    for index, (_, _, dashboard, _) in enumerate(SESSION):
+        phase_end = reader.start + (index + 1) * phase_seconds
+        cpu_start = time.process_time()
+        while time.perf_counter() < phase_end:
+            if dashboard and monitor.policy:
+                monitor.policy.note_viewer()  # the page polls /api/status twice a second
+            time.sleep(min(0.5, max(0.0, phase_end - time.perf_counter())))
+        cpu.append(time.process_time() - cpu_start)
+    monitor.stop()
+
+    frames = [0] * len(SESSION)
+    noticed = [None] * len(SESSION)
+    for t, index in reader.full_reads:
+        frames[index] += 1
+        if noticed[index] is None:
+            noticed[index] = t - (reader.start + index * phase_seconds)
+    return {
+        'cpu': cpu,
+        'frames': frames,
+        'noticed': noticed,
+        'positions': reader.position_reads,
+        'markers': reader.marker_reads,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--phase-seconds', type=float, default=4)
+    args = parser.parse_args()
+
+    # Scale the viewer timeout to the compressed phases
+    Config.POLL_VIEWER_TIMEOUT = min(Config.POLL_VIEWER_TIMEOUT, args.phase_seconds / 4)
+    fixed = replay(False, args.phase_seconds)
+    adaptive = replay(True, args.phase_seconds)
+
+    seconds = args.phase_seconds
+    print(f"\n{len(SESSION)} phases x {seconds:g} s: full frames/s, monitor CPU (ms per second) "
+          f"and delay from each phase change to its first frame (ms)")
+    print(f"{'phase':<14} {'frames/s':>15} {'CPU ms/s':>15} {'noticed after':>15}")
+    print(f"{'':<14} {'fixed':>7} {'adapt':>7} {'fixed':>7} {'adapt':>7} {'fixed':>7} {'adapt':>7}")
+    for i, (name, _, _, _) in enumerate(SESSION):
+        delays = ['-' if r['noticed'][i] is None else f"{r['noticed'][i] * 1000:.0f}"
+                  for r in (fixed, adaptive)]
+        print(f"{name:<14} {fixed['frames'][i] / seconds:>7.1f} {adaptive['frames'][i] / seconds:>7.1f} "
+              f"{fixed['cpu'][i] / seconds * 1000:>7.2f} {adaptive['cpu'][i] / seconds * 1000:>7.2f} "
+              f"{delays[0] if i else '':>7} {delays[1] if i else '':>7}")
+    total = seconds * len(SESSION)
+    for label, r in (('fixed', fixed), ('adaptive', adaptive)):
+        cpu = sum(r['cpu'])
+        print(f"{label:<9} CPU {cpu * 1000:5.0f} ms ({cpu / total:.2%} of one core), "
+              f"{sum(r['frames'])} full frames, {r['positions']} position reads, {r['markers']} marker reads")
+    print(f"adaptive / fixed CPU over the session: {sum(adaptive['cpu']) / sum(fixed['cpu']):.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Per-tick cost of the compiled alert rule engine
+
+Evaluates the default rules and a generated set of 100 rules (damage,
+RPM, cruise deviation, fuel...) against 60 Hz synthetic telemetry.
+
+    python -m benchmarks.alert_rules [--seconds 60]
+"""
+
+import argparse
+import time
+
+from config import Config
+from core.alert_rules import AlertRuleEngine
+from benchmarks.synthetic import make_telemetry
+
+_FIELDS = [
+    ('speedOverLimit', '>', 5), ('engineRpm', '>', 1450), ('cruiseDeviation', '>', 8),
+    ('wearEngine', '>', 0.2), ('wearWheels', '>', 0.3), ('wearMax', '>', 0.5),
+    ('fuelRatio', '<', 0.1), ('cargoDamage', '>', 0.05), ('speed', '>', 85),
+    ('routeDistance', '<', 5000),
+]
+
+
+def generate_rules(count):
+    rules = []
+    for i in range(count):
+        field, op, threshold = _FIELDS[i % len(_FIELDS)]
+        rules.append({
+            'id': f'rule{i}', 'field': field, 'op': op,
+            'threshold': threshold * (1 + (i // len(_FIELDS)) * 0.05),
+            'hysteresis': abs(threshold) * 0.02, 'cooldown': 30,
+            'message': f'{field} alert {{{field}}}',
+        })
+    return rules
+
+
+def run(rules, seconds, hz=60):
+    engine = AlertRuleEngine(rules, Config.ALERT_COOLDOWN_SECONDS)
+    frames = [make_telemetry(i / hz) for i in range(int(seconds * hz))]
+    fired = 0
+    start = time.perf_counter()
+    for frame in frames:
+        fired += len(engine.evaluate(frame, frame['timestamp']))
+    elapsed = time.perf_counter() - start
+    return elapsed / len(frames) * 1e6, fired
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--seconds', type=float, default=60)
+    args = parser.parse_args()
+
+    budget_us = 1e6 / 60
+    print(f"{'rules':>6} {'us/tick':>9} {'% of 60 Hz budget':>19} {'alerts':>7}")
+    for name, rules in (('default', Config.DEFAULT_ALERT_RULES), ('100', generate_rules(100))):
+        per_tick, fired = run(rules, args.seconds)
+        print(f"{name:>6} {per_tick:>9.1f} {per_tick / budget_us * 100:>18.2f}% {fired:>7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+Throughput and latency of every web route, in-process and over a socket
+
+Builds a synthetic state once (large station catalog, travel log with
+history and a recorded route, telemetry ticking from the fake reader), then
+drives each route with N concurrent clients: through the Flask test client
+('inprocess', handler and framework cost only) and against the production
+server in a child process ('socket', including HTTP parsing and the
+network stack). Results can be written as JSON and compared against an
+earlier run; the exit status is 1 if a route regressed beyond --tolerance.
+
+    python -m benchmarks.http_bench [--modes inprocess,socket] [--concurrency 1,8]
+        [--seconds 1] [--routes travel] [--json out.json]
+        [--baseline base.json] [--tolerance 0.25]
+"""
+
+import argparse
+import http.client
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+MODES = ('inprocess', 'socket')
+
+# (name, method, path, JSON body); every rule in web/routes.py must appear here
+REQUESTS = [
+    ('index', 'GET', '/', None),
+    ('status', 'GET', '/api/status', None),
+    ('stations', 'GET', '/api/stations/france', None),
+    ('cities', 'GET', '/api/cities/france', None),
+    ('random_station', 'GET', '/api/random_station', None),
+    ('coordinates', 'GET', '/api/coordinates', None),
+    ('set_playing_station', 'POST', '/api/set_playing_station',
+     {'station': {'name': 'Station 0-1', 'stream_url': 'https://stream.example.invalid/0/1.mp3'}}),
+    ('stop_playing', 'POST', '/api/stop_playing', None),
+    ('telemetry', 'GET', '/api/telemetry', None),
+    ('telemetry_delta', 'GET', '/api/telemetry/delta?since=1', None),
+    ('telemetry_history', 'GET', '/api/telemetry/history?points=300', None),
+    ('alerts', 'GET', '/api/alerts', None),
+    ('travel_stats', 'GET', '/api/travel/stats', None),
+    ('travel_recent', 'GET', '/api/travel/recent?limit=50&country=germany', None),
+    ('travel_jobs', 'GET', '/api/travel/jobs?limit=20', None),
+    ('travel_analytics', 'GET', '/api/travel/analytics', None),
+    ('travel_heatmap', 'GET', '/api/travel/heatmap?zoom=2', None),
+    ('travel_route', 'GET', '/api/travel/route?session=1&zoom=3', None),
+    ('travel_track', 'GET', '/api/travel/track?from=0&to=1e12', None),
+    ('travel_export', 'GET', '/api/travel/export?tables=fines', None),
+    ('travel_db', 'GET', '/api/travel/db', None),
+    ('settings', 'GET', '/api/settings', None),
+    ('settings_update', 'POST', '/api/settings', {'volume': 0.8}),
+    ('metrics', 'GET', '/metrics', None),
+    ('trace', 'GET', '/api/debug/trace?seconds=1', None),
+]
+
+HEADERS = {'Accept-Encoding': 'gzip'}
+
+# Endpoints left out: debug_profile blocks for a requested duration, and
+# reload_stations fetches the catalog from a third-party site (flooding it
+# under load) and swaps the live catalog mid-run
+UNBENCHED = {'radio_routes.debug_profile', 'radio_routes.reload_stations'}
+
+
+def build_state(workdir, visits, jobs, fines):
+    """Write the station catalog and travel log used by load_state()"""
+    from benchmarks.synthetic import generate_travel_log, write_station_catalog
+    from benchmarks.track_storage import synthetic_route
+    from data.travel_log import TravelLog
+
+    write_station_catalog(os.path.join(workdir, 'stations.json'))
+    path = os.path.join(workdir, 'travel_log.db')
+    generate_travel_log(path, visits=visits, jobs=jobs, fines=fines)
+    log = TravelLog(path)
+    log.start_session()
+    for t, x, z in synthetic_route(2, 1, time.time() - 3 * 3600):
+        log.record_position(t, x, z)
+    log.end_session()
+    log.close()
+
+
+def load_state(workdir, hz=10):
+    """Controller and app over build_state() output, with telemetry ticking at `hz`
+
+    Also returns a stop() that ends the ticking and closes the travel log.
+    """
+    from benchmarks.synthetic import FakeReader
+    from core.radio_controller import RadioController
+    from data.city_database import ETS2CityDatabase
+    from data.settings import SettingsManager
+    from data.station_manager import StationManager
+    from data.travel_log import TravelLog
+    from web.app import create_app
+
+    reader = FakeReader()
+    controller = RadioController(
+        ETS2CityDatabase(), StationManager(os.path.join(workdir, 'stations.json')), reader)
+    controller.travel_log = TravelLog(os.path.join(workdir, 'travel_log.db'))
+    controller.settings_manager = SettingsManager(os.path.join(workdir, 'settings.json'))
+    controller.initialize()
+
+    stopped = threading.Event()
+
+    def tick():
+        while not stopped.is_set():
+            controller.update_telemetry(reader.read_telemetry())
+            stopped.wait(1 / hz)
+
+    thread = threading.Thread(target=tick, daemon=True)
+    thread.start()
+
+    def stop():
+        stopped.set()
+        thread.join()
+        controller.cleanup()
+
+    return controller, create_app(controller), stop
+
+
+def check_coverage(app):
+    """Rules in web/routes.py that REQUESTS does not exercise"""
+    adapter = app.url_map.bind('localhost')
+    covered = {(adapter.match(path.split('?')[0], method)[0], method)
+               for _, method, path, _ in REQUESTS}
+    return [f"{method} {rule.rule}"
+            for rule in app.url_map.iter_rules()
+            if rule.endpoint.startswith('radio_routes.') and rule.endpoint not in UNBENCHED
+            for method in sorted(rule.methods - {'HEAD', 'OPTIONS'})
+            if (rule.endpoint, method) not in covered]
+
+
+def _summary(latencies, errors, nbytes, seconds):
+    latencies.sort()
+    count = len(latencies)
+
+    def pct(p):
+        return round(latencies[min(count - 1, int(count * p))] * 1000, 3) if count else None
+
+    return {
+        'requests': count,
+        'rps': round(count / seconds, 1),
+        'p50_ms': pct(0.50),
+        'p90_ms': pct(0.90),
+        'p99_ms': pct(0.99),
+        'max_ms': round(latencies[-1] * 1000, 3) if count else None,
+        'errors': errors,
+        'bytes': nbytes // count if count else 0,
+    }
+
+
+def _drive(client_fn, concurrency, seconds):
+    """Run client_fn(deadline, record) on `concurrency` threads"""
+    latencies = []
+    totals = {'errors': 0, 'bytes': 0}
+    lock = threading.Lock()
+
+    def record(latency, nbytes, ok):
+        with lock:
+            if ok:
+                latencies.append(latency)
+                totals['bytes'] += nbytes
+            else:
+                totals['errors'] += 1
+
+    deadline = time.perf_counter() + seconds
+    threads = [threading.Thread(target=client_fn, args=(deadline, record)) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return _summary(latencies, totals['errors'], totals['bytes'], time.perf_counter() - start)
+
+
+def bench_inprocess(app, method, path, body, concurrency, seconds):
+    def client(deadline, record):
+        test_client = app.test_client()
+        while time.perf_counter() < deadline:
+            begin = time.perf_counter()
+            response = test_client.open(path, method=method, json=body, headers=HEADERS)
+            data = response.get_data()
+            response.close()
+            record(time.perf_counter() - begin, len(data), response.status_code < 400)
+
+    return _drive(client, concurrency, seconds)
+
+
+def bench_socket(port, method, path, body, concurrency, seconds):
+    payload = json.dumps(body).encode('utf-8') if body is not None else None
+    headers = dict(HEADERS, **({'Content-Type': 'application/json'} if payload else {}))
+
+    def client(deadline, record):
+        conn = None
+        while time.perf_counter() < deadline:
+            if conn is None:
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+            begin = time.perf_counter()
+            try:
+                conn.request(method, path, body=payload, headers=headers)
+                response = conn.getresponse()
+                data = response.read()
+            except (OSError, http.client.HTTPException):
+                record(0, 0, False)
+                conn.close()
+                conn = None
+                continue
+            record(time.perf_counter() - begin, len(data), response.status < 400)
+            if response.will_close:
+                conn.close()
+                conn = None
+        if conn is not None:
+            conn.close()
+
+    return _drive(client, concurrency, seconds)
+
+
+def _wait_ready(port, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            conn.request('GET', '/api/coordinates')
+            conn.getresponse().read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server on port {port} did not start")
+
+
+def serve(workdir, port):
+    """Child process: serve the synthetic state until terminated"""
+    import signal
+    from web import server
+
+    _, app, _ = load_state(workdir)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    server.serve(app, '127.0.0.1', port, 'production')
+
+
+def compare(results, baseline, tolerance):
+    """Regressions of `results` against `baseline` (both lists of result rows)"""
+    previous = {(r['mode'], r['route'], r['concurrency']): r for r in baseline}
+    regressions = []
+    for r in results:
+        base = previous.get((r['mode'], r['route'], r['concurrency']))
+        if not base:
+            continue
+        label = f"{r['mode']} {r['route']} x{r['concurrency']}"
+        if not r['requests']:
+            # A route that now fails on every request has no latency to compare
+            regressions.append(f"{label}: no successful requests ({r['errors']} errors)")
+            continue
+        if r['errors'] > base['errors']:
+            regressions.append(f"{label}: {r['errors']} errors (was {base['errors']})")
+        if not base['requests']:
+            continue
+        if r['rps'] < base['rps'] * (1 - tolerance):
+            regressions.append(f"{label}: {r['rps']:,.0f} req/s (was {base['rps']:,.0f})")
+        if r['p99_ms'] > base['p99_ms'] * (1 + tolerance):
+            regressions.append(f"{label}: p99 {r['p99_ms']:.2f} ms (was {base['p99_ms']:.2f})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--modes', default=','.join(MODES))
+    parser.add_argument('--concurrency', default='1,8')
+    parser.add_argument('--seconds', type=float, default=1.0, help='per route and concurrency')
+    parser.add_argument('--routes', default='', help='only routes whose name contains this')
+    parser.add_argument('--visits', type=int, default=200_000)
+    parser.add_argument('--jobs', type=int, default=5_000)
+    parser.add_argument('--fines', type=int, default=2_000)
+    parser.add_argument('--port', type=int, default=5098)
+    parser.add_argument('--json', help='write results to this file')
+    parser.add_argument('--baseline', help='earlier --json output to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--serve', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.port)
+        return 0
+
+    workdir = tempfile.mkdtemp(prefix='ets2-bench-')
+    print(f"Building synthetic state in {workdir}...")
+    build_state(workdir, args.visits, args.jobs, args.fines)
+    requests = [r for r in REQUESTS if args.routes in r[0]]
+    concurrency = [int(c) for c in args.concurrency.split(',')]
+    results = []
+
+    print(f"{'mode':<10} {'route':<20} {'conc':>4} {'req/s':>9} {'p50 ms':>8} "
+          f"{'p90 ms':>8} {'p99 ms':>8} {'bytes':>8} {'errors':>6}")
+
+    def report(mode, name, conc, row):
+        row = {'mode': mode, 'route': name, 'concurrency': conc, **row}
+        results.append(row)
+        print(f"{mode:<10} {name:<20} {conc:>4} {row['rps']:>9,.0f} {row['p50_ms'] or 0:>8.2f} "
+              f"{row['p90_ms'] or 0:>8.2f} {row['p99_ms'] or 0:>8.2f} {row['bytes']:>8,} {row['errors']:>6}")
+
+    modes = args.modes.split(',')
+    if 'inprocess' in modes:
+        _, app, stop = load_state(workdir)
+        missing = check_coverage(app)
+        if missing:
+            print(f"⚠️ Routes without a benchmark request: {', '.join(missing)}")
+        try:
+            for name, method, path, body in requests:
+                for conc in concurrency:
+                    report('inprocess', name, conc, bench_inprocess(app, method, path, body, conc, args.seconds))
+        finally:
+            # Socket mode's server must be the only process ticking and writing the travel log
+            stop()
+
+    if 'socket' in modes:
+        child = subprocess.Popen(
+            [sys.executable, '-m', 'benchmarks.http_bench', '--serve', workdir, '--port', str(args.port)],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, cwd=os.getcwd(),
+        )
+        try:
+            _wait_ready(args.port)
+            for name, method, path, body in requests:
+                for conc in concurrency:
+                    report('socket', name, conc, bench_socket(args.port, method, path, body, conc, args.seconds))
+        finally:
+            child.terminate()
+            child.wait(timeout=15)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({
+                'meta': {
+                    'python': platform.python_version(),
+                    'platform': platform.platform(),
+                    'cpus': os.cpu_count(),
+                    'seconds': args.seconds,
+                    'visits': args.visits,
+                    'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                },
+                'results': results,
+            }, f, indent=2)
+        print(f"Results written to {args.json}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f)['results'], args.tolerance)
+        for line in regressions:
+            print(f"❌ {line}")
+        if regressions:
+            return 1
+        print(f"✅ No regressions beyond {args.tolerance:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
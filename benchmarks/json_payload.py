@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Serialization time and wire bytes for the status payload
+
+Times the stdlib encoder against utils.json_helpers (orjson when installed)
+on get_status() and on the full station catalog, then the size and cost of
+gzip at the levels worth considering for per-request compression.
+
+    python -m benchmarks.json_payload [--countries 40] [--per-country 60]
+"""
+
+import argparse
+import gzip
+import json
+import time
+
+from benchmarks.synthetic import build_controller
+from utils.json_helpers import JSON_BACKEND, dumps
+
+GZIP_LEVELS = (1, 6, 9)
+
+
+def _per_call_ms(fn, min_seconds=0.5):
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        fn()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return elapsed / calls * 1000.0
+
+
+def run(countries, per_country):
+    controller, reader, _ = build_controller(countries=countries, per_country=per_country)
+    controller.update_telemetry(reader.read_telemetry())
+    payloads = {
+        'status': controller.get_status(),
+        'catalog': controller.station_manager.get_all_stations(),
+    }
+    results = []
+    for name, data in payloads.items():
+        body = dumps(data)
+        row = {
+            'payload': name,
+            'bytes': len(body),
+            'stdlib_ms': _per_call_ms(lambda: json.dumps(data).encode('utf-8')),
+            'fast_ms': _per_call_ms(lambda: dumps(data)),
+        }
+        for level in GZIP_LEVELS:
+            row[f'gzip{level}_bytes'] = len(gzip.compress(body, compresslevel=level, mtime=0))
+            row[f'gzip{level}_ms'] = _per_call_ms(lambda: gzip.compress(body, compresslevel=level, mtime=0))
+        results.append(row)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--countries', type=int, default=40)
+    parser.add_argument('--per-country', type=int, default=60)
+    args = parser.parse_args()
+
+    print(f"encoder: {JSON_BACKEND}")
+    print(f"{'payload':<8} {'bytes':>9} {'stdlib ms':>10} {'fast ms':>8} "
+          + ' '.join(f"{f'gzip{lv} B':>9} {f'gzip{lv} ms':>9}" for lv in GZIP_LEVELS))
+    for r in run(args.countries, args.per_country):
+        print(f"{r['payload']:<8} {r['bytes']:>9,} {r['stdlib_ms']:>10.3f} {r['fast_ms']:>8.3f} "
+              + ' '.join(f"{r[f'gzip{lv}_bytes']:>9,} {r[f'gzip{lv}_ms']:>9.3f}" for lv in GZIP_LEVELS))
+
+
+if __name__ == '__main__':
+    main()
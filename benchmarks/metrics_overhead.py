@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Per-call cost of the /metrics and tracing instrumentation
+
+Times Histogram.observe_ns, Counter.inc, Tracer.record, an uncontended
+TimedLock against a plain threading.Lock, and update_telemetry on the
+synthetic controller, to show the share of a 60 Hz frame budget the
+instrumentation takes.
+
+    python -m benchmarks.metrics_overhead [--calls 200000]
+"""
+
+import argparse
+import threading
+import time
+
+from utils.metrics import Counter, Histogram, TimedLock, REGISTRY
+from utils.tracing import Tracer
+from benchmarks.synthetic import build_controller
+
+
+def _ns_per_call(fn, calls):
+    start = time.perf_counter_ns()
+    fn(calls)
+    return (time.perf_counter_ns() - start) / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--calls', type=int, default=200_000)
+    args = parser.parse_args()
+
+    histogram = Histogram((0.001, 0.01, 0.1))
+    counter = Counter()
+    plain = threading.Lock()
+    timed = TimedLock(Histogram((0.001,)))
+    tracer = Tracer(capacity=4096, enabled=True)
+    span = tracer.name('bench', 'bench')
+
+    def observe(n):
+        for i in range(n):
+            histogram.observe_ns(i)
+
+    def inc(n):
+        for _ in range(n):
+            counter.inc()
+
+    def trace(n):
+        for i in range(n):
+            tracer.record(span, i, i + 1)
+
+    def lock_plain(n):
+        for _ in range(n):
+            with plain:
+                pass
+
+    def lock_timed(n):
+        for _ in range(n):
+            with timed:
+                pass
+
+    controller, reader, _ = build_controller()
+    frames = [reader.read_telemetry() for _ in range(2000)]
+
+    def update(n):
+        for i in range(n):
+            controller.update_telemetry(frames[i % len(frames)])
+
+    print(f"{'operation':<28} {'ns/call':>9}")
+    for name, fn, calls in (
+        ('Histogram.observe_ns', observe, args.calls),
+        ('Counter.inc', inc, args.calls),
+        ('Tracer.record', trace, args.calls),
+        ('threading.Lock', lock_plain, args.calls),
+        ('TimedLock (uncontended)', lock_timed, args.calls),
+        ('update_telemetry', update, 2000),
+    ):
+        print(f"{name:<28} {_ns_per_call(fn, calls):>9,.0f}")
+
+    frame_budget_ns = 1e9 / 60
+    per_frame = 6  # histogram observations and spans each, on the monitor path per frame
+    cost = per_frame * (_ns_per_call(observe, args.calls) + _ns_per_call(trace, args.calls))
+    print(f"\n~{per_frame} observations and {per_frame} spans per frame at 60 Hz: "
+          f"{cost / frame_budget_ns:.4%} of the frame budget")
+    print(f"/metrics render: {len(REGISTRY.render()):,} bytes")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Monitor loop pacing at 60 Hz: sleep-after-work against the fixed-rate scheduler
+
+Runs the monitor against the synthetic telemetry source for a few seconds
+per variant and reports the achieved rate, drift from the ideal tick count
+and how evenly spaced the frames were. --spike-ms adds a slow frame every
+--spike-every frames to exercise the overrun policies.
+
+    python -m benchmarks.monitor_scheduler [--hz 60] [--seconds 5]
+        [--spike-ms 40 --spike-every 120]
+"""
+
+import argparse
+import threading
+import time
+
+from config import Config
+from core.background_monitor import BackgroundMonitor
+from benchmarks.synthetic import build_controller
+
+
+class TimedReader:
+    """Wraps the fake reader, noting when each frame was read"""
+
+    def __init__(self, reader, spike_ms=0.0, spike_every=0):
+        self._reader = reader
+        self.reads = []
+        self._spike = spike_ms / 1000
+        self._spike_every = spike_every
+
+    def is_connected(self):
+        return True
+
+    def _read(self, fn):
+        now = time.perf_counter()
+        self.reads.append(now)
+        if self._spike_every and len(self.reads) % self._spike_every == 0:
+            while time.perf_counter() - now < self._spike:
+                pass
+        return fn()
+
+    def read_telemetry(self):
+        return self._read(self._reader.read_telemetry)
+
+    def read_coordinates(self):
+        return self._read(self._reader.read_coordinates)
+
+
+def sleep_after_loop(reader, controller, hz, stop):
+    """The previous loop: do the work, then wait a full interval"""
+    while not stop.is_set():
+        telemetry = reader.read_telemetry()
+        if telemetry:
+            controller.update_telemetry(telemetry)
+        if stop.wait(1 / hz):
+            break
+
+
+def run(variant, hz, seconds, spike_ms, spike_every):
+    controller, fake, _ = build_controller()
+    reader = TimedReader(fake, spike_ms, spike_every)
+    stats = {}
+    if variant == 'sleep-after':
+        stop = threading.Event()
+        thread = threading.Thread(target=sleep_after_loop, args=(reader, controller, hz, stop))
+        thread.start()
+        time.sleep(seconds)
+        stop.set()
+        thread.join()
+    else:
+        Config.MONITOR_TELEMETRY_HZ = Config.MONITOR_POSITION_HZ = hz
+        Config.MONITOR_OVERRUN_POLICY = variant
+        monitor = BackgroundMonitor(reader, controller)
+        monitor._stop_event.clear()
+        monitor.thread = threading.Thread(target=monitor._monitor_loop, daemon=True)
+        monitor.thread.start()
+        time.sleep(seconds)
+        monitor._stop_event.set()
+        monitor.thread.join()
+        stats = monitor.scheduler.stats()
+
+    reads = reader.reads
+    elapsed = reads[-1] - reads[0]
+    periods = sorted(b - a for a, b in zip(reads, reads[1:]))
+    period = 1 / hz
+    deviation = sorted(abs(p - period) for p in periods)
+    return {
+        'variant': variant,
+        'frames': len(reads),
+        'rate': (len(reads) - 1) / elapsed,
+        'drift': (len(reads) - 1) - round(elapsed * hz),
+        'p50_dev_ms': deviation[len(deviation) // 2] * 1000,
+        'p99_dev_ms': deviation[int(len(deviation) * 0.99)] * 1000,
+        'overruns': stats.get('overruns', '-'),
+        'skipped': stats.get('skipped', '-'),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--hz', type=float, default=60)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--spike-ms', type=float, default=0)
+    parser.add_argument('--spike-every', type=int, default=120)
+    args = parser.parse_args()
+
+    rows = [run(variant, args.hz, args.seconds, args.spike_ms, args.spike_every)
+            for variant in ('sleep-after', 'skip', 'catchup')]
+    print(f"\ntarget {args.hz:g} Hz for {args.seconds:g} s"
+          + (f", {args.spike_ms:g} ms spike every {args.spike_every} frames" if args.spike_ms else ''))
+    print(f"{'loop':<12} {'frames':>7} {'Hz':>7} {'drift':>6} {'p50 dev ms':>11} "
+          f"{'p99 dev ms':>11} {'overruns':>9} {'skipped':>8}")
+    for r in rows:
+        print(f"{r['variant']:<12} {r['frames']:>7} {r['rate']:>7.2f} {r['drift']:>6} "
+              f"{r['p50_dev_ms']:>11.3f} {r['p99_dev_ms']:>11.3f} {r['overruns']:>9} {r['skipped']:>8}")
+
+
+if __name__ == '__main__':
+    main()
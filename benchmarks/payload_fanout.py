@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+CPU cost of serving /api/status to many clients per telemetry tick
+
+Compares serializing get_status() once per client (the previous jsonify
+path) against the shared per-revision payload cache.
+
+    python -m benchmarks.payload_fanout [--ticks 200]
+"""
+
+import argparse
+import gzip
+import json
+import time
+
+from benchmarks.synthetic import build_controller
+
+
+def _uncached(controller, clients):
+    for _ in range(clients):
+        body = json.dumps(controller.get_status()).encode('utf-8')
+        gzip.compress(body, compresslevel=6)
+
+
+def _cached(controller, clients):
+    for _ in range(clients):
+        controller.get_status_payload().gzip_body()
+
+
+def run(ticks, client_counts):
+    controller, reader, _ = build_controller()
+    results = []
+    for clients in client_counts:
+        row = {'clients': clients}
+        for name, serve in (('uncached', _uncached), ('cached', _cached)):
+            start = time.process_time()
+            for _ in range(ticks):
+                controller.update_telemetry(reader.read_telemetry())
+                serve(controller, clients)
+            row[name] = (time.process_time() - start) / ticks * 1000.0
+        results.append(row)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--ticks', type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'clients':>8} {'uncached ms/tick':>18} {'cached ms/tick':>16} {'speedup':>8}")
+    for row in run(args.ticks, (1, 10, 100)):
+        print(f"{row['clients']:>8} {row['uncached']:>18.3f} {row['cached']:>16.3f} "
+              f"{row['uncached'] / row['cached']:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Cost of the on-demand profilers to the monitor path
+
+Times update_telemetry on the synthetic controller with no capture running,
+while the stack sampler runs at several rates, and under the scoped cProfile
+capture. A capture also walks the stacks of the travel log writer and the
+request threads, so the idle case is the one that matters day to day.
+
+    python -m benchmarks.profiler_overhead [--frames 20000]
+"""
+
+import argparse
+import threading
+import time
+
+from benchmarks.synthetic import build_controller
+from utils.profiler import MONITOR_PROFILER, SamplingProfiler
+
+
+def _us_per_frame(controller, frames, scoped=False):
+    start = time.perf_counter()
+    for telemetry in frames:
+        # Same check as BackgroundMonitor._monitor_loop
+        if MONITOR_PROFILER.active:
+            MONITOR_PROFILER.run(controller.update_telemetry, telemetry)
+        elif scoped:
+            raise RuntimeError("cProfile capture ended before the run")
+        else:
+            controller.update_telemetry(telemetry)
+    return (time.perf_counter() - start) / len(frames) * 1e6
+
+
+def _during(capture, run):
+    """Run `run` while `capture` (a blocking call) is active in a thread"""
+    started = threading.Event()
+    result = {}
+
+    def target():
+        started.set()
+        result['capture'] = capture()
+
+    thread = threading.Thread(target=target)
+    thread.start()
+    started.wait()
+    time.sleep(0.05)
+    value = run()
+    thread.join()
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--frames', type=int, default=20000)
+    args = parser.parse_args()
+
+    controller, reader, _ = build_controller()
+    frames = [reader.read_telemetry() for _ in range(args.frames)]
+    _us_per_frame(controller, frames[:200])
+
+    idle = _us_per_frame(controller, frames)
+    print(f"{'capture':<20} {'us/frame':>9} {'overhead':>9}")
+    print(f"{'none':<20} {idle:>9.1f} {'':>9}")
+    # Long enough to cover the run even at cProfile's slowdown
+    budget = idle * args.frames / 1e6 * 10 + 1
+    for hz in (100, 1000):
+        sampler = SamplingProfiler()
+        us = _during(lambda: sampler.capture(budget, hz), lambda: _us_per_frame(controller, frames))
+        print(f"{f'sample {hz} Hz':<20} {us:>9.1f} {us / idle - 1:>+9.1%}")
+    us = _during(lambda: MONITOR_PROFILER.capture(budget),
+                 lambda: _us_per_frame(controller, frames, scoped=True))
+    print(f"{'cprofile (scoped)':<20} {us:>9.1f} {us / idle - 1:>+9.1%}")
+
+
+if __name__ == '__main__':
+    main()
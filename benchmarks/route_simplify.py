@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Route simplification: point reduction and processing time per zoom level
+
+Replays a synthetic drive into a TravelLog (the same route as
+benchmarks.track_storage), ends the session and asks for its route at
+every map zoom, cold and cached.
+
+    python -m benchmarks.route_simplify [--hours 10] [--hz 10]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from config import Config
+from data.travel_log import TravelLog
+from benchmarks.track_storage import synthetic_route
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--hours', type=float, default=10)
+    parser.add_argument('--hz', type=float, default=10)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(prefix='ets2-bench-'), 'route.db')
+    log = TravelLog(path)
+    log.start_session()
+    start_ts = time.time() - args.hours * 3600
+    for t, x, z in synthetic_route(args.hours, args.hz, start_ts):
+        log.record_position(t, x, z)
+    log.end_session({})
+    log.flush(timeout=60)
+
+    print(f"{'zoom':>4} {'tolerance m':>11} {'raw points':>11} {'vertices':>9} {'reduction':>10} "
+          f"{'cold ms':>8} {'cached µs':>10}")
+    for zoom in range(Config.HEATMAP_ZOOM_LEVELS - 1, -1, -1):
+        tolerance = Config.ROUTE_TOLERANCE * 2 ** (Config.HEATMAP_ZOOM_LEVELS - 1 - zoom)
+        begin = time.perf_counter()
+        route = log.get_route(None, tolerance)
+        cold_ms = (time.perf_counter() - begin) * 1000
+        begin = time.perf_counter()
+        log.get_route(None, tolerance)
+        cached_us = (time.perf_counter() - begin) * 1e6
+        raw, kept = route['raw_points'], len(route['points'])
+        print(f"{zoom:>4} {tolerance:>11g} {raw:>11,} {kept:>9,} {raw / kept:>9.0f}x "
+              f"{cold_ms:>8.1f} {cached_us:>10.1f}")
+    log.close()
+
+
+if __name__ == '__main__':
+    main()
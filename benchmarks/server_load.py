@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+/api/status throughput and latency under each serving mode
+
+Starts the app in a child process per mode (Flask dev server, the werkzeug
+thread-pool fallback, waitress) with telemetry ticking in the background,
+then drives it with concurrent keep-alive clients.
+
+    python -m benchmarks.server_load [--clients 1,8,32] [--seconds 5]
+"""
+
+import argparse
+import http.client
+import os
+import subprocess
+import sys
+import threading
+import time
+
+MODES = ('dev', 'threadpool', 'waitress')
+
+
+def serve(mode, port):
+    """Child process: run the app under `mode` until terminated"""
+    import signal
+    from config import Config
+    from web import server
+    from web.app import create_app
+    from benchmarks.synthetic import build_controller
+
+    controller, reader, _ = build_controller()
+
+    def tick():
+        while True:
+            controller.update_telemetry(reader.read_telemetry())
+            time.sleep(1 / Config.MONITOR_TELEMETRY_HZ)
+
+    threading.Thread(target=tick, daemon=True).start()
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    if mode == 'threadpool':
+        server.waitress = None
+    server.serve(create_app(controller), '127.0.0.1', port, 'dev' if mode == 'dev' else 'production')
+
+
+def _client(port, deadline, latencies, errors):
+    conn = None
+    while time.perf_counter() < deadline:
+        if conn is None:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+        begin = time.perf_counter()
+        try:
+            conn.request('GET', '/api/status', headers={'Accept-Encoding': 'gzip'})
+            response = conn.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            errors.append(1)
+            conn.close()
+            conn = None
+            continue
+        latencies.append(time.perf_counter() - begin)
+        if response.will_close:
+            conn.close()
+            conn = None
+
+
+def load(port, clients, seconds):
+    latencies = []
+    errors = []
+    deadline = time.perf_counter() + seconds
+    threads = [threading.Thread(target=_client, args=(port, deadline, latencies, errors))
+               for _ in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    latencies.sort()
+    count = len(latencies)
+    return {
+        'rps': count / seconds,
+        'p50': latencies[count // 2] * 1000 if count else 0.0,
+        'p99': latencies[int(count * 0.99)] * 1000 if count else 0.0,
+        'errors': len(errors),
+    }
+
+
+def _wait_ready(port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            conn.request('GET', '/api/status')
+            conn.getresponse().read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server on port {port} did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--clients', default='1,8,32')
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--modes', default=','.join(MODES))
+    parser.add_argument('--port', type=int, default=5099)
+    parser.add_argument('--serve', choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.port)
+        return
+
+    print(f"{'mode':<11} {'clients':>7} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for mode in args.modes.split(','):
+        child = subprocess.Popen(
+            [sys.executable, '-m', 'benchmarks.server_load', '--serve', mode, '--port', str(args.port)],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, cwd=os.getcwd(),
+        )
+        try:
+            _wait_ready(args.port)
+            for clients in (int(c) for c in args.clients.split(',')):
+                r = load(args.port, clients, args.seconds)
+                print(f"{mode:<11} {clients:>7} {r['rps']:>8,.0f} {r['p50']:>8.2f} "
+                      f"{r['p99']:>8.2f} {r['errors']:>7}")
+        finally:
+            child.terminate()
+            child.wait(timeout=15)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Bytes and requests for a first load and a reload of the dashboard page
+
+Compares the unbundled source files (the fallback when no build exists)
+with the output of web/build_assets.py. A reload revalidates every asset
+unless its Cache-Control lets the browser reuse it without asking
+(immutable bundles), in which case no request is made at all.
+
+    python -m benchmarks.static_assets
+"""
+
+import os
+import re
+import tempfile
+from flask import Flask, render_template
+from web.assets import init_assets
+from web.build_assets import STATIC_DIR, build
+
+TEMPLATES = os.path.join(os.path.dirname(STATIC_DIR), 'templates')
+ASSET_RE = re.compile(r'(?:src|href)="(/static/[^"]+)"')
+
+
+def _app(dist_dir):
+    app = Flask(__name__, static_folder=STATIC_DIR, template_folder=TEMPLATES)
+    app.add_url_rule('/', 'index', lambda: render_template('index.html'))
+    init_assets(app, dist_dir)
+    return app
+
+
+def page_load(client, cache):
+    """Fetch the page and its local assets like a browser with cache `cache`
+
+    Returns (requests, body bytes). `cache` maps URL -> response headers and
+    is filled in, so a second call with the same dict is a reload.
+    """
+    requests = 0
+    transferred = 0
+    html = client.get('/', headers={'Accept-Encoding': 'gzip, br'}).get_data(as_text=True)
+    for url in ASSET_RE.findall(html):
+        headers = {'Accept-Encoding': 'gzip, br'}
+        cached = cache.get(url)
+        if cached is not None:
+            if 'immutable' in cached.get('Cache-Control', ''):
+                continue
+            if cached.get('ETag'):
+                headers['If-None-Match'] = cached['ETag']
+        response = client.get(url, headers=headers)
+        requests += 1
+        transferred += len(response.data)
+        if response.status_code == 200:
+            cache[url] = response.headers
+        response.close()
+    return requests, transferred
+
+
+def main():
+    print(f"{'assets':<10} {'first requests':>14} {'first bytes':>12} "
+          f"{'reload requests':>15} {'reload bytes':>13}")
+    with tempfile.TemporaryDirectory() as dist_dir:
+        rows = [('unbundled', None)]
+        build(dist_dir=dist_dir)
+        rows.append(('built', dist_dir))
+        for label, directory in rows:
+            client = _app(directory or os.path.join(dist_dir, 'missing')).test_client()
+            cache = {}
+            first = page_load(client, cache)
+            reload = page_load(client, cache)
+            print(f"{label:<10} {first[0]:>14} {first[1]:>12,} {reload[0]:>15} {reload[1]:>13,}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Synthetic controller state shared by the benchmarks
+"""
+
+import json
+import math
+import os
+import tempfile
+
+from data.city_database import ETS2CityDatabase
+from data.station_manager import StationManager
+from core.radio_controller import RadioController
+
+
+def make_telemetry(t, speed=80.0):
+    """Build a plausible telemetry dict for time t (seconds)"""
+    return {
+        'timestamp': t,
+        'coordinateX': 8500.0 + 3000.0 * math.sin(t / 3000.0),
+        'coordinateY': 45.0,
+        'coordinateZ': -25200.0 + 10.0 * math.sin(t / 60.0),
+        'rotationX': 0.0, 'rotationY': 0.0, 'rotationZ': 0.0,
+        'paused': False,
+        'speed': speed + 3.0 * math.sin(t),
+        'engineRpm': 1300.0 + 200.0 * math.sin(t / 3.0),
+        'gear': 10, 'gearDashboard': 10,
+        'cruiseControlSpeed': 0.0,
+        'speedLimit': 80.0,
+        'fuel': max(0.0, 600.0 - 0.01 * t), 'fuelCapacity': 800.0,
+        'fuelWarning': False,
+        'wearEngine': 0.01, 'wearTransmission': 0.01, 'wearCabin': 0.02,
+        'wearChassis': 0.02, 'wearWheels': 0.03, 'cargoDamage': 0.0,
+        'truckOdometer': 120000.0 + 0.022 * t,
+        'truckBrand': 'Scania', 'truckName': 'R 2009',
+        'parkBrake': False, 'electricEnabled': True, 'engineEnabled': True,
+        'plannedDistanceKm': 850, 'routeDistance': 640000.0, 'routeTime': 30000.0,
+        'restStop': 0,
+        'cargo': 'Tractors', 'cityDst': 'Berlin', 'citySrc': 'Paris',
+        'compDst': 'posped', 'compSrc': 'tradeaux',
+        'jobIncome': 24500, 'onJob': True, 'jobFinished': False, 'jobDelivered': False,
+        'fineAmount': 0, 'fined': False,
+    }
+
+
+class FakeReader:
+    """Stands in for ETS2CoordinateReader, replaying synthetic telemetry"""
+
+    def __init__(self):
+        self.t = 0.0
+        self.connected = True
+
+    def connect(self):
+        return True
+
+    def disconnect(self):
+        pass
+
+    def is_connected(self):
+        return self.connected
+
+    def read_telemetry(self):
+        self.t += 1.0
+        return make_telemetry(self.t)
+
+    def read_frame_marker(self):
+        return self.t
+
+    def read_coordinates(self):
+        telemetry = self.read_telemetry()
+        return {'x': telemetry['coordinateX'], 'y': telemetry['coordinateY'],
+                'z': telemetry['coordinateZ'], 'timestamp': telemetry['timestamp']}
+
+
+def write_station_catalog(path, countries=40, per_country=60):
+    """Write a large stations.json catalog"""
+    catalog = {}
+    for c in range(countries):
+        name = 'france' if c == 0 else f'country{c}'
+        catalog[name] = [
+            {
+                'name': f'Station {c}-{i}',
+                'stream_url': f'https://stream.example.invalid/{c}/{i}.mp3',
+                'logo': f'https://logos.example.invalid/{c}/{i}.png',
+                'country': name,
+                'city': f'City {i % 12}',
+            }
+            for i in range(per_country)
+        ]
+    with open(path, 'w') as f:
+        json.dump(catalog, f)
+
+
+def build_controller(workdir=None, countries=40, per_country=60):
+    """Create a RadioController backed by a large synthetic station catalog"""
+    workdir = workdir or tempfile.mkdtemp(prefix='ets2-bench-')
+    stations_file = os.path.join(workdir, 'stations.json')
+    write_station_catalog(stations_file, countries, per_country)
+    reader = FakeReader()
+    controller = RadioController(ETS2CityDatabase(), StationManager(stations_file), reader)
+    return controller, reader, workdir
+
+
+_CITIES = [('Berlin', 'germany'), ('Hamburg', 'germany'), ('Munich', 'germany'),
+           ('Paris', 'france'), ('Lyon', 'france'), ('Calais', 'france'),
+           ('London', 'uk'), ('Dover', 'uk'), ('Warszawa', 'poland'),
+           ('Praha', 'czech'), ('Wien', 'austria'), ('Milano', 'italy')]
+_CARGO = ['Tractors', 'Apples', 'Cement', 'Furniture', 'Fuel', 'Chemicals', 'Cars']
+_COMPANIES = ['posped', 'tradeaux', 'euroacres', 'itcc', 'lkwlog', 'transinet']
+
+
+def generate_travel_log(path, visits=1_000_000, jobs=20_000, fines=5_000, days=365):
+    """Create a TravelLog database filled with synthetic history spread over `days`"""
+    from data.travel_log import TravelLog
+    import random
+    import sqlite3
+    import time
+
+    rng = random.Random(42)
+    log = TravelLog(path)
+    log.close()
+
+    end = time.time()
+    start = end - days * 86400
+    conn = sqlite3.connect(path)
+    conn.executemany(
+        'INSERT INTO visits (timestamp, city, country, x, z, signal_strength) VALUES (?,?,?,?,?,?)',
+        ((start + i * (end - start) / visits, *_CITIES[i % len(_CITIES)],
+          rng.uniform(-60000, 60000), rng.uniform(-60000, 60000), rng.random())
+         for i in range(visits))
+    )
+    conn.executemany(
+        'INSERT INTO jobs (started_at, completed_at, cargo, source_city, source_company, '
+        'dest_city, dest_company, distance_km, income, cargo_damage) VALUES (?,?,?,?,?,?,?,?,?,?)',
+        ((t, t + 7200, rng.choice(_CARGO), *(rng.choice(_CITIES)[0], rng.choice(_COMPANIES)),
+          *(rng.choice(_CITIES)[0], rng.choice(_COMPANIES)), rng.randint(50, 1500),
+          rng.randint(2000, 60000), rng.random() * 0.05)
+         for t in (start + i * (end - 7200 - start) / jobs for i in range(jobs)))
+    )
+    conn.executemany(
+        'INSERT INTO fines (timestamp, amount, city, country) VALUES (?,?,?,?)',
+        ((start + i * (end - start) / fines, rng.choice([300, 500, 800]), *rng.choice(_CITIES))
+         for i in range(fines))
+    )
+    conn.commit()
+    conn.close()
+
+    log = TravelLog(path)
+    log.rebuild_stats()
+    log.close()
+    return path
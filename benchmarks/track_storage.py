@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Write rate and storage of the breadcrumb track for a replayed long session
+
+Replays a synthetic drive through TravelLog.record_position, then reports
+kept points, encoded block size, database size, the same points stored one
+row per sample for comparison, and the cost of decoding one hour.
+
+    python -m benchmarks.track_storage [--hours 10] [--hz 10]
+"""
+
+import argparse
+import math
+import os
+import sqlite3
+import tempfile
+import time
+
+from data.travel_log import TravelLog
+
+
+def synthetic_route(hours, hz, start_ts):
+    """Yield (t, x, z) for a truck at ~80 km/h on a winding road with stops"""
+    x = z = 0.0
+    heading = 0.0
+    for i in range(int(hours * 3600 * hz)):
+        t = start_ts + i / hz
+        minute = int(i / hz // 60)
+        speed = 0.0 if minute % 45 == 44 else 22.0  # park for a minute now and then
+        heading += 0.002 * math.sin(i / (hz * 90.0))
+        x += math.cos(heading) * speed / hz
+        z += math.sin(heading) * speed / hz
+        yield t, x, z
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--hours', type=float, default=10)
+    parser.add_argument('--hz', type=float, default=10)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='ets2-bench-')
+    path = os.path.join(workdir, 'track.db')
+    log = TravelLog(path)
+    log.start_session()
+    start_ts = time.time() - args.hours * 3600
+
+    samples = 0
+    begin = time.perf_counter()
+    for t, x, z in synthetic_route(args.hours, args.hz, start_ts):
+        log.record_position(t, x, z)
+        samples += 1
+    record_elapsed = time.perf_counter() - begin
+    log.close(timeout=60)
+
+    conn = sqlite3.connect(path)
+    blocks, points, blob_bytes = conn.execute(
+        'SELECT COUNT(*), SUM(points), SUM(LENGTH(data)) FROM track_blocks').fetchone()
+    conn.execute('VACUUM')
+    conn.close()
+    db_bytes = os.path.getsize(path)
+
+    # The same kept points as one row per sample, for comparison
+    rows_path = os.path.join(workdir, 'rows.db')
+    rows = sqlite3.connect(rows_path)
+    rows.execute('CREATE TABLE track (id INTEGER PRIMARY KEY, timestamp REAL, x REAL, z REAL)')
+    log = TravelLog(path)
+    all_points = log.get_track(start_ts, start_ts + args.hours * 3600 + 1)
+    rows.executemany('INSERT INTO track (timestamp, x, z) VALUES (?,?,?)', all_points)
+    rows.commit()
+    rows.execute('VACUUM')
+    rows.close()
+
+    begin = time.perf_counter()
+    hour = log.get_track(start_ts, start_ts + 3600)
+    decode_ms = (time.perf_counter() - begin) * 1000
+    log.close()
+
+    print(f"replayed samples    : {samples:,} ({args.hours:g} h at {args.hz:g} Hz)")
+    print(f"record_position     : {samples / record_elapsed:,.0f} calls/s")
+    print(f"kept points         : {points:,} in {blocks:,} blocks")
+    print(f"encoded block bytes : {blob_bytes / 1024:,.1f} KB ({blob_bytes / points:.2f} B/point)")
+    print(f"track database      : {db_bytes / 1024:,.1f} KB")
+    print(f"row-per-sample db   : {os.path.getsize(rows_path) / 1024:,.1f} KB")
+    print(f"decode one hour     : {len(hour):,} points in {decode_ms:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
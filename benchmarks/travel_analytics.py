@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Cost of /api/travel/analytics: full aggregation vs incremental vs cached
+
+    python -m benchmarks.travel_analytics [--visits 1000000] [--batches 20]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from core.payload_cache import PayloadCache
+from data.travel_analytics import TravelAnalytics
+from data.travel_log import TravelLog
+from benchmarks.synthetic import generate_travel_log
+
+
+def timed_ms(func):
+    begin = time.perf_counter()
+    result = func()
+    return (time.perf_counter() - begin) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--visits', type=int, default=1_000_000)
+    parser.add_argument('--batches', type=int, default=20)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(prefix='ets2-bench-'), 'travel_log.db')
+    generate_travel_log(path, visits=args.visits)
+    log = TravelLog(path)
+    cache = PayloadCache(log.get_analytics)
+
+    full_ms, _ = timed_ms(lambda: cache.get(log.write_seq))
+
+    incremental = []
+    for _ in range(args.batches):
+        # One monitor tick's worth of new history
+        log.record_visit('Paris', 'france', 0.0, 0.0, 1.0)
+        log.record_fine(500, 'Paris', 'france')
+        log.record_job_start('Wood', 'Paris', 'EuroGoodies', 'Lyon', 'TREK', 450, 8000)
+        log.record_job_complete(0.02)
+        log.flush()
+        incremental.append(timed_ms(lambda: cache.get(log.write_seq))[0])
+
+    cached = [timed_ms(lambda: cache.get(log.write_seq))[0] for _ in range(1000)]
+    rescan_ms, fresh = timed_ms(TravelAnalytics(log._read_pool).refresh)
+    consistent = fresh == log.get_analytics()[1]
+    log.close()
+
+    print(f"full aggregation      : {full_ms:8.1f} ms")
+    print(f"incremental (median)  : {sorted(incremental)[len(incremental) // 2]:8.3f} ms")
+    print(f"cached (median)       : {sorted(cached)[len(cached) // 2] * 1000:8.2f} µs")
+    print(f"rescan after updates  : {rescan_ms:8.1f} ms, matches incremental: {consistent}")
+
+
+if __name__ == '__main__':
+    main()
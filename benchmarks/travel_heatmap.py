@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+/api/travel/heatmap cost per zoom level: first build, incremental update, cached
+
+    python -m benchmarks.travel_heatmap [--visits 2000000] [--years 3]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from config import Config
+from core.payload_cache import PayloadCache
+from data.travel_log import TravelLog
+from benchmarks.synthetic import generate_travel_log
+
+
+def timed_ms(func):
+    begin = time.perf_counter()
+    result = func()
+    return (time.perf_counter() - begin) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--visits', type=int, default=2_000_000)
+    parser.add_argument('--years', type=float, default=3)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(prefix='ets2-bench-'), 'travel_log.db')
+    generate_travel_log(path, visits=args.visits, days=int(args.years * 365))
+    log = TravelLog(path)
+    rng = random.Random(1)
+
+    print(f"{'zoom':>4} {'cell m':>7} {'cells':>8} {'first ms':>9} {'update ms':>10} "
+          f"{'cached µs':>10} {'gzip KB':>8}")
+    for zoom in range(Config.HEATMAP_ZOOM_LEVELS):
+        cache = PayloadCache(lambda: log.get_heatmap('visits', zoom))
+        first_ms, payload = timed_ms(lambda: cache.get(log.write_seq))
+
+        for _ in range(50):
+            log.record_visit('Paris', 'france', rng.uniform(-60000, 60000), rng.uniform(-60000, 60000), 1.0)
+        log.flush()
+        update_ms, payload = timed_ms(lambda: cache.get(log.write_seq))
+
+        cached_ms = min(timed_ms(lambda: cache.get(log.write_seq))[0] for _ in range(100))
+        cells = len(log.get_heatmap('visits', zoom)[1]['cells']) // 3
+        print(f"{zoom:>4} {Config.HEATMAP_CELL_SIZE * 2 ** (Config.HEATMAP_ZOOM_LEVELS - 1 - zoom):>7.0f} "
+              f"{cells:>8,} {first_ms:>9.1f} {update_ms:>10.1f} {cached_ms * 1000:>10.2f} "
+              f"{len(payload.gzip_body()) / 1024:>8.1f}")
+    log.close()
+
+
+if __name__ == '__main__':
+    main()
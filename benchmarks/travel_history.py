@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Latency of the filtered, keyset-paginated travel history queries
+
+Runs the /api/travel/recent and /api/travel/jobs queries against a
+generated log, with the schema's indexes and with them dropped.
+
+    python -m benchmarks.travel_history [--visits 1000000]
+"""
+
+import argparse
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+
+from data.travel_log import TravelLog
+from benchmarks.synthetic import generate_travel_log
+
+_INDEXES = ['idx_visits_timestamp', 'idx_visits_country', 'idx_visits_city',
+            'idx_jobs_completed', 'idx_jobs_completed_at', 'idx_jobs_cargo']
+
+
+def _queries(log, visits):
+    now = time.time()
+    month = 30 * 86400
+    return {
+        'recent first page': lambda: log.get_recent_visits(),
+        'recent deep page': lambda: log.get_recent_visits(before=visits // 2),
+        'recent by country': lambda: log.get_recent_visits(country='uk', before=visits // 3),
+        'recent by city': lambda: log.get_recent_visits(city='Dover'),
+        'recent date range': lambda: log.get_recent_visits(from_ts=now - 7 * month, to_ts=now - 6 * month),
+        'recent country+date': lambda: log.get_recent_visits(country='italy', from_ts=now - 9 * month,
+                                                              to_ts=now - 8 * month),
+        'jobs first page': lambda: log.get_job_history(),
+        'jobs by cargo': lambda: log.get_job_history(cargo='Cement', before=5000),
+        'jobs by city': lambda: log.get_job_history(city='Praha'),
+        'jobs date range': lambda: log.get_job_history(from_ts=now - 7 * month, to_ts=now - 6 * month),
+    }
+
+
+def _measure(path, visits, repeat=20):
+    log = TravelLog(path)
+    results = {}
+    for name, query in _queries(log, visits).items():
+        query()  # warm the page cache
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            query()
+            samples.append((time.perf_counter() - start) * 1000)
+        results[name] = max(samples)
+    log.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--visits', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='ets2-bench-')
+    indexed = os.path.join(workdir, 'indexed.db')
+    generate_travel_log(indexed, visits=args.visits)
+
+    bare = os.path.join(workdir, 'bare.db')
+    shutil.copy(indexed, bare)
+    conn = sqlite3.connect(bare)
+    for name in _INDEXES:
+        conn.execute(f'DROP INDEX {name}')
+    conn.commit()
+    conn.close()
+
+    # Opening the bare copy would re-run the migration, so query it directly
+    with_idx = _measure(indexed, args.visits)
+    import data.travel_log as travel_log_module
+    travel_log_module.SCHEMA_VERSION, saved = 1, travel_log_module.SCHEMA_VERSION
+    conn = sqlite3.connect(bare)
+    conn.execute('PRAGMA user_version=1')
+    conn.commit()
+    conn.close()
+    try:
+        without = _measure(bare, args.visits)
+    finally:
+        travel_log_module.SCHEMA_VERSION = saved
+
+    print(f"{'query (max of 20, ms)':<22} {'no indexes':>11} {'indexed':>9}")
+    for name in with_idx:
+        print(f"{name:<22} {without[name]:>11.2f} {with_idx[name]:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Worst-case monitor tick latency with the travel log on a slow disk
+
+Simulates fsync stalls by making every commit sleep, then compares the
+previous synchronous insert+commit path against the write-behind queue.
+Latency is measured around the call the monitor makes while holding the
+RadioController lock.
+
+    python -m benchmarks.travel_log_writer [--ticks 300] [--stall-ms 40]
+"""
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+
+import data.travel_log as travel_log_module
+from data.travel_log import TravelLog
+
+
+def _slow_connection_class(stall):
+    class SlowConnection(sqlite3.Connection):
+        def commit(self):
+            time.sleep(stall)
+            super().commit()
+    return SlowConnection
+
+
+def _percentiles(samples):
+    samples = sorted(samples)
+    return {
+        'p50': samples[len(samples) // 2] * 1000,
+        'p99': samples[int(len(samples) * 0.99) - 1] * 1000,
+        'max': samples[-1] * 1000,
+    }
+
+
+def bench_sync(path, ticks, factory):
+    conn = sqlite3.connect(path, factory=factory)
+    conn.execute('CREATE TABLE visits (id INTEGER PRIMARY KEY, timestamp REAL, city TEXT, '
+                 'country TEXT, x REAL, z REAL, signal_strength REAL)')
+    samples = []
+    for i in range(ticks):
+        start = time.perf_counter()
+        conn.execute('INSERT INTO visits (timestamp, city, country, x, z, signal_strength) '
+                     'VALUES (?,?,?,?,?,?)', (time.time(), 'Paris', 'france', i, i, 0.9))
+        conn.commit()
+        samples.append(time.perf_counter() - start)
+    conn.close()
+    return samples
+
+
+def bench_write_behind(path, ticks, factory):
+    real_connect = sqlite3.connect
+    travel_log_module.sqlite3.connect = lambda *a, **k: real_connect(*a, factory=factory, **k)
+    try:
+        log = TravelLog(path, flush_interval=0.05)
+        samples = []
+        for i in range(ticks):
+            start = time.perf_counter()
+            log.record_visit('Paris', 'france', i, i, 0.9)
+            samples.append(time.perf_counter() - start)
+        log.close(timeout=60)
+    finally:
+        travel_log_module.sqlite3.connect = real_connect
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--ticks', type=int, default=300)
+    parser.add_argument('--stall-ms', type=float, default=40)
+    args = parser.parse_args()
+
+    factory = _slow_connection_class(args.stall_ms / 1000)
+    workdir = tempfile.mkdtemp(prefix='ets2-bench-')
+    print(f"commit stall {args.stall_ms:.0f} ms, {args.ticks} ticks (latency in ms)")
+    for name, bench in (('synchronous', bench_sync), ('write-behind', bench_write_behind)):
+        stats = _percentiles(bench(os.path.join(workdir, f'{name}.db'), args.ticks, factory))
+        print(f"{name:>13}: p50 {stats['p50']:8.3f}  p99 {stats['p99']:8.3f}  max {stats['max']:8.3f}")
+
+
+if __name__ == '__main__':
+    main()
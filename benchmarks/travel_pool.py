@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+/api/travel/* query throughput: per-thread connections vs the read pool
+
+Emulates Flask's threaded server, which runs each request on a new thread.
+The previous thread-local scheme opened a fresh connection for every such
+thread; the pool reuses a bounded set.
+
+    python -m benchmarks.travel_pool [--clients 1,4,16] [--requests 300]
+"""
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from data.travel_log import TravelLog
+from benchmarks.synthetic import generate_travel_log
+
+
+class ThreadLocalReader:
+    """The previous TravelLog._get_conn behaviour"""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self.opened = 0
+
+    def _get_conn(self):
+        if getattr(self._local, 'conn', None) is None:
+            self._local.conn = sqlite3.connect(self.path)
+            self._local.conn.row_factory = sqlite3.Row
+            self.opened += 1
+        return self._local.conn
+
+    def handle(self):
+        conn = self._get_conn()
+        conn.execute('SELECT * FROM stats WHERE id=1').fetchone()
+        conn.execute('SELECT id, city, country, timestamp, signal_strength FROM visits '
+                     'ORDER BY id DESC LIMIT 50').fetchall()
+
+
+def run(handle, clients, requests):
+    """Each client issues `requests` requests, each on a fresh thread"""
+    def client():
+        for _ in range(requests):
+            worker = threading.Thread(target=handle)
+            worker.start()
+            worker.join()
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return clients * requests / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--clients', default='1,4,16')
+    parser.add_argument('--requests', type=int, default=300)
+    parser.add_argument('--visits', type=int, default=200_000)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(prefix='ets2-bench-'), 'travel_log.db')
+    generate_travel_log(path, visits=args.visits)
+
+    print(f"{'clients':>8} {'thread-local req/s':>19} {'opened':>7} {'pool req/s':>11} {'opened':>7}")
+    for clients in (int(c) for c in args.clients.split(',')):
+        legacy = ThreadLocalReader(path)
+        legacy_rps = run(legacy.handle, clients, args.requests)
+
+        log = TravelLog(path)
+
+        def pooled():
+            log.get_stats()
+            log.get_recent_visits()
+
+        pool_rps = run(pooled, clients, args.requests)
+        opened = log.get_db_stats()['read_pool']['open']
+        log.close()
+        print(f"{clients:>8} {legacy_rps:>19,.0f} {legacy.opened:>7} {pool_rps:>11,.0f} {opened:>7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Travel log size and query latency before and after retention compaction
+
+Builds a multi-year synthetic log, then rolls up visits past the retention
+window with TravelLog.compact. Reports database size, compaction time,
+history query latency and checks that get_stats is unchanged.
+
+    python -m benchmarks.travel_retention [--years 3] [--visits 2000000] [--retention-days 365]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from data.travel_log import TravelLog
+from benchmarks.synthetic import generate_travel_log
+
+
+def query_ms(log, repeat=50):
+    """Median latency of the history queries served by /api/travel/*"""
+    queries = {
+        'recent visits': lambda: log.get_recent_visits(50),
+        'visits by country': lambda: log.get_recent_visits(50, country='France'),
+        'last 30 days': lambda: log.get_recent_visits(50, from_ts=time.time() - 30 * 86400),
+        'stats': log.get_stats,
+    }
+    results = {}
+    for name, query in queries.items():
+        samples = []
+        for _ in range(repeat):
+            begin = time.perf_counter()
+            query()
+            samples.append((time.perf_counter() - begin) * 1000)
+        results[name] = sorted(samples)[len(samples) // 2]
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--years', type=float, default=3)
+    parser.add_argument('--visits', type=int, default=2_000_000)
+    parser.add_argument('--retention-days', type=int, default=365)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(prefix='ets2-bench-'), 'travel_log.db')
+    generate_travel_log(path, visits=args.visits, days=int(args.years * 365))
+    size_before = os.path.getsize(path)
+
+    log = TravelLog(path)
+    stats_before = log.get_stats()
+    latency_before = query_ms(log)
+
+    begin = time.perf_counter()
+    log.compact(args.retention_days)
+    compact_s = time.perf_counter() - begin
+    rolled_up = log.get_writer_stats()['rolled_up']
+
+    stats_after = log.get_stats()
+    latency_after = query_ms(log)
+    conn = log.open_reader()
+    rollups = conn.execute('SELECT COUNT(*) FROM visit_rollups').fetchone()[0]
+    conn.close()
+    log.close()
+    size_after = os.path.getsize(path)
+
+    print(f"visits rolled up : {rolled_up:,} -> {rollups:,} rollup rows")
+    print(f"compaction       : {compact_s:.1f} s")
+    print(f"database size    : {size_before / 2**20:,.1f} MB -> {size_after / 2**20:,.1f} MB")
+    print(f"get_stats equal  : {stats_before == stats_after}")
+    print(f"{'query':<18} {'before ms':>10} {'after ms':>10}")
+    for name in latency_before:
+        print(f"{name:<18} {latency_before[name]:>10.3f} {latency_after[name]:>10.3f}")
+
+
+if __name__ == '__main__':
+    main()
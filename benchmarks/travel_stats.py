@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+TravelLog.get_stats latency: full-table aggregates vs the materialized row
+
+    python -m benchmarks.travel_stats [--visits 1000000]
+"""
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+
+from data.travel_log import TravelLog
+from benchmarks.synthetic import generate_travel_log
+
+
+def legacy_get_stats(conn):
+    """The six aggregate queries get_stats used to run"""
+    return {
+        'cities_visited': conn.execute('SELECT COUNT(DISTINCT city) FROM visits').fetchone()[0],
+        'countries_visited': conn.execute('SELECT COUNT(DISTINCT country) FROM visits').fetchone()[0],
+        'jobs_completed': conn.execute('SELECT COUNT(*) FROM jobs WHERE completed_at IS NOT NULL').fetchone()[0],
+        'total_income': conn.execute('SELECT COALESCE(SUM(income),0) FROM jobs WHERE completed_at IS NOT NULL').fetchone()[0],
+        'total_fines': conn.execute('SELECT COALESCE(SUM(amount),0) FROM fines').fetchone()[0],
+        'total_distance': conn.execute(
+            'SELECT COALESCE(SUM(distance_km),0) FROM jobs WHERE completed_at IS NOT NULL').fetchone()[0],
+    }
+
+
+def _time(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--visits', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(prefix='ets2-bench-'), 'travel_log.db')
+    start = time.perf_counter()
+    generate_travel_log(path, visits=args.visits)
+    print(f"generated {args.visits:,} visits in {time.perf_counter() - start:.1f} s")
+
+    log = TravelLog(path)
+    start = time.perf_counter()
+    log.rebuild_stats()
+    print(f"rebuild-stats: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    conn = sqlite3.connect(path)
+    legacy_ms, legacy = _time(lambda: legacy_get_stats(conn), 5)
+    new_ms, new = _time(log.get_stats, 200)
+    log.close()
+
+    print(f"full-table scans : {legacy_ms:10.3f} ms")
+    print(f"materialized row : {new_ms:10.3f} ms")
+    print(f"results identical: {legacy == new}")
+
+
+if __name__ == '__main__':
+    main()
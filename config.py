@@ -17,6 +17,20 @@ class Config:
     HOST = os.getenv('ETS2_HOST', '0.0.0.0')
     PORT = int(os.getenv('ETS2_PORT', 5000))
     DEBUG = os.getenv('ETS2_DEBUG', 'false').lower() == 'true'
+    SERVER_MODE = os.getenv('ETS2_SERVER', 'production')  # 'production' or 'dev' (see web/server.py)
+    SERVER_THREADS = int(os.getenv('ETS2_SERVER_THREADS', 16))
+    SERVER_IDLE_TIMEOUT = 5  # Seconds an idle connection is held open
+    SERVER_CONNECTION_LIMIT = 100  # waitress only
+
+    # On-demand profiling via /api/debug/profile (see utils/profiler.py)
+    PROFILING_ENABLED = os.getenv('ETS2_PROFILING', 'false').lower() == 'true'
+    PROFILE_MAX_SECONDS = 60
+    PROFILE_SAMPLE_HZ = 100  # Default stack samples per second
+    PROFILE_MAX_SAMPLE_HZ = 1000
+
+    # Span tracing for /api/debug/trace (see utils/tracing.py); 32 bytes per span
+    TRACING_ENABLED = os.getenv('ETS2_TRACING', 'true').lower() == 'true'
+    TRACE_BUFFER_SPANS = 32768  # ~1 minute of monitor ticks at 60 Hz
     
     # File paths
     BASE_DIR = Path(__file__).parent
@@ -26,16 +40,115 @@ class Config:
     # Telemetry settings
     TELEMETRY_PATH = '/dev/shm/SCS/SCSTelemetry'
     MIN_SHM_SIZE = 4305  # Minimum shared memory size to read all telemetry fields
-    UPDATE_INTERVAL = 1  # Seconds between coordinate updates
+    # Monitor loop rates (see core/scheduler.py and core/background_monitor.py)
+    MONITOR_TELEMETRY_HZ = float(os.getenv('ETS2_TELEMETRY_HZ', 10))  # Full telemetry frames
+    MONITOR_POSITION_HZ = float(os.getenv('ETS2_POSITION_HZ', 20))  # Position/nearest-city only
+    MONITOR_OVERRUN_POLICY = os.getenv('ETS2_MONITOR_OVERRUN', 'skip')  # 'skip' or 'catchup'
+    MONITOR_MAX_CATCHUP = 5  # Periods behind before 'catchup' gives up and skips
+    # Adaptive poll rate (see core/poll_policy.py); off keeps the fixed rates above
+    ADAPTIVE_POLLING = os.getenv('ETS2_ADAPTIVE_POLLING', 'true').lower() == 'true'
+    POLL_FAST_HZ = float(os.getenv('ETS2_POLL_FAST_HZ', 30))  # Loop rate when driving fast or watched
+    POLL_FAST_SPEED_KMH = float(os.getenv('ETS2_POLL_FAST_SPEED', 60))
+    POLL_IDLE_HZ = float(os.getenv('ETS2_POLL_IDLE_HZ', 1))  # Full frames when paused/parked/engine off
+    POLL_WAKE_HZ = float(os.getenv('ETS2_POLL_WAKE_HZ', 10))  # Frame-change checks while idle
+    POLL_VIEWER_TIMEOUT = 10  # Seconds after the last dashboard poll that a viewer counts as present
     STATUS_UPDATE_INTERVAL = 2  # Seconds between status updates
 
+    # Published payload cache (shared by every polling client)
+    PAYLOAD_PRECOMPRESS = os.getenv('ETS2_PAYLOAD_PRECOMPRESS', 'true').lower() == 'true'
+    PAYLOAD_GZIP_LEVEL = 6
+
+    # Gzip for other API responses, compressed per request (see web/compression.py)
+    RESPONSE_GZIP = os.getenv('ETS2_RESPONSE_GZIP', 'true').lower() == 'true'
+    RESPONSE_GZIP_MIN_SIZE = 1024  # Bytes; smaller bodies are sent as is
+    RESPONSE_GZIP_LEVEL = 1  # Per-request cost matters more than the last few bytes
+
+    # Minimum change before a float telemetry field counts as changed
+    # for /api/telemetry/delta (fields not listed use exact comparison)
+    TELEMETRY_DELTA_EPSILON = {
+        'speed': 0.5, 'cruiseControlSpeed': 0.5, 'speedLimit': 0.5,
+        'engineRpm': 10.0,
+        'fuel': 0.1, 'fuelCapacity': 0.1,
+        'odometer': 0.05,
+        'routeDistance': 10.0, 'routeTime': 1.0,
+        'engine': 0.001, 'transmission': 0.001, 'cabin': 0.001,
+        'chassis': 0.001, 'wheels': 0.001, 'cargo': 0.001,
+        'x': 0.5, 'y': 0.5, 'z': 0.5,
+    }
+
+    # Telemetry history ring buffers (/api/telemetry/history). Each channel
+    # costs 8 bytes per sample: 480 B per minute at a 1 s interval, so the
+    # defaults hold 8 channels + timestamps in 9 * 14.4 KB = 130 KB
+    TELEMETRY_HISTORY_CHANNELS = (
+        'speed', 'engineRpm', 'fuel',
+        'wearEngine', 'wearTransmission', 'wearCabin', 'wearChassis', 'wearWheels',
+    )
+    TELEMETRY_HISTORY_MINUTES = int(os.getenv('ETS2_TELEMETRY_HISTORY_MINUTES', 30))
+    TELEMETRY_HISTORY_INTERVAL = 1.0  # Seconds between samples
+    TELEMETRY_HISTORY_MAX_POINTS = 2000  # Per channel per response
+
+    # Trip metrics (core/trip_stats.py)
+    TRIP_MOVING_SPEED = 2.0  # km/h; slower counts as standing (idle if the engine runs)
+    TRIP_SPEEDING_MARGIN = 5.0  # km/h over the limit before time counts as speeding
+    TRIP_MAX_GAP = 5.0  # Seconds; longer gaps between frames add no time
+    TRIP_CHECKPOINT_INTERVAL = 60  # Seconds between session metric checkpoints
+
     # Alert thresholds
     ALERT_COOLDOWN_SECONDS = 60
     LOW_FUEL_THRESHOLD = 0.15  # 15% fuel remaining
+    ALERT_LOG_SIZE = 200  # Alerts kept for clients reading with ?after=<seq>
+
+    # Default alert rules (see core/alert_rules.py); user copies live in settings
+    DEFAULT_ALERT_RULES = [
+        {
+            'id': 'speed', 'field': 'speedOverLimit', 'op': '>', 'threshold': 5,
+            'hysteresis': 2,
+            'message': 'Speeding! {speed:.0f} km/h in a {speedLimit:.0f} km/h zone',
+        },
+        {
+            'id': 'fuel', 'field': 'fuelRatio', 'op': '<', 'threshold': LOW_FUEL_THRESHOLD,
+            'hysteresis': 0.02, 'when': ['engineEnabled'],
+            'message': 'Low fuel! {fuelPercent:.0f}% remaining',
+        },
+        {
+            'id': 'rest', 'field': 'restStop', 'op': '>', 'threshold': 0,
+            'message': 'Rest stop needed soon',
+        },
+    ]
 
     # Settings file
     SETTINGS_FILE = BASE_DIR / 'settings.json'
     TRAVEL_LOG_DB = BASE_DIR / 'travel_log.db'
+
+    # Travel log write-behind queue
+    TRAVEL_LOG_QUEUE_SIZE = 10000  # Pending writes before new ones are dropped
+    TRAVEL_LOG_FLUSH_INTERVAL = 1.0  # Seconds between batched commits when idle
+    TRAVEL_LOG_BATCH_SIZE = 500  # Max writes per transaction
+    TRAVEL_LOG_READ_POOL_SIZE = 4  # Read-only connections shared by web handlers
+    # Travel log retention: visits older than this are rolled up into
+    # per-day/per-city rows (0 keeps every visit)
+    VISIT_RETENTION_DAYS = int(os.getenv('ETS2_VISIT_RETENTION_DAYS', 365))
+    TRAVEL_LOG_MAINTENANCE_DELAY = 300  # Seconds after startup before the first pass
+    TRAVEL_LOG_MAINTENANCE_INTERVAL = 3600  # Seconds between maintenance passes
+    TRAVEL_LOG_ROLLUP_CHUNK = 5000  # Visits rolled up per step
+    TRAVEL_LOG_VACUUM_PAGES = 256  # Free pages released per step
+    # Heatmap grids: the finest zoom uses HEATMAP_CELL_SIZE meter cells and
+    # each coarser level doubles it
+    HEATMAP_CELL_SIZE = 250.0
+    HEATMAP_ZOOM_LEVELS = 6
+    HEATMAP_EXTENT = 500000.0  # Meters; larger than any map coordinate
+    # Route simplification tolerance (meters) at the finest heatmap zoom;
+    # doubles with each coarser level
+    ROUTE_TOLERANCE = 2.0
+    ROUTE_CACHE_SIZE = 32  # Simplified routes kept per (session, zoom)
+    MAX_PAGE_SIZE = 500  # Max rows per /api/travel/recent or /api/travel/jobs page
+
+    # Breadcrumb track (travel log route recording)
+    TRACK_MIN_DISTANCE = 25.0  # Meters moved before another point is kept
+    TRACK_MIN_INTERVAL = 1.0  # Seconds; never keep points more often than this
+    TRACK_MAX_INTERVAL = 30.0  # Seconds; keep a point at least this often
+    TRACK_BLOCK_SECONDS = 60  # Points are stored in per-minute compressed blocks
+    TRACK_RESOLUTION = 0.1  # Meters; stored position precision
     
     # Signal strength settings
     BASE_TRANSMISSION_RANGE = 25000  # Base range in meters
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Bounded, cursor-based alert log for ETS2 Truck Companion
+"""
+
+import time
+import threading
+from collections import deque
+from config import Config
+
+
+class AlertLog:
+    """Ring buffer of alerts with monotonically increasing sequence numbers
+
+    Readers keep their own cursor (the last seq they saw), so any number of
+    clients can read independently and nothing is consumed. Memory is bounded
+    by the ring size whether or not anyone is polling.
+    """
+
+    def __init__(self, capacity=None):
+        self._alerts = deque(maxlen=capacity or Config.ALERT_LOG_SIZE)
+        self._lock = threading.Lock()
+        self.last_seq = 0
+
+    def append(self, alert_type, message):
+        """Add an alert and return it"""
+        with self._lock:
+            self.last_seq += 1
+            alert = {
+                'seq': self.last_seq,
+                'type': alert_type,
+                'message': message,
+                'timestamp': time.time(),
+            }
+            self._alerts.append(alert)
+            return alert
+
+    def after(self, seq):
+        """(alerts with seq greater than `seq` oldest first, last_seq)
+
+        Both are read under the lock, so last_seq is never ahead of the
+        alerts returned and a client can safely use it as its next cursor.
+        Walks back from the newest entry, so the cost is O(new alerts).
+        A cursor ahead of the log (e.g. from before a restart) reads from
+        the start of the buffer.
+        """
+        with self._lock:
+            last_seq = self.last_seq
+            if seq > last_seq:
+                seq = 0
+            new = []
+            for alert in reversed(self._alerts):
+                if alert['seq'] <= seq:
+                    break
+                new.append(alert)
+            new.reverse()
+            return new, last_seq
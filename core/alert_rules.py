@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Declarative alert rules for ETS2 Truck Companion
+
+Rules are plain dicts (stored in settings) such as::
+
+    {'id': 'speed', 'field': 'speedOverLimit', 'op': '>', 'threshold': 5,
+     'hysteresis': 2, 'cooldown': 60,
+     'message': 'Speeding! {speed:.0f} km/h in a {speedLimit:.0f} km/h zone'}
+
+They are compiled once into closures; per tick the engine only computes the
+derived fields some rule actually references and calls each evaluator.
+"""
+
+import json
+import operator
+from collections import ChainMap
+from config import Config
+
+
+def _speed_over_limit(t):
+    return t['speed'] - t['speedLimit'] if t['speedLimit'] > 0 else float('-inf')
+
+
+def _fuel_ratio(t):
+    return t['fuel'] / t['fuelCapacity'] if t['fuelCapacity'] > 0 else 1.0
+
+
+def _fuel_percent(t):
+    return _fuel_ratio(t) * 100
+
+
+def _cruise_deviation(t):
+    return abs(t['speed'] - t['cruiseControlSpeed']) if t['cruiseControlSpeed'] > 0 else 0.0
+
+
+def _wear_max(t):
+    return max(t['wearEngine'], t['wearTransmission'], t['wearCabin'],
+               t['wearChassis'], t['wearWheels'])
+
+
+# Fields computed from raw telemetry, usable in rules and message templates
+DERIVED_FIELDS = {
+    'speedOverLimit': _speed_over_limit,
+    'fuelRatio': _fuel_ratio,
+    'fuelPercent': _fuel_percent,
+    'cruiseDeviation': _cruise_deviation,
+    'wearMax': _wear_max,
+}
+
+# comparator -> (test, sign of the hysteresis band when releasing)
+OPERATORS = {
+    '>': (operator.gt, -1),
+    '>=': (operator.ge, -1),
+    '<': (operator.lt, 1),
+    '<=': (operator.le, 1),
+    '==': (operator.eq, 0),
+    '!=': (operator.ne, 0),
+}
+
+
+class AlertRuleError(ValueError):
+    """Raised when a rule definition is invalid"""
+
+
+def compile_rule(rule, default_cooldown, state=None):
+    """Compile one rule dict into an evaluator(telemetry, derived, now)
+
+    `state` is the [active, last_fired] list to keep the rule's state in;
+    pass the one from a previous compile to carry it over.
+    """
+    if not isinstance(rule, dict):
+        raise AlertRuleError(f"rule must be an object, got {type(rule).__name__}")
+    rule_id = rule.get('id', '?')
+    try:
+        field = rule['field']
+        if not isinstance(field, str):
+            raise TypeError(f"field must be a string, got {type(field).__name__}")
+        test, band_sign = OPERATORS[rule.get('op', '>')]
+        threshold = float(rule['threshold'])
+        cooldown = rule.get('cooldown')
+        cooldown = float(default_cooldown if cooldown is None else cooldown)
+        release = threshold + band_sign * float(rule.get('hysteresis', 0) or 0)
+        requires = rule.get('when', ())
+        if isinstance(requires, str) or not all(isinstance(flag, str) for flag in requires):
+            raise TypeError("when must be a list of field names")
+        requires = tuple(requires)
+        template = rule.get('message')
+        if template is not None and not isinstance(template, str):
+            raise TypeError(f"message must be a string, got {type(template).__name__}")
+    except KeyError as e:
+        raise AlertRuleError(f"rule {rule_id}: missing or unknown {e}") from None
+    except (TypeError, ValueError) as e:
+        raise AlertRuleError(f"rule {rule_id}: {e}") from None
+
+    alert_type = rule.get('type') or rule.get('id') or field
+    template = template or f"{alert_type}: {{{field}}}"
+    derived = field in DERIVED_FIELDS
+
+    # Mutable per-rule state kept in the closure: [active, last_fired]
+    if state is None:
+        state = [False, float('-inf')]
+
+    def evaluate(telemetry, derived_values, now):
+        try:
+            for flag in requires:
+                if not telemetry[flag]:
+                    state[0] = False
+                    return None
+            value = float(derived_values[field] if derived else telemetry[field])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+        if state[0]:
+            # Stay active until the value crosses back past the release point
+            if band_sign and not test(value, release):
+                state[0] = False
+                return None
+            if not band_sign and not test(value, threshold):
+                state[0] = False
+                return None
+        elif test(value, threshold):
+            state[0] = True
+        else:
+            return None
+
+        if now - state[1] < cooldown:
+            return None
+        state[1] = now
+        try:
+            message = template.format_map(ChainMap(derived_values, telemetry))
+        except (KeyError, ValueError, IndexError):
+            message = template
+        return alert_type, message
+
+    evaluate.state = state
+    return evaluate
+
+
+def _rule_key(rule):
+    """Identity of a rule definition, for carrying its state across recompiles"""
+    return json.dumps(rule, sort_keys=True, default=str)
+
+
+class AlertRuleEngine:
+    """Evaluates a compiled set of alert rules against telemetry frames"""
+
+    def __init__(self, rules=(), default_cooldown=60):
+        self.version = None
+        self._evaluators = []
+        self._derived = ()
+        self._source = None
+        self._states = {}  # rule key -> [active, last_fired]
+        self.compile(rules, default_cooldown)
+
+    def compile(self, rules, default_cooldown, version=None):
+        """Replace the active rule set; invalid or disabled rules are skipped
+
+        An unchanged rule set is left alone, and rules whose definition did
+        not change keep their active/cooldown state, so saving unrelated
+        settings never re-fires an alert whose condition still holds.
+        """
+        try:
+            default_cooldown = float(default_cooldown)
+        except (TypeError, ValueError):
+            print(f"Warning: invalid alert cooldown {default_cooldown!r}, "
+                  f"using {Config.ALERT_COOLDOWN_SECONDS}")
+            default_cooldown = float(Config.ALERT_COOLDOWN_SECONDS)
+        if not isinstance(rules, (list, tuple)):
+            print(f"Warning: alert rules must be a list, got {type(rules).__name__}")
+            rules = ()
+        source = (default_cooldown, [_rule_key(rule) for rule in rules])
+        if source == self._source:
+            self.version = version
+            return
+
+        evaluators = []
+        derived = set()
+        states = {}
+        for rule, key in zip(rules, source[1]):
+            if not isinstance(rule, dict) or rule.get('enabled') is False:
+                continue
+            state = self._states.get((default_cooldown, key))
+            try:
+                evaluators.append(compile_rule(rule, default_cooldown, state))
+            except AlertRuleError as e:
+                print(f"Warning: skipping alert rule: {e}")
+                continue
+            states[(default_cooldown, key)] = evaluators[-1].state
+            if rule['field'] in DERIVED_FIELDS:
+                derived.add(rule['field'])
+            # Templates may reference derived fields too
+            for name in DERIVED_FIELDS:
+                if '{' + name in (rule.get('message') or ''):
+                    derived.add(name)
+
+        self._evaluators = evaluators
+        self._derived = tuple((name, DERIVED_FIELDS[name]) for name in sorted(derived))
+        self._source = source
+        self._states = states
+        self.version = version
+
+    def evaluate(self, telemetry, now):
+        """Return a list of (alert_type, message) for rules firing this frame"""
+        derived_values = {name: fn(telemetry) for name, fn in self._derived}
+        fired = []
+        for evaluate in self._evaluators:
+            alert = evaluate(telemetry, derived_values, now)
+            if alert:
+                fired.append(alert)
+        return fired
+
+    def rule_count(self):
+        return len(self._evaluators)
@@ -1,10 +1,41 @@
 #!/usr/bin/env python3
 """
 Background telemetry monitoring for ETS2 Truck Companion
+
+The loop runs on a FixedRateScheduler at the higher of
+Config.MONITOR_POSITION_HZ and Config.MONITOR_TELEMETRY_HZ. Most ticks only
+read the position (three doubles) and update the nearest city; every Nth
+tick reads and applies the full telemetry frame, so the full path runs at
+about MONITOR_TELEMETRY_HZ.
+
+With Config.ADAPTIVE_POLLING the rate follows core/poll_policy.py: faster
+when driving fast or watched, and while idle (paused, parked, engine off)
+mostly cheap frame-marker checks, with a full frame as soon as it changes.
 """
 
 import threading
+from time import perf_counter_ns
 from config import Config
+from core.poll_policy import POLL_POLICY
+from core.scheduler import OVERRUN_POLICIES, FixedRateScheduler
+from utils.metrics import REGISTRY
+from utils.profiler import MONITOR_PROFILER
+from utils.tracing import TRACER
+
+TICK_JITTER_SECONDS = REGISTRY.histogram(
+    'ets2_monitor_tick_jitter_seconds', 'How late each monitor tick starts relative to its deadline')
+MONITOR_OVERRUNS = REGISTRY.counter(
+    'ets2_monitor_overruns', 'Monitor ticks that started after their deadline had passed')
+MONITOR_SKIPPED = REGISTRY.counter(
+    'ets2_monitor_skipped_ticks', 'Monitor ticks dropped after an overrun')
+POLL_MODE_CHANGES = REGISTRY.counter(
+    'ets2_monitor_poll_mode_changes', 'Adaptive poll mode switches, by the mode entered',
+    labelnames=('mode',))
+POLL_WAKEUPS = REGISTRY.counter(
+    'ets2_monitor_poll_wakeups', 'Idle ticks that read a full frame early because the frame marker changed')
+MONITOR_ERRORS = REGISTRY.counter('ets2_monitor_errors', 'Exceptions caught in the monitor loop')
+SPAN_TICK = TRACER.name('tick', 'monitor')
+SPAN_POSITION_TICK = TRACER.name('position_tick', 'monitor')
 
 
 class BackgroundMonitor:
@@ -14,6 +45,8 @@ class BackgroundMonitor:
         self.coord_reader = coord_reader
         self.radio_controller = radio_controller
         self.thread = None
+        self.scheduler = None
+        self.policy = POLL_POLICY if Config.ADAPTIVE_POLLING else None
         self._stop_event = threading.Event()
 
     def start(self):
@@ -45,21 +78,82 @@ class BackgroundMonitor:
 
     def _monitor_loop(self):
         """Main monitoring loop"""
-        while not self._stop_event.is_set():
+        policy = self.policy
+        mode = 'normal'
+        if policy:
+            rate, telemetry_every = policy.loop_hz(mode), policy.telemetry_every(mode)
+        else:
+            rate = max(Config.MONITOR_POSITION_HZ, Config.MONITOR_TELEMETRY_HZ)
+            telemetry_every = max(1, round(rate / Config.MONITOR_TELEMETRY_HZ))
+        overrun_policy = Config.MONITOR_OVERRUN_POLICY
+        if overrun_policy not in OVERRUN_POLICIES:
+            print(f"⚠️ Unknown monitor overrun policy '{overrun_policy}', using skip")
+            overrun_policy = 'skip'
+        scheduler = self.scheduler = FixedRateScheduler(rate, overrun_policy)
+        count = 0
+        marker = None
+        while True:
+            overruns, skipped = scheduler.overruns, scheduler.skipped
+            lateness = scheduler.wait(self._stop_event)
+            if lateness is None:
+                break
+            TICK_JITTER_SECONDS.observe(lateness)
+            if scheduler.overruns != overruns:
+                MONITOR_OVERRUNS.inc()
+            if scheduler.skipped != skipped:
+                MONITOR_SKIPPED.inc(scheduler.skipped - skipped)
+
+            tick = perf_counter_ns()
             try:
-                telemetry = self.coord_reader.read_telemetry()
+                if mode == 'idle':
+                    # Only the marker between idle frames; a change means the game moved on
+                    previous, marker = marker, self.coord_reader.read_frame_marker()
+                    full = count % telemetry_every == 0
+                    count += 1
+                    if not full:
+                        if marker == previous:
+                            continue
+                        POLL_WAKEUPS.inc()
+                        full = True
+                else:
+                    full = count % telemetry_every == 0
+                    count += 1
 
-                if telemetry:
-                    self.radio_controller.update_telemetry(telemetry)
+                if MONITOR_PROFILER.active:
+                    telemetry = MONITOR_PROFILER.run(self._tick, full)
+                else:
+                    telemetry = self._tick(full)
+                TRACER.record(SPAN_TICK if full else SPAN_POSITION_TICK, tick)
 
+                if policy and telemetry:
+                    new_mode = policy.choose(telemetry)
+                    if new_mode != mode:
+                        POLL_MODE_CHANGES.labels(new_mode).inc()
+                        mode = new_mode
+                        scheduler.set_rate(policy.loop_hz(mode))
+                        telemetry_every = policy.telemetry_every(mode)
+                        # The frame just read counts as this mode's first full tick
+                        count = 1
+                        if mode == 'idle':
+                            marker = self.coord_reader.read_frame_marker()
             except Exception as e:
+                MONITOR_ERRORS.inc()
                 print(f"Error in telemetry monitoring: {e}")
                 if self._stop_event.wait(timeout=2):
                     break
-                continue
+                scheduler.reset()
 
-            if self._stop_event.wait(timeout=Config.UPDATE_INTERVAL):
-                break
+    def _tick(self, full=True):
+        """Apply a full telemetry frame (returned), or only the current position"""
+        if full:
+            telemetry = self.coord_reader.read_telemetry()
+            if telemetry:
+                self.radio_controller.update_telemetry(telemetry)
+            return telemetry
+        coordinates = self.coord_reader.read_coordinates()
+        if coordinates:
+            self.radio_controller.update_position(coordinates)
+        return None
 
     def is_running(self):
         """Check if monitoring is running"""
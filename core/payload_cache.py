@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Shared serialized payload cache for ETS2 Truck Companion
+
+Every connected client (tablet, second monitor, OBS browser source) polls the
+same published state. Instead of re-serializing it per request, the state is
+serialized once per revision and the resulting bytes are shared.
+"""
+
+import gzip
+import threading
+from config import Config
+from utils.json_helpers import dumps
+
+
+class SerializedPayload:
+    """Immutable snapshot of one published state revision"""
+
+    __slots__ = ('revision', 'body', 'etag', '_gzip_body', '_gzip_level')
+
+    def __init__(self, revision, body, gzip_level):
+        self.revision = revision
+        self.body = body
+        self.etag = f'"r{revision}-{len(body)}"'
+        self._gzip_body = None
+        self._gzip_level = gzip_level
+
+    def gzip_body(self):
+        """Gzip-compressed body, compressed at most once per revision"""
+        if self._gzip_body is None:
+            self._gzip_body = gzip.compress(self.body, compresslevel=self._gzip_level, mtime=0)
+        return self._gzip_body
+
+
+class PayloadCache:
+    """Serializes builder output once per revision and shares the bytes"""
+
+    def __init__(self, builder, gzip_level=None):
+        # builder() -> (revision, data), taken atomically by the caller's lock
+        self._builder = builder
+        self._gzip_level = gzip_level if gzip_level is not None else Config.PAYLOAD_GZIP_LEVEL
+        self._payload = None
+        self._build_lock = threading.Lock()
+        self.builds = 0
+        self.hits = 0
+
+    def get(self, revision):
+        """Return the payload for the given revision, building it if stale"""
+        payload = self._payload
+        if payload is not None and payload.revision == revision:
+            self.hits += 1
+            return payload
+
+        with self._build_lock:
+            # Another thread may have built it while we waited
+            payload = self._payload
+            if payload is not None and payload.revision >= revision:
+                self.hits += 1
+                return payload
+
+            built_revision, data = self._builder()
+            body = dumps(data)
+            payload = SerializedPayload(built_revision, body, self._gzip_level)
+            if Config.PAYLOAD_PRECOMPRESS:
+                payload.gzip_body()
+            self._payload = payload
+            self.builds += 1
+            return payload
+
+    def invalidate(self):
+        """Drop the cached payload"""
+        self._payload = None
+
+    def get_stats(self):
+        return {'builds': self.builds, 'hits': self.hits}
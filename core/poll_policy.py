@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Adaptive monitor poll rate from game and truck state
+
+Each full telemetry frame puts the monitor in one of three modes:
+
+  idle    paused, engine off, or parked (park brake on, standing still);
+          full frames drop to Config.POLL_IDLE_HZ and the loop only checks
+          a cheap frame marker between them, waking at once when it changes
+  fast    driving at Config.POLL_FAST_SPEED_KMH or more, or a dashboard
+          polled within Config.POLL_VIEWER_TIMEOUT seconds; the loop runs
+          at Config.POLL_FAST_HZ, or the normal rate if that is higher
+  normal  anything else; the configured MONITOR_POSITION_HZ and
+          MONITOR_TELEMETRY_HZ rates
+
+Outside idle, full frames stay at about MONITOR_TELEMETRY_HZ whatever the
+loop rate; fast mode only adds position ticks.
+
+Idle wins over a viewer: nothing on the dashboard moves while idle, and the
+frame marker brings the rate back up as soon as something does.
+"""
+
+import time
+from config import Config
+
+POLL_MODES = ('idle', 'normal', 'fast')
+FAST_SPEED_HYSTERESIS_KMH = 5.0  # Stay fast until this far below the threshold
+PARKED_SPEED_KMH = 1.0
+
+
+class PollPolicy:
+    """Picks the monitor's poll mode and rates"""
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._last_viewer = None
+        self.mode = 'normal'
+
+    def note_viewer(self):
+        """Record that a client just polled the dashboard"""
+        self._last_viewer = self._clock()
+
+    def viewer_active(self):
+        last = self._last_viewer
+        return last is not None and self._clock() - last < Config.POLL_VIEWER_TIMEOUT
+
+    def choose(self, telemetry):
+        """Mode for the state in a full telemetry frame"""
+        speed = telemetry.get('speed', 0.0)
+        if (telemetry.get('paused')
+                or not telemetry.get('engineEnabled', True)
+                or (telemetry.get('parkBrake') and speed < PARKED_SPEED_KMH)):
+            mode = 'idle'
+        elif self.viewer_active():
+            mode = 'fast'
+        elif speed >= Config.POLL_FAST_SPEED_KMH:
+            mode = 'fast'
+        elif self.mode == 'fast' and speed >= Config.POLL_FAST_SPEED_KMH - FAST_SPEED_HYSTERESIS_KMH:
+            mode = 'fast'
+        else:
+            mode = 'normal'
+        self.mode = mode
+        return mode
+
+    @staticmethod
+    def loop_hz(mode):
+        """Scheduler rate for a mode (frame-marker checks when idle)"""
+        if mode == 'idle':
+            return Config.POLL_WAKE_HZ
+        rate = max(Config.MONITOR_POSITION_HZ, Config.MONITOR_TELEMETRY_HZ)
+        if mode == 'fast':
+            # Never slower than normal mode, whatever the configured rates
+            return max(Config.POLL_FAST_HZ, rate)
+        return rate
+
+    @classmethod
+    def telemetry_every(cls, mode):
+        """Ticks between full frames in a mode"""
+        if mode == 'idle':
+            return cls.idle_every()
+        return max(1, round(cls.loop_hz(mode) / Config.MONITOR_TELEMETRY_HZ))
+
+    @staticmethod
+    def idle_every():
+        """Ticks between full frames while idle"""
+        return max(1, round(Config.POLL_WAKE_HZ / Config.POLL_IDLE_HZ))
+
+
+POLL_POLICY = PollPolicy()
@@ -4,8 +4,28 @@ Main application controller for ETS2 Truck Companion
 """
 
 import time
-import threading
+from time import perf_counter_ns
 from config import Config
+from core.alert_log import AlertLog
+from core.alert_rules import AlertRuleEngine
+from core.payload_cache import PayloadCache
+from core.telemetry_delta import TelemetryDeltaTracker
+from core.telemetry_history import TelemetryHistory
+from core.trip_stats import TripStats
+from utils.metrics import REGISTRY, TimedLock
+from utils.tracing import TRACER
+
+UPDATE_TELEMETRY_SECONDS = REGISTRY.histogram(
+    'ets2_update_telemetry_seconds', 'RadioController.update_telemetry duration per frame')
+LOCK_WAIT_SECONDS = REGISTRY.histogram(
+    'ets2_controller_lock_wait_seconds', 'Time spent waiting to acquire the RadioController lock')
+CITY_LOOKUP_SECONDS = REGISTRY.histogram(
+    'ets2_city_lookup_seconds', 'Nearest-city lookup time per position update')
+
+SPAN_UPDATE = TRACER.name('update_telemetry', 'controller')
+SPAN_ALERTS = TRACER.name('alerts', 'controller')
+SPAN_CITY_LOOKUP = TRACER.name('city_lookup', 'controller')
+SPAN_TRAVEL_LOG = TRACER.name('record_position', 'travel_log')
 
 
 class RadioController:
@@ -30,7 +50,10 @@ class RadioController:
         self.truck = {}
         self.job = {}
         self.damage = {}
-        self.alerts = []
+        self.alert_log = AlertLog()
+        self.trip_session = TripStats()
+        self.trip_job = None
+        self._next_trip_checkpoint = time.time() + Config.TRIP_CHECKPOINT_INTERVAL
 
         # State tracking
         self.last_city = None
@@ -41,10 +64,18 @@ class RadioController:
         self._prev_fined = False
         self._prev_job_delivered = False
         self._job_start_data = None
-        self._alert_cooldowns = {}
+        self.alert_rules = AlertRuleEngine(Config.DEFAULT_ALERT_RULES, Config.ALERT_COOLDOWN_SECONDS)
 
-        # Thread safety
-        self._lock = threading.Lock()
+        # Thread safety; acquisitions are timed for /metrics
+        self._lock = TimedLock(LOCK_WAIT_SECONDS)
+
+        # Published state revision; bumped on every mutation so the shared
+        # payload caches know when to re-serialize
+        self._revision = 0
+        self._status_cache = PayloadCache(self._snapshot_status)
+        self._telemetry_cache = PayloadCache(self._snapshot_telemetry)
+        self._telemetry_delta = TelemetryDeltaTracker()
+        self.telemetry_history = TelemetryHistory()
 
     def initialize(self):
         """Initialize the controller"""
@@ -63,16 +94,9 @@ class RadioController:
         """Update state from full telemetry dict"""
         if not telemetry:
             return
+        start = perf_counter_ns()
 
         with self._lock:
-            # Build coordinates dict for backward compat
-            self.current_coordinates = {
-                'x': telemetry['coordinateX'],
-                'y': telemetry['coordinateY'],
-                'z': telemetry['coordinateZ'],
-                'timestamp': telemetry['timestamp']
-            }
-
             # Update truck state
             self.truck = {
                 'speed': telemetry['speed'],
@@ -125,12 +149,53 @@ class RadioController:
             # Detect fines
             self._detect_fines(telemetry)
 
-            # Check alert conditions
-            self._check_alerts(telemetry)
+            if not telemetry['paused']:
+                self.trip_session.update(telemetry, telemetry['timestamp'])
+                if self.trip_job:
+                    self.trip_job.update(telemetry, telemetry['timestamp'])
+
+            changed = self._telemetry_delta.update({
+                'truck': self.truck,
+                'damage': self.damage,
+                'job': self.job,
+                'coordinates': {
+                    'x': telemetry['coordinateX'],
+                    'y': telemetry['coordinateY'],
+                    'z': telemetry['coordinateZ'],
+                },
+            })
+            if changed:
+                self._revision += 1
+
+        # Rule evaluation only touches monitor-thread state and the alert
+        # log's own lock, so it runs outside the controller lock
+        alerts_start = perf_counter_ns()
+        self._check_alerts(telemetry)
+        TRACER.record(SPAN_ALERTS, alerts_start)
 
         # Position/radio logic (calls _lock internally via existing methods)
         self._update_position_from_telemetry(telemetry)
 
+        if not telemetry['paused']:
+            # The history has its own lock; only the monitor thread records
+            self.telemetry_history.record(telemetry, telemetry['timestamp'])
+            if self.travel_log:
+                log_start = perf_counter_ns()
+                self.travel_log.record_position(
+                    telemetry['timestamp'], telemetry['coordinateX'], telemetry['coordinateZ']
+                )
+                TRACER.record(SPAN_TRAVEL_LOG, log_start)
+
+        if self.travel_log and telemetry['timestamp'] >= self._next_trip_checkpoint:
+            # Keep the session row (and driven distance) current in case we never get to cleanup
+            self._next_trip_checkpoint = telemetry['timestamp'] + Config.TRIP_CHECKPOINT_INTERVAL
+            with self._lock:
+                metrics = self.trip_session.snapshot()
+            self.travel_log.update_session(metrics)
+        end = perf_counter_ns()
+        UPDATE_TELEMETRY_SECONDS.observe_ns(end - start)
+        TRACER.record(SPAN_UPDATE, start, end)
+
     def _update_position_from_telemetry(self, telemetry):
         """Handle position/radio logic from telemetry data"""
         coordinates = {
@@ -147,11 +212,18 @@ class RadioController:
             return
 
         with self._lock:
+            previous = self.current_coordinates
             self.current_coordinates = coordinates
+            # Only publish a new revision when the position (or city/country below) changed
+            changed = previous is None or any(previous[k] != coordinates[k] for k in ('x', 'y', 'z'))
 
+            lookup_start = perf_counter_ns()
             nearest_city, distance = self.city_db.find_nearest_city(
                 coordinates['x'], coordinates['z']
             )
+            lookup_end = perf_counter_ns()
+            CITY_LOOKUP_SECONDS.observe_ns(lookup_end - lookup_start)
+            TRACER.record(SPAN_CITY_LOOKUP, lookup_start, lookup_end)
 
             if nearest_city:
                 signal_strength = self.city_db.get_signal_strength(
@@ -162,6 +234,7 @@ class RadioController:
                 city_changed = nearest_city != self.last_city
 
                 if city_changed:
+                    changed = True
                     print(f"Near {nearest_city['realName']}, {nearest_city['country']} "
                           f"(signal: {signal_strength:.1%}, distance: {distance:.0f}m)")
                     self._on_city_change(nearest_city, signal_strength)
@@ -176,12 +249,17 @@ class RadioController:
                 if nearest_city['country'] != self.last_country:
                     self._on_country_change(nearest_city['country'])
                     self.last_country = nearest_city['country']
+                    changed = True
 
             elif self.last_city:
                 print("Left all city transmission ranges")
                 self.last_city = None
                 self.current_city = None
                 self.current_signal_strength = 0.0
+                changed = True
+
+            if changed:
+                self._revision += 1
 
     def _update_city_info(self, city, signal_strength):
         """Update current city info without triggering station suggestions"""
@@ -244,6 +322,7 @@ class RadioController:
                 'distance': telemetry['plannedDistanceKm'],
                 'income': telemetry['jobIncome'],
             }
+            self.trip_job = TripStats()
             if self.travel_log:
                 self.travel_log.record_job_start(
                     telemetry['cargo'],
@@ -255,8 +334,13 @@ class RadioController:
         # Job delivered
         if delivered and not self._prev_job_delivered:
             print(f"Job delivered! Cargo damage: {telemetry['cargoDamage']:.1%}")
+            metrics = self.trip_job.snapshot() if self.trip_job else None
             if self.travel_log:
-                self.travel_log.record_job_complete(telemetry['cargoDamage'])
+                self.travel_log.record_job_complete(telemetry['cargoDamage'], metrics)
+
+        # Delivered or cancelled: stop measuring the job
+        if not on_job and self._prev_on_job:
+            self.trip_job = None
 
         self._prev_on_job = on_job
         self._prev_job_delivered = delivered
@@ -274,64 +358,40 @@ class RadioController:
         self._prev_fined = telemetry['fined']
 
     def _check_alerts(self, telemetry):
-        """Check for alert conditions"""
-        now = time.time()
-        cooldown = Config.ALERT_COOLDOWN_SECONDS
-
-        # Speeding
-        if (telemetry['speedLimit'] > 0 and
-                telemetry['speed'] > telemetry['speedLimit'] + 5):
-            self._add_alert_with_cooldown(
-                'speed',
-                f"Speeding! {telemetry['speed']:.0f} km/h in a {telemetry['speedLimit']:.0f} km/h zone",
-                now, cooldown
-            )
-
-        # Low fuel
-        if (telemetry['fuelCapacity'] > 0 and
-                telemetry['fuel'] / telemetry['fuelCapacity'] < Config.LOW_FUEL_THRESHOLD and
-                telemetry['engineEnabled']):
-            pct = telemetry['fuel'] / telemetry['fuelCapacity'] * 100
-            self._add_alert_with_cooldown(
-                'fuel',
-                f"Low fuel! {pct:.0f}% remaining",
-                now, cooldown
-            )
-
-        # Rest needed
-        if telemetry['restStop'] > 0:
-            self._add_alert_with_cooldown(
-                'rest',
-                "Rest stop needed soon",
-                now, cooldown
-            )
-
-    def _add_alert_with_cooldown(self, alert_type, message, now, cooldown):
-        """Add an alert if not on cooldown"""
-        last = self._alert_cooldowns.get(alert_type, 0)
-        if now - last >= cooldown:
-            self._add_alert(alert_type, message)
-            self._alert_cooldowns[alert_type] = now
+        """Evaluate the compiled alert rules against this frame"""
+        self._sync_alert_rules()
+        fired = self.alert_rules.evaluate(telemetry, time.time())
+        if fired:
+            with self._lock:
+                for alert_type, message in fired:
+                    self._add_alert(alert_type, message)
+
+    def _sync_alert_rules(self):
+        """Recompile alert rules when the settings have changed"""
+        settings = self.settings_manager
+        if settings is None or settings.version == self.alert_rules.version:
+            return
+        self.alert_rules.compile(
+            settings.get('alert_rules', Config.DEFAULT_ALERT_RULES),
+            settings.get('alert_cooldown_seconds', Config.ALERT_COOLDOWN_SECONDS),
+            version=settings.version,
+        )
 
     def _add_alert(self, alert_type, message):
-        """Add an alert to the pending list"""
-        self.alerts.append({
-            'type': alert_type,
-            'message': message,
-            'timestamp': time.time()
-        })
-
-    def consume_alerts(self):
-        """Return and clear pending alerts"""
-        with self._lock:
-            alerts = list(self.alerts)
-            self.alerts.clear()
-            return alerts
+        """Append an alert to the alert log"""
+        self.alert_log.append(alert_type, message)
+        self._revision += 1
+
+    def get_alerts_after(self, seq):
+        """Return alerts newer than the client's cursor, without consuming them"""
+        alerts, last_seq = self.alert_log.after(seq)
+        return {'alerts': alerts, 'last_seq': last_seq}
 
     def set_playing_station(self, station):
         """Set the currently playing station"""
         with self._lock:
             self.current_playing_station = station
+            self._revision += 1
         if station:
             print(f"Now playing: {station['name']} - {station.get('country', 'Unknown')}")
 
@@ -346,30 +406,74 @@ class RadioController:
             if self.current_playing_station:
                 print(f"Stopped: {self.current_playing_station['name']}")
             self.current_playing_station = None
+            self._revision += 1
 
     def get_status(self):
         """Get complete application status"""
         with self._lock:
-            return {
-                'country': self.current_country,
-                'city': self.current_city,
-                'coordinates': self.current_coordinates,
-                'signal_strength': self.current_signal_strength,
-                'stations': self.station_manager.get_stations_for_country(self.current_country) if self.current_country else [],
-                'all_countries': self.station_manager.get_countries(),
-                'plugin_connected': self.coord_reader.is_connected(),
-                'tracking_mode': 'plugin' if self.coord_reader.is_connected() else 'manual',
-                'total_stations': self.station_manager.get_total_station_count(),
-                'total_countries': self.station_manager.get_country_count(),
-                'cities_available': self.city_db.get_city_count(),
-                'suggested_station': self.current_station,
-                'playing_station': self.current_playing_station,
+            return self._build_status()
+
+    def get_status_payload(self):
+        """Get the serialized status shared by all polling clients"""
+        with self._lock:
+            revision = self._revision
+        return self._status_cache.get(revision)
+
+    def get_telemetry_payload(self):
+        """Get the serialized truck telemetry shared by all polling clients"""
+        with self._lock:
+            revision = self._revision
+        return self._telemetry_cache.get(revision)
+
+    def get_telemetry_delta(self, since):
+        """Get telemetry fields changed since the given delta revision"""
+        with self._lock:
+            return self._telemetry_delta.delta_since(since)
+
+    def get_telemetry_history(self, channels=None, points=300, since=None, method='lttb'):
+        """Downsampled recent telemetry per channel (see core/telemetry_history.py)"""
+        return self.telemetry_history.series(channels, points, since, method)
+
+    def _snapshot_status(self):
+        with self._lock:
+            return self._revision, self._build_status()
+
+    def _snapshot_telemetry(self):
+        with self._lock:
+            return self._revision, {
                 'truck': self.truck,
                 'job': self.job,
                 'damage': self.damage,
-                'alerts': list(self.alerts),
+                'coordinates': self.current_coordinates,
+                'signal_strength': self.current_signal_strength,
             }
 
+    def _build_status(self):
+        """Build the status dict; caller must hold the lock"""
+        return {
+            'country': self.current_country,
+            'city': self.current_city,
+            'coordinates': self.current_coordinates,
+            'signal_strength': self.current_signal_strength,
+            'stations': self.station_manager.get_stations_for_country(self.current_country) if self.current_country else [],
+            'all_countries': self.station_manager.get_countries(),
+            'plugin_connected': self.coord_reader.is_connected(),
+            'tracking_mode': 'plugin' if self.coord_reader.is_connected() else 'manual',
+            'total_stations': self.station_manager.get_total_station_count(),
+            'total_countries': self.station_manager.get_country_count(),
+            'cities_available': self.city_db.get_city_count(),
+            'suggested_station': self.current_station,
+            'playing_station': self.current_playing_station,
+            'truck': self.truck,
+            'job': self.job,
+            'damage': self.damage,
+            'alert_seq': self.alert_log.last_seq,
+            'trip': {
+                'session': self.trip_session.snapshot(),
+                'job': self.trip_job.snapshot() if self.trip_job else None,
+            },
+        }
+
     def get_stations_for_country(self, country):
         """Get stations for a specific country"""
         stations = self.station_manager.get_stations_for_country(country)
@@ -401,6 +505,8 @@ class RadioController:
     def reload_stations(self):
         """Reload stations from remote URL"""
         success, message = self.station_manager.reload_stations()
+        with self._lock:
+            self._revision += 1
         return {
             'status': 'success' if success else 'error',
             'message': message
@@ -414,11 +520,10 @@ class RadioController:
     def cleanup(self):
         """Clean up resources"""
         if self.travel_log:
-            # Build session stats
-            stats = {}
-            if self.travel_log:
-                stats = self.travel_log.get_stats()
-            self.travel_log.end_session(stats)
+            with self._lock:
+                metrics = self.trip_session.snapshot()
+            self.travel_log.end_session(metrics)
+            self.travel_log.close()
         if self.coord_reader:
             self.coord_reader.disconnect()
         print("Controller cleaned up")
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Drift-free fixed-rate scheduling for the monitor loop
+
+Deadlines sit on a fixed grid (start + n * period) instead of being
+"now + interval" after each tick, so processing time never stretches the
+period. When a tick starts after its deadline has already passed
+(overrun), the policy decides what happens to the ticks that were missed:
+
+  skip     run once now and continue on the grid; missed ticks are dropped
+  catchup  run the missed ticks back to back, up to max_catchup periods
+           behind, beyond which it falls back to skip
+"""
+
+import time
+from config import Config
+from core.trip_stats import RunningStats
+
+OVERRUN_POLICIES = ('skip', 'catchup')
+
+
+class FixedRateScheduler:
+    """Paces a loop at `hz` ticks per second against absolute deadlines"""
+
+    def __init__(self, hz, policy='skip', max_catchup=None, clock=time.perf_counter):
+        if hz <= 0:
+            raise ValueError(f"Rate must be positive, got {hz}")
+        if policy not in OVERRUN_POLICIES:
+            raise ValueError(f"Unknown overrun policy '{policy}' (expected one of {', '.join(OVERRUN_POLICIES)})")
+        self.hz = hz
+        self.period = 1.0 / hz
+        self.policy = policy
+        self.max_catchup = max_catchup if max_catchup is not None else Config.MONITOR_MAX_CATCHUP
+        self._clock = clock
+        self._next = None
+        self.ticks = 0
+        self.overruns = 0
+        self.skipped = 0
+        self.lateness = RunningStats()  # seconds past each tick's deadline
+
+    def wait(self, stop_event=None):
+        """Block until the next tick is due
+
+        Returns how late the tick starts relative to its deadline, in
+        seconds, or None if `stop_event` was set while waiting.
+        """
+        now = self._clock()
+        if self._next is None:
+            self._next = now
+        delay = self._next - now
+        if delay > 0:
+            if stop_event is not None:
+                if stop_event.wait(delay):
+                    return None
+            else:
+                time.sleep(delay)
+            now = self._clock()
+        elif self.ticks:
+            self.overruns += 1
+        if stop_event is not None and stop_event.is_set():
+            return None
+
+        lateness = now - self._next
+        self.ticks += 1
+        self.lateness.add(lateness)
+        if self.policy == 'catchup' and lateness < self.max_catchup * self.period:
+            self._next += self.period
+        else:
+            # Drop whole periods already passed and stay on the grid
+            missed = int(lateness // self.period)
+            self.skipped += missed
+            self._next += (missed + 1) * self.period
+        return lateness
+
+    def set_rate(self, hz):
+        """Change the rate; the next deadline becomes one new period after the last one"""
+        if hz <= 0:
+            raise ValueError(f"Rate must be positive, got {hz}")
+        if hz == self.hz:
+            return
+        period = 1.0 / hz
+        if self._next is not None:
+            self._next += period - self.period
+        self.hz = hz
+        self.period = period
+
+    def reset(self):
+        """Start a fresh grid from the next wait() (e.g. after a long pause)"""
+        self._next = None
+
+    def stats(self):
+        lateness = self.lateness
+        return {
+            'hz': self.hz,
+            'policy': self.policy,
+            'ticks': self.ticks,
+            'overruns': self.overruns,
+            'skipped': self.skipped,
+            'lateness_mean_ms': round(lateness.mean * 1000, 3),
+            'lateness_stddev_ms': round(lateness.stddev * 1000, 3),
+            'lateness_max_ms': round(lateness.max * 1000, 3) if lateness.count else 0.0,
+        }
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Field-level change tracking for published telemetry state
+"""
+
+import os
+from config import Config
+
+_MISSING = object()
+
+
+class TelemetryDeltaTracker:
+    """Tracks which telemetry fields changed, with a monotonically increasing revision
+
+    Floats are compared against the last *published* value using a per-field
+    epsilon, so sensor noise is suppressed but slow drift is still reported
+    once it accumulates past the epsilon.
+
+    Clients get the revision as a '<epoch>.<revision>' token. The epoch is
+    random per tracker, so a token kept across a server restart no longer
+    matches and gets a full snapshot instead of a delta against another
+    process's history.
+    """
+
+    def __init__(self, epsilons=None):
+        self.epsilons = dict(Config.TELEMETRY_DELTA_EPSILON if epsilons is None else epsilons)
+        self.epoch = os.urandom(4).hex()
+        self.revision = 0
+        self._values = {}      # (section, field) -> last published value
+        self._changed_at = {}  # (section, field) -> revision it last changed
+
+    def update(self, sections):
+        """Record a new frame ({section: {field: value}}); return the changed keys"""
+        changed = []
+        values = self._values
+        epsilons = self.epsilons
+        for section, fields in sections.items():
+            for name, value in fields.items():
+                key = (section, name)
+                prev = values.get(key, _MISSING)
+                if prev is _MISSING:
+                    changed.append(key)
+                elif isinstance(value, float) and isinstance(prev, float):
+                    if abs(value - prev) > epsilons.get(name, 0.0):
+                        changed.append(key)
+                elif value != prev:
+                    changed.append(key)
+
+        if changed:
+            self.revision += 1
+            for key in changed:
+                section, name = key
+                values[key] = sections[section][name]
+                self._changed_at[key] = self.revision
+        return changed
+
+    @property
+    def token(self):
+        """Current revision as sent to clients"""
+        return f'{self.epoch}.{self.revision}'
+
+    def _parse_token(self, token):
+        """Revision in a token from this tracker, or None if it is from elsewhere"""
+        epoch, _, revision = str(token or '').partition('.')
+        if epoch != self.epoch:
+            return None
+        try:
+            revision = int(revision)
+        except ValueError:
+            return None
+        return revision if 0 < revision <= self.revision else None
+
+    def delta_since(self, since):
+        """Fields changed after the `since` token; a full snapshot if it is empty or unknown"""
+        since = self._parse_token(since)
+        full = since is None
+        delta = {'revision': self.token, 'full': full, 'changes': {}}
+        changes = delta['changes']
+        for key, changed_at in self._changed_at.items():
+            if full or changed_at > since:
+                section, name = key
+                changes.setdefault(section, {})[name] = self._values[key]
+        return delta
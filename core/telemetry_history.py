@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Fixed-size in-memory history of selected telemetry channels
+
+Samples are stored in preallocated array('d') ring buffers, one per
+channel plus one for timestamps, so recording a sample only overwrites
+doubles in place. Memory per channel is 8 bytes per sample, i.e.
+8 * 60 / interval bytes per minute: 480 B/min at the default 1 s interval.
+"""
+
+import bisect
+import threading
+from array import array
+from config import Config
+
+
+class TelemetryHistory:
+    """Last `minutes` of the given telemetry fields, sampled every `interval` seconds"""
+
+    def __init__(self, channels=None, minutes=None, interval=None):
+        self.channels = tuple(channels or Config.TELEMETRY_HISTORY_CHANNELS)
+        self.interval = interval or Config.TELEMETRY_HISTORY_INTERVAL
+        minutes = minutes or Config.TELEMETRY_HISTORY_MINUTES
+        self.capacity = max(2, int(minutes * 60 / self.interval))
+
+        zeros = array('d', [0.0]) * self.capacity
+        self._times = array('d', zeros)
+        self._series = {name: array('d', zeros) for name in self.channels}
+        self._buffers = list(self._series.items())
+        self._head = 0     # next slot to write
+        self._count = 0
+        self._next_sample = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def memory_bytes(self):
+        """Bytes held by the ring buffers (fixed at construction)"""
+        return (len(self._buffers) + 1) * self.capacity * self._times.itemsize
+
+    def record(self, telemetry, now):
+        """Store one sample if `interval` has passed since the last one"""
+        if now < self._next_sample:
+            return
+        # 10% slack so a monitor loop ticking at exactly `interval` does not
+        # skip every other sample on jitter
+        self._next_sample = now + self.interval * 0.9
+        with self._lock:
+            head = self._head
+            self._times[head] = now
+            for key, buf in self._buffers:
+                buf[head] = telemetry[key]
+            self._head = head + 1 if head + 1 < self.capacity else 0
+            if self._count < self.capacity:
+                self._count += 1
+
+    def _window(self, names, since):
+        """Copy samples newer than `since`, oldest first, as lists"""
+        with self._lock:
+            count, head = self._count, self._head
+            start = head - count
+            if start >= 0:
+                times = self._times[start:head].tolist()
+                values = {n: self._series[n][start:head].tolist() for n in names}
+            else:
+                times = self._times[start:].tolist() + self._times[:head].tolist()
+                values = {n: self._series[n][start:].tolist() + self._series[n][:head].tolist()
+                          for n in names}
+        if since is not None:
+            first = bisect.bisect_left(times, since)
+            times = times[first:]
+            values = {n: v[first:] for n, v in values.items()}
+        return times, values
+
+    def series(self, names=None, points=300, since=None, method='lttb'):
+        """Downsampled series per channel: {'interval', 'method', 'series': {name: {'t', 'v'}}}"""
+        names = list(names) if names else list(self.channels)
+        unknown = [n for n in names if n not in self._series]
+        if unknown:
+            raise KeyError(', '.join(unknown))
+        downsample = DOWNSAMPLERS[method]
+        times, values = self._window(names, since)
+        result = {}
+        for name in names:
+            t, v = downsample(times, values[name], points)
+            result[name] = {'t': t, 'v': v}
+        return {'interval': self.interval, 'method': method, 'series': result}
+
+
+def lttb(times, values, points):
+    """Largest-Triangle-Three-Buckets: keep the points that best preserve the shape"""
+    n = len(times)
+    if points >= n or points < 3:
+        return times, values
+    out_t = [times[0]]
+    out_v = [values[0]]
+    every = (n - 2) / (points - 2)
+    a = 0
+    for i in range(points - 2):
+        # Average of the next bucket is the third triangle vertex
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        span = next_end - next_start
+        avg_t = sum(times[next_start:next_end]) / span
+        avg_v = sum(values[next_start:next_end]) / span
+
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        at, av = times[a], values[a]
+        best = -1.0
+        best_index = start
+        for j in range(start, end):
+            area = abs((at - avg_t) * (values[j] - av) - (at - times[j]) * (avg_v - av))
+            if area > best:
+                best = area
+                best_index = j
+        out_t.append(times[best_index])
+        out_v.append(values[best_index])
+        a = best_index
+    out_t.append(times[-1])
+    out_v.append(values[-1])
+    return out_t, out_v
+
+
+def minmax(times, values, points):
+    """Keep the minimum and maximum of each of points/2 buckets, in time order"""
+    n = len(times)
+    buckets = points // 2
+    if points >= n or buckets < 1:
+        return times, values
+    out_t = []
+    out_v = []
+    every = n / buckets
+    for i in range(buckets):
+        start = int(i * every)
+        end = int((i + 1) * every)
+        chunk = values[start:end]
+        low = start + chunk.index(min(chunk))
+        high = start + chunk.index(max(chunk))
+        for j in sorted({low, high}):
+            out_t.append(times[j])
+            out_v.append(values[j])
+    return out_t, out_v
+
+
+DOWNSAMPLERS = {'lttb': lttb, 'minmax': minmax}
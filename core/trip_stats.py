@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Constant-memory trip metrics computed from the telemetry stream
+
+Every aggregator here is O(1) per sample and O(1) in memory, so per-session
+and per-job figures (distance, fuel economy, time speeding or idling,
+speed and RPM statistics) come without storing or rescanning raw samples.
+"""
+
+import math
+from config import Config
+
+
+class RunningStats:
+    """Welford running mean/variance with min and max"""
+
+    __slots__ = ('count', 'mean', '_m2', 'min', 'max')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def stddev(self):
+        return math.sqrt(self._m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+
+class TimeWeighted:
+    """Time-weighted mean of a signal and total time a condition held"""
+
+    __slots__ = ('seconds', 'active_seconds', '_weighted')
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.active_seconds = 0.0
+        self._weighted = 0.0
+
+    def add(self, value, dt, active=False):
+        self.seconds += dt
+        self._weighted += value * dt
+        if active:
+            self.active_seconds += dt
+
+    @property
+    def mean(self):
+        return self._weighted / self.seconds if self.seconds else 0.0
+
+
+class TripStats:
+    """Running metrics for one trip (a session or a job)
+
+    Fed one telemetry frame at a time. Gaps longer than
+    Config.TRIP_MAX_GAP (pauses, reconnects) add no time, odometer
+    jumps backwards or beyond what the truck could have driven (truck
+    change, teleport) add no distance, and refuelling adds no fuel used.
+    """
+
+    def __init__(self):
+        self.started_at = None
+        self.driven_km = 0.0
+        self.fuel_used = 0.0
+        self.speed = RunningStats()       # km/h samples while moving
+        self.rpm = RunningStats()         # engine RPM samples while running
+        self.driving = TimeWeighted()     # speed over time; active = speeding
+        self.idle_seconds = 0.0
+        self._last_ts = None
+        self._last_odometer = None
+        self._last_fuel = None
+
+    def update(self, telemetry, now):
+        if self.started_at is None:
+            self.started_at = now
+        last_ts, self._last_ts = self._last_ts, now
+        odometer, fuel = telemetry['truckOdometer'], telemetry['fuel']
+        last_odometer, self._last_odometer = self._last_odometer, odometer
+        last_fuel, self._last_fuel = self._last_fuel, fuel
+        if last_ts is None:
+            return
+        dt = now - last_ts
+        if dt <= 0 or dt > Config.TRIP_MAX_GAP:
+            return
+
+        # Odometer is in km; allow up to 200 km/h between frames
+        driven = odometer - last_odometer
+        if 0 < driven <= dt * 200 / 3600:
+            self.driven_km += driven
+        if fuel < last_fuel:
+            self.fuel_used += last_fuel - fuel
+
+        speed = abs(telemetry['speed'])
+        engine = telemetry['engineEnabled']
+        if speed >= Config.TRIP_MOVING_SPEED:
+            limit = telemetry['speedLimit']
+            self.speed.add(speed)
+            self.driving.add(speed, dt, limit > 0 and speed > limit + Config.TRIP_SPEEDING_MARGIN)
+        elif engine:
+            self.idle_seconds += dt
+        if engine:
+            self.rpm.add(telemetry['engineRpm'])
+
+    def snapshot(self):
+        """Current metrics as a plain dict (the columns persisted by TravelLog)"""
+        driven_km = self.driven_km
+        return {
+            'driven_km': round(driven_km, 2),
+            'driving_seconds': round(self.driving.seconds),
+            'idle_seconds': round(self.idle_seconds),
+            'speeding_seconds': round(self.driving.active_seconds),
+            'avg_speed': round(self.driving.mean, 1),
+            'max_speed': round(self.speed.max, 1) if self.speed.count else 0.0,
+            'speed_stddev': round(self.speed.stddev, 1),
+            'max_rpm': round(self.rpm.max) if self.rpm.count else 0,
+            'fuel_used': round(self.fuel_used, 2),
+            'fuel_economy': round(self.fuel_used / driven_km * 100, 1) if driven_km >= 1 else None,
+        }
@@ -3,9 +3,12 @@
 JSON-based settings persistence for ETS2 Truck Companion
 """
 
+import copy
 import json
 import os
 import threading
+from config import Config
+from core.alert_rules import AlertRuleError, compile_rule
 
 
 DEFAULTS = {
@@ -14,17 +17,42 @@ DEFAULTS = {
     'auto_switch_enabled': True,
     'gamepad_enabled': True,
     'dashboard_visible': True,
-    'alert_cooldown_seconds': 60,
+    'alert_cooldown_seconds': Config.ALERT_COOLDOWN_SECONDS,
+    'alert_rules': Config.DEFAULT_ALERT_RULES,
 }
 
 
+class SettingsError(ValueError):
+    """Raised for a settings update that would not work"""
+
+
+def validate_settings(data):
+    """Check the alert settings in an update; raise SettingsError if invalid"""
+    if not isinstance(data, dict):
+        raise SettingsError("settings must be an object")
+    cooldown = data.get('alert_cooldown_seconds', Config.ALERT_COOLDOWN_SECONDS)
+    if isinstance(cooldown, bool) or not isinstance(cooldown, (int, float)) or cooldown < 0:
+        raise SettingsError(f"alert_cooldown_seconds must be a non-negative number, got {cooldown!r}")
+    if 'alert_rules' in data:
+        rules = data['alert_rules']
+        if not isinstance(rules, list):
+            raise SettingsError("alert_rules must be a list")
+        for i, rule in enumerate(rules):
+            try:
+                compile_rule(rule, cooldown)
+            except AlertRuleError as e:
+                raise SettingsError(f"alert_rules[{i}]: {e}") from None
+
+
 class SettingsManager:
     """Simple JSON file settings manager"""
 
     def __init__(self, settings_path):
         self.path = str(settings_path)
         self._lock = threading.Lock()
-        self._settings = dict(DEFAULTS)
+        self._settings = copy.deepcopy(DEFAULTS)
+        # Bumped on every update so consumers can cheaply detect changes
+        self.version = 0
         self._load()
 
     def _load(self):
@@ -45,17 +73,21 @@ class SettingsManager:
 
     def get_all(self):
         with self._lock:
-            return dict(self._settings)
+            return copy.deepcopy(self._settings)
 
     def get(self, key, default=None):
         with self._lock:
             return self._settings.get(key, default)
 
     def update(self, data):
-        """Merge new settings values"""
+        """Merge new settings values; raises SettingsError without applying any if invalid"""
+        validate_settings(data)
         with self._lock:
             # Only accept known keys
             for key in DEFAULTS:
                 if key in data:
                     self._settings[key] = data[key]
+            if not isinstance(self._settings['alert_rules'], list):
+                self._settings['alert_rules'] = copy.deepcopy(DEFAULTS['alert_rules'])
+            self.version += 1
             self._save()
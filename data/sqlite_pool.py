@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Bounded pool of read-only SQLite connections
+"""
+
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+
+class PoolClosedError(RuntimeError):
+    """Raised when acquiring from a closed pool"""
+
+
+class ConnectionPool:
+    """Reusable read-only connections shared by request threads
+
+    Flask's threaded server may run each request on a fresh thread, so
+    per-thread connections were opened over and over and never closed. The
+    pool opens at most `size` connections (lazily), hands them out LIFO so
+    hot connections keep their page cache, and closes them on shutdown.
+    """
+
+    def __init__(self, db_path, size=4, timeout=5.0):
+        self._uri = Path(db_path).resolve().as_uri() + '?mode=ro'
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self.created = 0
+        self.acquired = 0
+        self.reused = 0
+        self.waits = 0
+        self.timeouts = 0
+
+    def _open(self):
+        conn = sqlite3.connect(self._uri, uri=True, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA query_only=1')
+        return conn
+
+    def open_unpooled(self):
+        """Open a read-only connection outside the pool (for long-running reads)"""
+        return self._open()
+
+    def acquire(self):
+        if self._closed:
+            raise PoolClosedError("connection pool is closed")
+        try:
+            conn = self._idle.get_nowait()
+            with self._lock:
+                self.acquired += 1
+                self.reused += 1
+            return conn
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_open = self.created < self.size
+            if can_open:
+                self.created += 1
+            else:
+                self.waits += 1
+
+        if can_open:
+            try:
+                conn = self._open()
+            except sqlite3.Error:
+                with self._lock:
+                    self.created -= 1
+                raise
+            with self._lock:
+                self.acquired += 1
+            return conn
+        try:
+            conn = self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            with self._lock:
+                self.timeouts += 1
+            raise TimeoutError("timed out waiting for a travel log connection") from None
+        with self._lock:
+            self.acquired += 1
+            self.reused += 1
+        return conn
+
+    def release(self, conn):
+        if self._closed:
+            conn.close()
+        else:
+            self._idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection for the duration of a with-block"""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        """Close idle connections; borrowed ones are closed when returned"""
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                'size': self.size,
+                'open': self.created,
+                'idle': self._idle.qsize(),
+                'acquired': self.acquired,
+                'reused': self.reused,
+                'waits': self.waits,
+                'timeouts': self.timeouts,
+            }
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Compact encoding for breadcrumb track blocks
+
+A block is a short run of (timestamp, x, z) points. Values are quantized
+(time to 0.1 s relative to the block start, position to the configured
+resolution), delta-encoded, written as zigzag varints and zlib-compressed.
+A typical one-minute block of driving compresses to well under 1 KB.
+"""
+
+import zlib
+
+FORMAT_VERSION = 1
+TIME_STEP = 0.1  # seconds per time unit
+
+
+def _zigzag(value):
+    return (value << 1) ^ (value >> 63)
+
+
+def _unzigzag(value):
+    return (value >> 1) ^ -(value & 1)
+
+
+def _write_varint(out, value):
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data, pos):
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def encode_block(points, resolution=0.1):
+    """Encode [(t, x, z), ...] into a compressed blob; t is relative to points[0]"""
+    out = bytearray([FORMAT_VERSION])
+    _write_varint(out, int(round(resolution * 1000)))  # resolution in mm
+    _write_varint(out, len(points))
+
+    t0 = points[0][0]
+    prev_t = prev_x = prev_z = 0
+    for t, x, z in points:
+        qt = int(round((t - t0) / TIME_STEP))
+        qx = int(round(x / resolution))
+        qz = int(round(z / resolution))
+        _write_varint(out, _zigzag(qt - prev_t))
+        _write_varint(out, _zigzag(qx - prev_x))
+        _write_varint(out, _zigzag(qz - prev_z))
+        prev_t, prev_x, prev_z = qt, qx, qz
+    return zlib.compress(bytes(out), 6)
+
+
+def decode_block(blob, start_ts):
+    """Decode a blob produced by encode_block back into [(t, x, z), ...]"""
+    data = zlib.decompress(blob)
+    if data[0] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported track block version {data[0]}")
+    resolution_mm, pos = _read_varint(data, 1)
+    resolution = resolution_mm / 1000
+    count, pos = _read_varint(data, pos)
+
+    points = []
+    qt = qx = qz = 0
+    for _ in range(count):
+        value, pos = _read_varint(data, pos)
+        qt += _unzigzag(value)
+        value, pos = _read_varint(data, pos)
+        qx += _unzigzag(value)
+        value, pos = _read_varint(data, pos)
+        qz += _unzigzag(value)
+        points.append((start_ts + qt * TIME_STEP, qx * resolution, qz * resolution))
+    return points
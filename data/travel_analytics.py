@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Incrementally maintained analytics breakdowns for the travel log
+
+Breakdowns per country, cargo, company and week are kept as in-memory
+running sums. The first snapshot aggregates the whole history (including
+visit_rollups); after that each snapshot only aggregates rows past the
+previous watermark: jobs by (completed_at, id), since a job started early
+can complete late, and fines and visits by id.
+
+Job distance is the measured driven_km, or the planned distance_km for
+jobs recorded before trip metrics existed.
+"""
+
+import threading
+
+# SQLite weeks start on Monday: step forward to Sunday, then back six days
+_WEEK = "date({}, 'unixepoch', 'weekday 0', '-6 days')"
+
+# Output fields per breakdown; every running row is [jobs, income, distance, damage, fines, fine_amount, visits]
+_FIELDS = ('jobs', 'income', 'distance', 'damage', 'fines', 'fine_amount', 'visits')
+_BREAKDOWNS = {
+    'countries': ('country', ('visits', 'fines', 'fine_amount')),
+    'cargo': ('cargo', ('jobs', 'income', 'distance', 'damage')),
+    'companies': ('company', ('jobs', 'income', 'distance', 'damage')),
+    'weeks': ('week', _FIELDS),
+}
+
+
+class TravelAnalytics:
+    """Running per-country/cargo/company/week totals over one TravelLog"""
+
+    def __init__(self, read_pool):
+        self._read_pool = read_pool
+        self._lock = threading.Lock()
+        self._totals = {name: {} for name in _BREAKDOWNS}
+        self._job_mark = (float('-inf'), 0)
+        self._fine_mark = 0
+        self._visit_mark = None  # None until the first full aggregation
+        self.refreshes = 0
+
+    def _row(self, breakdown, key):
+        rows = self._totals[breakdown]
+        row = rows.get(key)
+        if row is None:
+            row = rows[key] = [0] * len(_FIELDS)
+        return row
+
+    def _add(self, breakdown, key, **values):
+        row = self._row(breakdown, key or 'Unknown')
+        for field, value in values.items():
+            row[_FIELDS.index(field)] += value or 0
+
+    def _refresh_jobs(self, conn):
+        mark = conn.execute(
+            'SELECT completed_at, id FROM jobs WHERE completed_at IS NOT NULL '
+            'ORDER BY completed_at DESC, id DESC LIMIT 1'
+        ).fetchone()
+        if mark is None or tuple(mark) <= self._job_mark:
+            return
+        rows = conn.execute(f'''
+            SELECT cargo, source_company, {_WEEK.format('completed_at')},
+                   COUNT(*), SUM(income), SUM(COALESCE(driven_km, distance_km)), SUM(cargo_damage)
+            FROM jobs
+            WHERE completed_at IS NOT NULL AND completed_at >= ?
+              AND (completed_at, id) > (?, ?) AND (completed_at, id) <= (?, ?)
+            GROUP BY 1, 2, 3
+        ''', (self._job_mark[0], *self._job_mark, *mark))
+        for cargo, company, week, jobs, income, distance, damage in rows:
+            values = dict(jobs=jobs, income=income, distance=distance, damage=damage)
+            self._add('cargo', cargo, **values)
+            self._add('companies', company, **values)
+            self._add('weeks', week, **values)
+        self._job_mark = tuple(mark)
+
+    def _refresh_fines(self, conn):
+        mark = conn.execute('SELECT MAX(id) FROM fines').fetchone()[0]
+        if mark is None or mark <= self._fine_mark:
+            return
+        rows = conn.execute(f'''
+            SELECT country, {_WEEK.format('timestamp')}, COUNT(*), SUM(amount)
+            FROM fines WHERE id > ? AND id <= ?
+            GROUP BY 1, 2
+        ''', (self._fine_mark, mark))
+        for country, week, fines, amount in rows:
+            self._add('countries', country, fines=fines, fine_amount=amount)
+            self._add('weeks', week, fines=fines, fine_amount=amount)
+        self._fine_mark = mark
+
+    def _refresh_visits(self, conn):
+        mark = conn.execute('SELECT MAX(id) FROM visits').fetchone()[0] or 0
+        if self._visit_mark is None:
+            # Visits past retention only survive as daily rollups. Later
+            # rollups only ever absorb visits already counted here.
+            rows = conn.execute('''
+                SELECT country, date(day, 'weekday 0', '-6 days'), SUM(visits)
+                FROM visit_rollups GROUP BY 1, 2
+            ''')
+            for country, week, visits in rows:
+                self._add('countries', country, visits=visits)
+                self._add('weeks', week, visits=visits)
+            self._visit_mark = 0
+        if mark <= self._visit_mark:
+            return
+        rows = conn.execute(f'''
+            SELECT country, {_WEEK.format('timestamp')}, COUNT(*)
+            FROM visits WHERE id > ? AND id <= ?
+            GROUP BY 1, 2
+        ''', (self._visit_mark, mark))
+        for country, week, visits in rows:
+            self._add('countries', country, visits=visits)
+            self._add('weeks', week, visits=visits)
+        self._visit_mark = mark
+
+    def refresh(self):
+        """Fold rows written since the last refresh into the running totals"""
+        with self._lock, self._read_pool.connection() as conn:
+            self._refresh_jobs(conn)
+            self._refresh_fines(conn)
+            self._refresh_visits(conn)
+            self.refreshes += 1
+            return self._render()
+
+    def _render(self):
+        result = {}
+        for name, (key_name, fields) in _BREAKDOWNS.items():
+            items = []
+            for key, row in self._totals[name].items():
+                item = {key_name: key}
+                for field in fields:
+                    item[field] = row[_FIELDS.index(field)]
+                if 'damage' in item:
+                    # Stored as a sum; report the mean cargo damage per job
+                    jobs = row[0]
+                    item['damage'] = round(item['damage'] / jobs, 4) if jobs else 0
+                items.append(item)
+            if name == 'weeks':
+                items.sort(key=lambda item: item['week'])
+            else:
+                sort_field = 'visits' if name == 'countries' else 'income'
+                items.sort(key=lambda item: item[sort_field], reverse=True)
+            result[name] = items
+        return result
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Streaming export of the travel log as NDJSON or CSV
+"""
+
+import csv
+import io
+from data.track_codec import decode_block
+from utils.json_helpers import dumps_str
+
+EXPORT_TABLES = ('visits', 'visit_rollups', 'jobs', 'fines', 'sessions', 'track')
+EXPORT_FORMATS = ('ndjson', 'csv')
+CHUNK_ROWS = 1000
+
+
+class ExportError(ValueError):
+    """Raised for an invalid export request"""
+
+
+def validate_export(tables, fmt):
+    """Check the requested tables/format; returns the table tuple"""
+    tables = tuple(tables) if tables else EXPORT_TABLES
+    unknown = [t for t in tables if t not in EXPORT_TABLES]
+    if unknown:
+        raise ExportError(f"Unknown table(s): {', '.join(unknown)}")
+    if fmt not in EXPORT_FORMATS:
+        raise ExportError(f"Unknown format: {fmt}")
+    if fmt == 'csv' and len(tables) != 1:
+        raise ExportError("CSV export needs exactly one table")
+    return tables
+
+
+TRACK_COLUMNS = ('session_id', 'timestamp', 'x', 'z')
+
+
+def _columns(conn, table):
+    if table == 'track':
+        return TRACK_COLUMNS
+    return tuple(d[0] for d in conn.execute(f'SELECT * FROM {table} LIMIT 0').description)
+
+
+def _iter_chunks(conn, table):
+    """Yield row chunks by stepping a cursor, CHUNK_ROWS at a time"""
+    if table == 'track':
+        cursor = conn.execute('SELECT session_id, start_ts, data FROM track_blocks ORDER BY start_ts')
+        while True:
+            blocks = cursor.fetchmany(64)
+            if not blocks:
+                return
+            yield [(block[0], t, x, z)
+                   for block in blocks
+                   for t, x, z in decode_block(block[2], block[1])]
+    else:
+        order = 'day, city, country' if table == 'visit_rollups' else 'id'
+        cursor = conn.execute(f'SELECT * FROM {table} ORDER BY {order}')
+        while True:
+            chunk = cursor.fetchmany(CHUNK_ROWS)
+            if not chunk:
+                return
+            yield chunk
+
+
+def iter_export(travel_log, tables=None, fmt='ndjson'):
+    """Yield the export as text chunks with memory bounded by CHUNK_ROWS
+
+    NDJSON lines carry a "table" key so several tables can share one stream;
+    CSV covers a single table with a header row.
+    """
+    tables = validate_export(tables, fmt)
+    conn = travel_log.open_reader()
+    try:
+        for table in tables:
+            columns = _columns(conn, table)
+            if fmt == 'csv':
+                yield _csv_chunk([columns])
+            for chunk in _iter_chunks(conn, table):
+                if fmt == 'csv':
+                    yield _csv_chunk(chunk)
+                else:
+                    yield ''.join(
+                        dumps_str({'table': table, **dict(zip(columns, row))}) + '\n'
+                        for row in chunk
+                    )
+    finally:
+        conn.close()
+
+
+def _csv_chunk(rows):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(tuple(row) for row in rows)
+    return buffer.getvalue()
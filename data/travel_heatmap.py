@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Heatmap grids of visits and breadcrumb points at several zoom levels
+
+Zoom 0 is the coarsest grid; each level halves the cell size down to
+Config.HEATMAP_CELL_SIZE at the finest. Visits are bucketed in SQL with
+integer division; breadcrumb blocks are compressed, so their points are
+bucketed in Python as they are decoded. Each (source, zoom) grid keeps its
+own id watermark and only aggregates rows added since its last refresh.
+"""
+
+import math
+import threading
+from config import Config
+from data.track_codec import decode_block
+
+HEATMAP_SOURCES = ('visits', 'track')
+
+
+class HeatmapError(ValueError):
+    """Raised for an unknown heatmap source or zoom level"""
+
+
+def cell_size(zoom):
+    """Cell edge length in meters for a zoom level"""
+    return Config.HEATMAP_CELL_SIZE * 2 ** (Config.HEATMAP_ZOOM_LEVELS - 1 - zoom)
+
+
+def validate_heatmap(source, zoom):
+    if source not in HEATMAP_SOURCES:
+        raise HeatmapError(f"Unknown heatmap source: {source}")
+    if zoom is None or not 0 <= zoom < Config.HEATMAP_ZOOM_LEVELS:
+        raise HeatmapError(f"Zoom must be between 0 and {Config.HEATMAP_ZOOM_LEVELS - 1}")
+
+
+class _Grid:
+    """Cell counts for one (source, zoom) pair"""
+
+    __slots__ = ('cell', 'counts', 'mark', 'lock')
+
+    def __init__(self, cell):
+        self.cell = cell
+        self.counts = {}
+        self.mark = None  # None until the first full aggregation
+        self.lock = threading.Lock()
+
+
+class TravelHeatmap:
+    """Incrementally maintained heatmap grids over one TravelLog"""
+
+    def __init__(self, read_pool):
+        self._read_pool = read_pool
+        self._grids = {}
+        self._grids_lock = threading.Lock()
+
+    def _grid(self, source, zoom):
+        with self._grids_lock:
+            grid = self._grids.get((source, zoom))
+            if grid is None:
+                grid = self._grids[(source, zoom)] = _Grid(cell_size(zoom))
+            return grid
+
+    def _refresh_visits(self, conn, grid):
+        # CAST truncates toward zero; shifting by a whole number of cells
+        # keeps coordinates positive so truncation is a floor
+        shift = math.ceil(Config.HEATMAP_EXTENT / grid.cell)
+        bucket = 'CAST(({0} + ?) / ? AS INTEGER) - ?'
+        columns = f"{bucket.format('x')}, {bucket.format('z')}"
+        params = (shift * grid.cell, grid.cell, shift) * 2
+        counts = grid.counts
+
+        if grid.mark is None:
+            # Visits past retention only survive as rollups at their mean position
+            rows = conn.execute(f'''
+                SELECT {columns}, SUM(visits) FROM visit_rollups
+                WHERE x IS NOT NULL GROUP BY 1, 2
+            ''', params)
+            for cx, cz, n in rows:
+                counts[cx, cz] = counts.get((cx, cz), 0) + n
+            grid.mark = 0
+
+        mark = conn.execute('SELECT MAX(id) FROM visits').fetchone()[0] or 0
+        if mark <= grid.mark:
+            return
+        rows = conn.execute(f'''
+            SELECT {columns}, COUNT(*) FROM visits
+            WHERE id > ? AND id <= ? AND x IS NOT NULL GROUP BY 1, 2
+        ''', (*params, grid.mark, mark))
+        for cx, cz, n in rows:
+            counts[cx, cz] = counts.get((cx, cz), 0) + n
+        grid.mark = mark
+
+    def _refresh_track(self, conn, grid):
+        if grid.mark is None:
+            grid.mark = 0
+        cursor = conn.execute(
+            'SELECT id, start_ts, data FROM track_blocks WHERE id > ? ORDER BY id', (grid.mark,))
+        counts = grid.counts
+        cell = grid.cell
+        floor = math.floor
+        while True:
+            blocks = cursor.fetchmany(256)
+            if not blocks:
+                return
+            for block_id, start_ts, data in blocks:
+                for _, x, z in decode_block(data, start_ts):
+                    key = (floor(x / cell), floor(z / cell))
+                    counts[key] = counts.get(key, 0) + 1
+                grid.mark = block_id
+
+    def refresh(self, source, zoom):
+        """Fold new rows into the grid and return it as compact arrays
+
+        `cells` is flat: [cx0, cz0, n0, cx1, cz1, n1, ...], where cell
+        (cx, cz) covers x in [cx * cell, (cx + 1) * cell), likewise for z.
+        """
+        validate_heatmap(source, zoom)
+        grid = self._grid(source, zoom)
+        with grid.lock:
+            with self._read_pool.connection() as conn:
+                if source == 'visits':
+                    self._refresh_visits(conn, grid)
+                else:
+                    self._refresh_track(conn, grid)
+            cells = []
+            for (cx, cz), n in grid.counts.items():
+                cells += (cx, cz, n)
+            return {
+                'source': source,
+                'zoom': zoom,
+                'cell': grid.cell,
+                'max': max(grid.counts.values(), default=0),
+                'cells': cells,
+            }
@@ -3,31 +3,98 @@
 SQLite travel log for ETS2 Truck Companion
 """
 
+import queue
 import sqlite3
 import time
 import threading
+from collections import OrderedDict
+from time import perf_counter_ns
+from config import Config
+from data.sqlite_pool import ConnectionPool
+from data.track_codec import encode_block, decode_block
+from data import travel_retention
+from data.travel_analytics import TravelAnalytics
+from data.travel_heatmap import TravelHeatmap
+from utils.geometry import simplify_polyline
+from utils.metrics import REGISTRY
+
+BATCH_SECONDS = REGISTRY.histogram(
+    'ets2_travel_log_batch_seconds', 'Travel log writer time to apply and commit one batch')
+WRITES = REGISTRY.counter('ets2_travel_log_writes', 'Travel log write operations processed')
+WRITE_ERRORS = REGISTRY.counter('ets2_travel_log_write_errors', 'Travel log writes or commits that failed')
+
+SCHEMA_VERSION = 5
+
+# get_stats() before anything is recorded (and /api/travel/stats without a log)
+EMPTY_STATS = {
+    'total_distance': 0, 'driven_distance': 0, 'cities_visited': 0,
+    'countries_visited': 0, 'jobs_completed': 0, 'total_income': 0, 'total_fines': 0,
+}
+
+# Trip metrics (core/trip_stats.py) persisted on sessions and jobs
+TRIP_COLUMNS = (
+    'driven_km', 'driving_seconds', 'idle_seconds', 'speeding_seconds',
+    'avg_speed', 'max_speed', 'max_rpm', 'fuel_used', 'fuel_economy',
+)
+
+# Control markers passed through the writer queue
+_FLUSH = object()
+_STOP = object()
 
 
 class TravelLog:
-    """Persistent travel log using SQLite"""
+    """Persistent travel log using SQLite
+
+    Writes are write-behind: the record_* methods only enqueue, and a
+    dedicated writer thread batches them into periodic transactions. This
+    keeps fsync stalls off the telemetry monitor thread (which calls these
+    methods while holding the RadioController lock). Reads may lag writes by
+    up to Config.TRAVEL_LOG_FLUSH_INTERVAL; call flush() to wait for them.
+    """
 
-    def __init__(self, db_path):
+    def __init__(self, db_path, queue_size=None, flush_interval=None):
         self.db_path = str(db_path)
-        self._local = threading.local()
+        self._flush_interval = flush_interval or Config.TRAVEL_LOG_FLUSH_INTERVAL
+        self._queue = queue.Queue(maxsize=queue_size or Config.TRAVEL_LOG_QUEUE_SIZE)
+
+        # Writer-thread state
         self._session_id = None
+        self._session_started = None
+        self._session_driven = 0.0  # driven_km already added to stats.driven_distance
         self._current_job_id = None
+        self.dropped = 0
+        self.batches = 0
+        self.written = 0
+        self.rolled_up = 0
+        # Bumped after every committed batch of writes; readers use it as a cache key
+        self.write_seq = 0
+        self._next_maintenance = time.monotonic() + Config.TRAVEL_LOG_MAINTENANCE_DELAY
+
+        # Breadcrumb track state (monitor thread)
+        self._track_points = []
+        self._track_last = None
+
+        self._writer_conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        # Only takes effect on new databases; `travel_log_cli.py compact` converts old ones
+        self._writer_conn.execute('PRAGMA auto_vacuum=INCREMENTAL')
+        self._writer_conn.execute('PRAGMA journal_mode=WAL')
+        self._writer_conn.execute('PRAGMA synchronous=NORMAL')
         self._init_db()
 
-    def _get_conn(self):
-        """Get thread-local database connection"""
-        if not hasattr(self._local, 'conn') or self._local.conn is None:
-            self._local.conn = sqlite3.connect(self.db_path)
-            self._local.conn.row_factory = sqlite3.Row
-        return self._local.conn
+        # Web handlers read through a bounded pool of query_only connections;
+        # the writer thread owns the only write connection
+        self._read_pool = ConnectionPool(self.db_path, Config.TRAVEL_LOG_READ_POOL_SIZE)
+        self._analytics = TravelAnalytics(self._read_pool)
+        self._heatmap = TravelHeatmap(self._read_pool)
+        self._routes = OrderedDict()  # (session, tolerance) -> (stamp, route), LRU
+        self._routes_lock = threading.Lock()
+
+        self._writer = threading.Thread(target=self._writer_loop, name='travel-log-writer', daemon=True)
+        self._writer.start()
 
     def _init_db(self):
         """Create tables if they don't exist"""
-        conn = self._get_conn()
+        conn = self._writer_conn
         conn.executescript('''
             CREATE TABLE IF NOT EXISTS visits (
                 id INTEGER PRIMARY KEY,
@@ -67,109 +134,596 @@ class TravelLog:
                 jobs_completed INTEGER,
                 fines_total INTEGER
             );
+
+            CREATE TABLE IF NOT EXISTS track_blocks (
+                id INTEGER PRIMARY KEY,
+                session_id INTEGER,
+                start_ts REAL,
+                end_ts REAL,
+                points INTEGER,
+                data BLOB
+            );
+            CREATE INDEX IF NOT EXISTS idx_track_blocks_start ON track_blocks(start_ts);
+
+            CREATE TABLE IF NOT EXISTS stats (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                cities_visited INTEGER NOT NULL DEFAULT 0,
+                countries_visited INTEGER NOT NULL DEFAULT 0,
+                jobs_completed INTEGER NOT NULL DEFAULT 0,
+                total_income INTEGER NOT NULL DEFAULT 0,
+                total_distance INTEGER NOT NULL DEFAULT 0,
+                total_fines INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS visited_cities (city TEXT PRIMARY KEY);
+            CREATE TABLE IF NOT EXISTS visited_countries (country TEXT PRIMARY KEY);
+
+            CREATE TABLE IF NOT EXISTS visit_rollups (
+                day TEXT,
+                city TEXT,
+                country TEXT,
+                visits INTEGER,
+                first_ts REAL,
+                last_ts REAL,
+                x REAL, z REAL,
+                PRIMARY KEY (day, city, country)
+            );
         ''')
         conn.commit()
+        self._migrate(conn)
+
+    def _migrate(self, conn):
+        """Bring databases created by older versions up to SCHEMA_VERSION"""
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return
+        has_history = conn.execute(
+            'SELECT EXISTS(SELECT 1 FROM visits) OR EXISTS(SELECT 1 FROM jobs)'
+        ).fetchone()[0]
+
+        if version < 2:
+            # Indexes backing the filtered, keyset-paginated history queries
+            if has_history:
+                print("Travel log: creating history indexes...")
+            conn.executescript('''
+                CREATE INDEX IF NOT EXISTS idx_visits_timestamp ON visits(timestamp);
+                CREATE INDEX IF NOT EXISTS idx_visits_country
+                    ON visits(country, id, city, timestamp, signal_strength);
+                CREATE INDEX IF NOT EXISTS idx_visits_city
+                    ON visits(city, id, country, timestamp, signal_strength);
+                CREATE INDEX IF NOT EXISTS idx_jobs_completed
+                    ON jobs(id, completed_at) WHERE completed_at IS NOT NULL;
+                CREATE INDEX IF NOT EXISTS idx_jobs_completed_at
+                    ON jobs(completed_at) WHERE completed_at IS NOT NULL;
+                CREATE INDEX IF NOT EXISTS idx_jobs_cargo
+                    ON jobs(cargo, id) WHERE completed_at IS NOT NULL;
+            ''')
+        if version < 4:
+            # Per-session route lookups
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_track_blocks_session '
+                         'ON track_blocks(session_id, start_ts)')
+        if version < 5:
+            # Measured trip metrics; driven_distance replaces the planned-distance estimate
+            for table in ('sessions', 'jobs'):
+                for column in TRIP_COLUMNS:
+                    conn.execute(f'ALTER TABLE {table} ADD COLUMN {column} REAL')
+            conn.execute('ALTER TABLE stats ADD COLUMN driven_distance REAL NOT NULL DEFAULT 0')
+        if version < 1:
+            # Materialized stats did not exist; build them from history
+            # (last, since it reads the columns added above)
+            if has_history:
+                print("Travel log: building aggregate statistics...")
+            self._rebuild_stats(conn)
+        conn.execute(f'PRAGMA user_version={SCHEMA_VERSION}')
+        conn.commit()
+
+    # ---- Write-behind queue ----
+
+    def _enqueue(self, op, *args):
+        """Queue a write; never blocks the caller"""
+        try:
+            self._queue.put_nowait((op, args))
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                print(f"Warning: travel log queue full, {self.dropped} writes dropped")
+
+    def _writer_loop(self):
+        """Drain the queue into batched transactions"""
+        running = True
+        while running:
+            if time.monotonic() >= self._next_maintenance:
+                self._maintain()
+            try:
+                batch = [self._queue.get(timeout=self._flush_interval)]
+            except queue.Empty:
+                continue
+            # Collect whatever else is already waiting, up to the batch size
+            while len(batch) < Config.TRAVEL_LOG_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            waiters = []
+            wrote = 0
+            conn = self._writer_conn
+            start = perf_counter_ns()
+            for op, args in batch:
+                if op is _FLUSH:
+                    waiters.append(args[0])
+                elif op is _STOP:
+                    running = False
+                else:
+                    wrote += 1
+                    # Any error (a bad payload as much as SQLite) must not
+                    # end the thread, or every later write would be dropped
+                    try:
+                        op(conn, *args)
+                        self.written += 1
+                    except Exception as e:
+                        WRITE_ERRORS.inc()
+                        print(f"Travel log write failed: {e}")
+            try:
+                conn.commit()
+                self.batches += 1
+                if wrote:
+                    self.write_seq += 1
+                    WRITES.inc(wrote)
+                    BATCH_SECONDS.observe_ns(perf_counter_ns() - start)
+            except Exception as e:
+                WRITE_ERRORS.inc()
+                print(f"Travel log commit failed: {e}")
+                try:
+                    conn.rollback()
+                except sqlite3.Error:
+                    pass
+            for event in waiters:
+                event.set()
+
+        self._writer_conn.close()
+
+    def _maintain(self):
+        """Run one bounded step of retention rollup and incremental vacuum
+
+        Called from the writer loop between batches, so it never competes
+        with the monitor thread; while old visits remain it reschedules
+        itself right away, one chunk at a time.
+        """
+        conn = self._writer_conn
+        more = False
+        try:
+            cutoff = travel_retention.retention_cutoff(Config.VISIT_RETENTION_DAYS)
+            if cutoff is not None:
+                chunk = Config.TRAVEL_LOG_ROLLUP_CHUNK
+                moved = travel_retention.rollup_visits(conn, cutoff, chunk)
+                conn.commit()
+                self.rolled_up += moved
+                more = moved >= chunk
+            travel_retention.incremental_vacuum(conn, Config.TRAVEL_LOG_VACUUM_PAGES)
+        except Exception as e:
+            print(f"Travel log maintenance failed: {e}")
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                pass
+        self._next_maintenance = time.monotonic() + (
+            0 if more else Config.TRAVEL_LOG_MAINTENANCE_INTERVAL)
+
+    def _compact(self, conn, retention_days):
+        conn.commit()
+        self.rolled_up += travel_retention.compact(conn, retention_days, Config.TRAVEL_LOG_ROLLUP_CHUNK)
+
+    def compact(self, retention_days=None):
+        """Roll up all visits past retention and VACUUM; blocks until done"""
+        days = Config.VISIT_RETENTION_DAYS if retention_days is None else retention_days
+        self._enqueue(self._compact, days)
+        self.flush()
+
+    def flush(self, timeout=None):
+        """Wait until every write queued so far has been committed"""
+        if not self._writer.is_alive():
+            return False
+        done = threading.Event()
+        self._queue.put((_FLUSH, (done,)))
+        return done.wait(timeout)
+
+    def close(self, timeout=5):
+        """Flush pending writes and stop the writer thread"""
+        self._flush_track()
+        if self._writer.is_alive():
+            self._queue.put((_STOP, ()))
+            self._writer.join(timeout)
+        self._read_pool.close()
+
+    def rebuild_stats(self):
+        """Recompute aggregate statistics from history and wait for it"""
+        self._enqueue(self._rebuild_stats)
+        self.flush()
+
+    def get_queue_depth(self):
+        return self._queue.qsize()
+
+    def open_reader(self):
+        """Dedicated read-only connection for long-running reads such as exports"""
+        return self._read_pool.open_unpooled()
+
+    def get_db_stats(self):
+        """Writer queue and read pool counters"""
+        return {
+            'writer': self.get_writer_stats(),
+            'read_pool': self._read_pool.get_stats(),
+        }
+
+    def get_writer_stats(self):
+        return {
+            'queue_depth': self._queue.qsize(),
+            'queue_capacity': self._queue.maxsize,
+            'dropped': self.dropped,
+            'batches': self.batches,
+            'written': self.written,
+            'write_seq': self.write_seq,
+            'rolled_up': self.rolled_up,
+        }
+
+    # ---- Recording (enqueue only) ----
 
     def record_visit(self, city, country, x, z, signal):
-        conn = self._get_conn()
+        self._enqueue(self._write_visit, time.time(), city, country, x, z, signal)
+
+    def record_job_start(self, cargo, src_city, src_comp, dst_city, dst_comp, distance, income):
+        self._enqueue(self._write_job_start, time.time(), cargo, src_city, src_comp,
+                      dst_city, dst_comp, distance, income)
+
+    def record_job_complete(self, cargo_damage, metrics=None):
+        self._enqueue(self._write_job_complete, time.time(), cargo_damage, dict(metrics or {}))
+
+    def record_fine(self, amount, city, country):
+        self._enqueue(self._write_fine, time.time(), amount, city, country)
+
+    def start_session(self):
+        self._enqueue(self._write_session_start, time.time())
+
+    def update_session(self, metrics):
+        """Checkpoint the running session's trip metrics"""
+        self._enqueue(self._write_session_metrics, dict(metrics))
+
+    def end_session(self, metrics=None):
+        """Close the session, storing its trip metrics and per-session counts"""
+        self._flush_track()
+        self._enqueue(self._write_session_end, time.time(), dict(metrics or {}))
+
+    def record_position(self, ts, x, z):
+        """Feed a telemetry position into the breadcrumb track
+
+        Called from the monitor thread only. Points closer than
+        Config.TRACK_MIN_DISTANCE to the last kept point are dropped unless
+        Config.TRACK_MAX_INTERVAL has passed; kept points are grouped into
+        per-minute blocks that the writer thread encodes and stores.
+        """
+        last = self._track_last
+        if last is not None:
+            elapsed = ts - last[0]
+            if elapsed < Config.TRACK_MIN_INTERVAL:
+                return
+            dx = x - last[1]
+            dz = z - last[2]
+            if (dx * dx + dz * dz < Config.TRACK_MIN_DISTANCE ** 2 and
+                    elapsed < Config.TRACK_MAX_INTERVAL):
+                return
+
+        point = (ts, x, z)
+        points = self._track_points
+        if points and ts // Config.TRACK_BLOCK_SECONDS != points[0][0] // Config.TRACK_BLOCK_SECONDS:
+            self._flush_track()
+        self._track_points.append(point)
+        self._track_last = point
+
+    def _flush_track(self):
+        """Hand the current track block to the writer"""
+        points, self._track_points = self._track_points, []
+        if points:
+            self._enqueue(self._write_track_block, points)
+
+    # ---- Writer-thread operations ----
+
+    def _write_visit(self, conn, ts, city, country, x, z, signal):
         conn.execute(
             'INSERT INTO visits (timestamp, city, country, x, z, signal_strength) VALUES (?,?,?,?,?,?)',
-            (time.time(), city, country, x, z, signal)
+            (ts, city, country, x, z, signal)
         )
-        conn.commit()
+        if city is not None and conn.execute(
+                'INSERT OR IGNORE INTO visited_cities (city) VALUES (?)', (city,)).rowcount:
+            conn.execute('UPDATE stats SET cities_visited = cities_visited + 1 WHERE id=1')
+        if country is not None and conn.execute(
+                'INSERT OR IGNORE INTO visited_countries (country) VALUES (?)', (country,)).rowcount:
+            conn.execute('UPDATE stats SET countries_visited = countries_visited + 1 WHERE id=1')
 
-    def record_job_start(self, cargo, src_city, src_comp, dst_city, dst_comp, distance, income):
-        conn = self._get_conn()
+    def _write_job_start(self, conn, ts, cargo, src_city, src_comp, dst_city, dst_comp, distance, income):
         cursor = conn.execute(
             'INSERT INTO jobs (started_at, cargo, source_city, source_company, dest_city, dest_company, distance_km, income) '
             'VALUES (?,?,?,?,?,?,?,?)',
-            (time.time(), cargo, src_city, src_comp, dst_city, dst_comp, distance, income)
+            (ts, cargo, src_city, src_comp, dst_city, dst_comp, distance, income)
         )
         self._current_job_id = cursor.lastrowid
-        conn.commit()
 
-    def record_job_complete(self, cargo_damage):
-        conn = self._get_conn()
+    def _write_job_complete(self, conn, ts, cargo_damage, metrics):
         if self._current_job_id:
-            conn.execute(
-                'UPDATE jobs SET completed_at=?, cargo_damage=? WHERE id=?',
-                (time.time(), cargo_damage, self._current_job_id)
-            )
-            conn.commit()
+            updated = conn.execute(
+                'UPDATE jobs SET completed_at=?, cargo_damage=? WHERE id=? AND completed_at IS NULL',
+                (ts, cargo_damage, self._current_job_id)
+            ).rowcount
+            self._write_trip_columns(conn, 'jobs', self._current_job_id, metrics)
+            if updated:
+                conn.execute(
+                    'UPDATE stats SET jobs_completed = jobs_completed + 1, '
+                    'total_income = total_income + (SELECT COALESCE(income,0) FROM jobs WHERE id=?), '
+                    'total_distance = total_distance + (SELECT COALESCE(distance_km,0) FROM jobs WHERE id=?) '
+                    'WHERE id=1',
+                    (self._current_job_id, self._current_job_id)
+                )
             self._current_job_id = None
 
-    def record_fine(self, amount, city, country):
-        conn = self._get_conn()
+    def _write_fine(self, conn, ts, amount, city, country):
         conn.execute(
             'INSERT INTO fines (timestamp, amount, city, country) VALUES (?,?,?,?)',
-            (time.time(), amount, city, country)
+            (ts, amount, city, country)
         )
-        conn.commit()
+        conn.execute('UPDATE stats SET total_fines = total_fines + ? WHERE id=1', (amount or 0,))
 
-    def start_session(self):
-        conn = self._get_conn()
+    def _write_session_start(self, conn, ts):
         cursor = conn.execute(
             'INSERT INTO sessions (started_at) VALUES (?)',
-            (time.time(),)
+            (ts,)
         )
         self._session_id = cursor.lastrowid
-        conn.commit()
+        self._session_started = ts
+        self._session_driven = 0.0
 
-    def end_session(self, stats):
+    def _write_trip_columns(self, conn, table, row_id, metrics):
+        columns = [c for c in TRIP_COLUMNS if c in metrics]
+        if columns:
+            conn.execute(
+                f"UPDATE {table} SET {', '.join(f'{c}=?' for c in columns)} WHERE id=?",
+                (*(metrics[c] for c in columns), row_id)
+            )
+
+    def _write_session_metrics(self, conn, metrics):
+        if not self._session_id:
+            return
+        self._write_trip_columns(conn, 'sessions', self._session_id, metrics)
+        driven = metrics.get('driven_km')
+        if driven is not None:
+            conn.execute('UPDATE sessions SET distance_km=? WHERE id=?', (driven, self._session_id))
+            conn.execute('UPDATE stats SET driven_distance = driven_distance + ? WHERE id=1',
+                         (driven - self._session_driven,))
+            self._session_driven = driven
+
+    def _write_session_end(self, conn, ts, metrics):
         if not self._session_id:
             return
-        conn = self._get_conn()
+        self._write_session_metrics(conn, metrics)
+        # Counts for this session only, from the indexed history
+        since = self._session_started
+        conn.execute('''
+            UPDATE sessions SET ended_at=?,
+                cities_visited=(SELECT COUNT(DISTINCT city) FROM visits WHERE timestamp >= ?),
+                countries_visited=(SELECT COUNT(DISTINCT country) FROM visits WHERE timestamp >= ?),
+                jobs_completed=(SELECT COUNT(*) FROM jobs WHERE completed_at >= ?),
+                fines_total=(SELECT COALESCE(SUM(amount), 0) FROM fines WHERE timestamp >= ?)
+            WHERE id=?
+        ''', (ts, since, since, since, since, self._session_id))
+
+    def _rebuild_stats(self, conn):
+        """Recompute the materialized stats from the full history
+
+        Visits already rolled up into visit_rollups still count; there a
+        missing city or country is stored as '' and is skipped.
+        """
+        conn.execute('DELETE FROM visited_cities')
+        conn.execute('DELETE FROM visited_countries')
+        conn.execute('''
+            INSERT INTO visited_cities
+            SELECT city FROM visits WHERE city IS NOT NULL
+            UNION SELECT city FROM visit_rollups WHERE city != ''
+        ''')
+        conn.execute('''
+            INSERT INTO visited_countries
+            SELECT country FROM visits WHERE country IS NOT NULL
+            UNION SELECT country FROM visit_rollups WHERE country != ''
+        ''')
+        conn.execute('''
+            INSERT OR REPLACE INTO stats (id, cities_visited, countries_visited, jobs_completed,
+                                          total_income, total_distance, total_fines, driven_distance)
+            SELECT 1,
+                   (SELECT COUNT(*) FROM visited_cities),
+                   (SELECT COUNT(*) FROM visited_countries),
+                   COUNT(*), COALESCE(SUM(income),0), COALESCE(SUM(distance_km),0),
+                   (SELECT COALESCE(SUM(amount),0) FROM fines),
+                   (SELECT COALESCE(SUM(driven_km),0) FROM sessions)
+            FROM jobs WHERE completed_at IS NOT NULL
+        ''')
+
+    def _write_track_block(self, conn, points):
         conn.execute(
-            'UPDATE sessions SET ended_at=?, distance_km=?, cities_visited=?, '
-            'countries_visited=?, jobs_completed=?, fines_total=? WHERE id=?',
-            (
-                time.time(),
-                stats.get('total_distance', 0),
-                stats.get('cities_visited', 0),
-                stats.get('countries_visited', 0),
-                stats.get('jobs_completed', 0),
-                stats.get('total_fines', 0),
-                self._session_id,
-            )
+            'INSERT INTO track_blocks (session_id, start_ts, end_ts, points, data) VALUES (?,?,?,?,?)',
+            (self._session_id, points[0][0], points[-1][0], len(points),
+             encode_block(points, Config.TRACK_RESOLUTION))
         )
-        conn.commit()
+
+    # ---- Queries ----
 
     def get_stats(self):
-        conn = self._get_conn()
-        cities = conn.execute('SELECT COUNT(DISTINCT city) FROM visits').fetchone()[0]
-        countries = conn.execute('SELECT COUNT(DISTINCT country) FROM visits').fetchone()[0]
-        jobs = conn.execute('SELECT COUNT(*) FROM jobs WHERE completed_at IS NOT NULL').fetchone()[0]
-        income = conn.execute('SELECT COALESCE(SUM(income),0) FROM jobs WHERE completed_at IS NOT NULL').fetchone()[0]
-        fines = conn.execute('SELECT COALESCE(SUM(amount),0) FROM fines').fetchone()[0]
-
-        # Total distance is approximated from job distances
-        distance = conn.execute(
-            'SELECT COALESCE(SUM(distance_km),0) FROM jobs WHERE completed_at IS NOT NULL'
-        ).fetchone()[0]
+        """Aggregate statistics, read from the materialized stats row in O(1)"""
+        with self._read_pool.connection() as conn:
+            row = conn.execute(
+                'SELECT total_distance, driven_distance, cities_visited, countries_visited, '
+                'jobs_completed, total_income, total_fines FROM stats WHERE id=1'
+            ).fetchone()
+            if row is None:
+                return dict(EMPTY_STATS)
+            # total_distance sums planned job distances; driven_distance is
+            # measured from the odometer (recorded since schema version 5)
+            return dict(row)
 
-        return {
-            'total_distance': distance,
-            'cities_visited': cities,
-            'countries_visited': countries,
-            'jobs_completed': jobs,
-            'total_income': income,
-            'total_fines': fines,
+    def get_analytics(self):
+        """Breakdowns per country, cargo, company and week as (write_seq, data)
+
+        Only rows written since the previous call are aggregated; pair with
+        a PayloadCache keyed on write_seq to skip even that when idle.
+        """
+        write_seq = self.write_seq
+        return write_seq, self._analytics.refresh()
+
+    def get_heatmap(self, source, zoom):
+        """Visit or breadcrumb counts per grid cell as (write_seq, data)"""
+        write_seq = self.write_seq
+        return write_seq, self._heatmap.refresh(source, zoom)
+
+    def get_route(self, session_id=None, tolerance=Config.ROUTE_TOLERANCE):
+        """Simplified breadcrumb route of one session (default: the latest)
+
+        Finished sessions never change, so their routes stay cached until
+        evicted; the open session is recomputed after new points arrive.
+        Returns None for an unknown session.
+        """
+        with self._read_pool.connection() as conn:
+            if session_id is None:
+                session = conn.execute(
+                    'SELECT id, ended_at FROM sessions ORDER BY id DESC LIMIT 1').fetchone()
+            else:
+                session = conn.execute(
+                    'SELECT id, ended_at FROM sessions WHERE id=?', (session_id,)).fetchone()
+            if session is None:
+                return None
+            session_id, ended_at = session
+            live = ended_at is None and session_id == self._session_id
+            stamp = (self.write_seq, len(self._track_points)) if ended_at is None else None
+
+            key = (session_id, tolerance)
+            with self._routes_lock:
+                cached = self._routes.get(key)
+                if cached is not None and cached[0] == stamp:
+                    self._routes.move_to_end(key)
+                    return cached[1]
+
+            rows = conn.execute(
+                'SELECT start_ts, data FROM track_blocks WHERE session_id = ? ORDER BY start_ts',
+                (session_id,)
+            ).fetchall()
+
+        points = []
+        for row in rows:
+            points.extend(decode_block(row['data'], row['start_ts']))
+        if live:
+            points.extend(list(self._track_points))
+        route = {
+            'session': session_id,
+            'tolerance': tolerance,
+            'raw_points': len(points),
+            'points': simplify_polyline(points, tolerance),
         }
+        with self._routes_lock:
+            self._routes[key] = (stamp, route)
+            self._routes.move_to_end(key)
+            while len(self._routes) > Config.ROUTE_CACHE_SIZE:
+                self._routes.popitem(last=False)
+        return route
+
+    def _id_bound(self, conn, from_ts, to_ts):
+        """Translate a visit time range into an id range
+
+        Visits are appended in time order, so one timestamp-index lookup per
+        bound turns a date filter into a primary-key range.
+        """
+        low = high = None
+        if from_ts is not None:
+            row = conn.execute(
+                'SELECT id FROM visits WHERE timestamp >= ? ORDER BY timestamp LIMIT 1', (from_ts,)
+            ).fetchone()
+            low = row[0] if row else float('inf')
+        if to_ts is not None:
+            row = conn.execute(
+                'SELECT id FROM visits WHERE timestamp <= ? ORDER BY timestamp DESC LIMIT 1', (to_ts,)
+            ).fetchone()
+            high = row[0] if row else float('-inf')
+        return low, high
+
+    def get_recent_visits(self, limit=50, before=None, country=None, city=None,
+                          from_ts=None, to_ts=None):
+        """Visits newest first, keyset-paginated by id (pass the last id as `before`)"""
+        with self._read_pool.connection() as conn:
+            clauses = []
+            params = []
+            if country:
+                clauses.append('country = ?')
+                params.append(country)
+            if city:
+                clauses.append('city = ?')
+                params.append(city)
+            low, high = self._id_bound(conn, from_ts, to_ts)
+            if before is not None:
+                high = before - 1 if high is None else min(high, before - 1)
+            if low is not None:
+                clauses.append('id >= ?')
+                params.append(low)
+            if high is not None:
+                clauses.append('id <= ?')
+                params.append(high)
+
+            where = ('WHERE ' + ' AND '.join(clauses)) if clauses else ''
+            rows = conn.execute(
+                f'SELECT id, city, country, timestamp, signal_strength FROM visits {where} '
+                'ORDER BY id DESC LIMIT ?',
+                (*params, limit)
+            ).fetchall()
+            return [dict(r) for r in rows]
+
+    def get_job_history(self, limit=20, before=None, city=None, cargo=None,
+                        from_ts=None, to_ts=None):
+        """Completed jobs newest first, keyset-paginated by id
+
+        `city` matches either end of the route; date bounds apply to completion time.
+        """
+        with self._read_pool.connection() as conn:
+            clauses = ['completed_at IS NOT NULL']
+            params = []
+            if before is not None:
+                clauses.append('id < ?')
+                params.append(before)
+            if cargo:
+                clauses.append('cargo = ?')
+                params.append(cargo)
+            if city:
+                clauses.append('(source_city = ? OR dest_city = ?)')
+                params.extend((city, city))
+            if from_ts is not None:
+                clauses.append('completed_at >= ?')
+                params.append(from_ts)
+            if to_ts is not None:
+                clauses.append('completed_at <= ?')
+                params.append(to_ts)
+
+            rows = conn.execute(
+                'SELECT id, cargo, source_city, source_company, dest_city, dest_company, '
+                'distance_km, income, cargo_damage, started_at, completed_at '
+                f'FROM jobs WHERE {" AND ".join(clauses)} ORDER BY id DESC LIMIT ?',
+                (*params, limit)
+            ).fetchall()
+            return [dict(r) for r in rows]
+
+    def get_track(self, from_ts, to_ts):
+        """Breadcrumb points between two timestamps, decoding only blocks in range"""
+        with self._read_pool.connection() as conn:
+            rows = conn.execute(
+                'SELECT start_ts, data FROM track_blocks '
+                'WHERE start_ts >= ? AND start_ts <= ? AND end_ts >= ? ORDER BY start_ts',
+                (from_ts - Config.TRACK_BLOCK_SECONDS, to_ts, from_ts)
+            ).fetchall()
 
-    def get_recent_visits(self, limit=50):
-        conn = self._get_conn()
-        rows = conn.execute(
-            'SELECT city, country, timestamp, signal_strength FROM visits ORDER BY id DESC LIMIT ?',
-            (limit,)
-        ).fetchall()
-        return [dict(r) for r in rows]
-
-    def get_job_history(self, limit=20):
-        conn = self._get_conn()
-        rows = conn.execute(
-            'SELECT cargo, source_city, source_company, dest_city, dest_company, '
-            'distance_km, income, cargo_damage, started_at, completed_at '
-            'FROM jobs WHERE completed_at IS NOT NULL ORDER BY id DESC LIMIT ?',
-            (limit,)
-        ).fetchall()
-        return [dict(r) for r in rows]
+        points = []
+        for row in rows:
+            points.extend(p for p in decode_block(row['data'], row['start_ts'])
+                          if from_ts <= p[0] <= to_ts)
+        # Include the block still being filled
+        points.extend(p for p in list(self._track_points) if from_ts <= p[0] <= to_ts)
+        return points
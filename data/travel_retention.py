@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Retention, rollup and compaction for the travel log
+
+Visits older than the retention window are folded into per-day, per-city
+rows in `visit_rollups` and deleted. Jobs, fines, sessions and the
+materialized stats are never touched, so get_stats is unaffected, and
+rebuilding the stats reads the rolled-up cities and countries too. All
+functions take the writer connection and do a bounded amount of work.
+"""
+
+import time
+
+
+def rollup_visits(conn, cutoff_ts, chunk):
+    """Roll up at most `chunk` visits older than cutoff_ts; return how many moved"""
+    row = conn.execute(
+        'SELECT id FROM visits WHERE timestamp < ? ORDER BY id LIMIT 1 OFFSET ?',
+        (cutoff_ts, chunk - 1)
+    ).fetchone()
+    if row is None:
+        # Fewer than `chunk` rows left: take them all
+        row = conn.execute('SELECT MAX(id) FROM visits WHERE timestamp < ?', (cutoff_ts,)).fetchone()
+        if row[0] is None:
+            return 0
+    max_id = row[0]
+
+    conn.execute('''
+        INSERT INTO visit_rollups (day, city, country, visits, first_ts, last_ts, x, z)
+        SELECT date(timestamp, 'unixepoch'), COALESCE(city, ''), COALESCE(country, ''),
+               COUNT(*), MIN(timestamp), MAX(timestamp), AVG(x), AVG(z)
+        FROM visits WHERE id <= ? AND timestamp < ?
+        GROUP BY 1, 2, 3
+        ON CONFLICT(day, city, country) DO UPDATE SET
+            x = (x * visits + excluded.x * excluded.visits) / (visits + excluded.visits),
+            z = (z * visits + excluded.z * excluded.visits) / (visits + excluded.visits),
+            visits = visits + excluded.visits,
+            first_ts = MIN(first_ts, excluded.first_ts),
+            last_ts = MAX(last_ts, excluded.last_ts)
+    ''', (max_id, cutoff_ts))
+    return conn.execute('DELETE FROM visits WHERE id <= ? AND timestamp < ?',
+                        (max_id, cutoff_ts)).rowcount
+
+
+def incremental_vacuum(conn, pages):
+    """Return up to `pages` free pages to the filesystem (auto_vacuum=INCREMENTAL only)"""
+    conn.execute(f'PRAGMA incremental_vacuum({int(pages)})').fetchall()
+
+
+def retention_cutoff(days, now=None):
+    """Timestamp before which visits are rolled up, or None when retention is off"""
+    if not days or days <= 0:
+        return None
+    return (now or time.time()) - days * 86400
+
+
+def compact(conn, retention_days, chunk):
+    """Roll up everything past retention, then VACUUM into auto_vacuum=INCREMENTAL
+
+    Runs a full VACUUM, so it is meant for the CLI or an idle writer.
+    Returns the number of visits rolled up.
+    """
+    moved = 0
+    cutoff = retention_cutoff(retention_days)
+    if cutoff is not None:
+        while True:
+            count = rollup_visits(conn, cutoff, chunk)
+            conn.commit()
+            moved += count
+            if count < chunk:
+                break
+    conn.commit()
+    # Switching auto_vacuum on an existing database only takes effect after VACUUM
+    conn.execute('PRAGMA auto_vacuum=INCREMENTAL')
+    conn.execute('VACUUM')
+    return moved
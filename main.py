@@ -18,6 +18,7 @@ from data.settings import SettingsManager
 from core.radio_controller import RadioController
 from core.background_monitor import BackgroundMonitor
 from web.app import create_app
+from web.server import serve
 
 
 class ETS2CompanionApp:
@@ -50,10 +51,14 @@ class ETS2CompanionApp:
         # Setup signal handlers
         self.setup_signal_handlers()
         self.running = True
+        self.serving = False
 
     def setup_signal_handlers(self):
         def signal_handler(signum, frame):
             print(f"\nReceived signal {signum}, shutting down...")
+            if self.serving:
+                # Let the server finish in-flight requests; run() cleans up once it returns
+                raise KeyboardInterrupt
             self.shutdown()
             sys.exit(0)
 
@@ -95,18 +100,15 @@ class ETS2CompanionApp:
         print("=" * 70)
 
     def run(self):
+        self.serving = True
         try:
-            self.app.run(
-                host=Config.HOST,
-                port=Config.PORT,
-                debug=Config.DEBUG,
-                use_reloader=False
-            )
+            serve(self.app)
         except KeyboardInterrupt:
             print("\nKeyboard interrupt received")
         except Exception as e:
             print(f"Application error: {e}")
         finally:
+            self.serving = False
             self.shutdown()
 
     def shutdown(self):
@@ -7,7 +7,14 @@ import os
 import time
 import mmap
 import struct
+from time import perf_counter_ns
 from config import Config
+from utils.metrics import REGISTRY
+from utils.tracing import TRACER
+
+SHM_DECODE_SECONDS = REGISTRY.histogram(
+    'ets2_shm_decode_seconds', 'Time to decode one telemetry frame from shared memory')
+SPAN_DECODE = TRACER.name('shm_read_decode', 'telemetry')
 
 
 class ETS2CoordinateReader:
@@ -57,11 +64,28 @@ class ETS2CoordinateReader:
             print(f"Error reading coordinates: {e}")
             return None
 
+    def read_frame_marker(self):
+        """Raw bytes of the pause flag, speed, switches and position
+
+        A few slices of the mapping, far cheaper than read_telemetry(); the
+        monitor compares successive markers to notice a changed frame.
+        """
+        if not self.connected:
+            return None
+
+        try:
+            mm = self.mm
+            return mm[8:9] + mm[752:756] + mm[1500:1512] + mm[2200:2224]
+        except Exception as e:
+            print(f"Error reading frame marker: {e}")
+            return None
+
     def read_telemetry(self):
         """Read all useful telemetry fields from shared memory"""
         if not self.connected:
             return None
 
+        start = perf_counter_ns()
         try:
             mm = self.mm
 
@@ -107,7 +131,7 @@ class ETS2CoordinateReader:
             fuel = _float(800)
             fuel_capacity = _float(704)
 
-            return {
+            telemetry = {
                 'timestamp': time.time(),
                 # Position
                 'coordinateX': cx,
@@ -162,6 +186,10 @@ class ETS2CoordinateReader:
                 'fineAmount': _int64(4208),
                 'fined': _bool(4304),
             }
+            end = perf_counter_ns()
+            SHM_DECODE_SECONDS.observe_ns(end - start)
+            TRACER.record(SPAN_DECODE, start, end)
+            return telemetry
         except Exception as e:
             print(f"Error reading telemetry: {e}")
             return None
@@ -0,0 +1,47 @@
+import threading
+
+from core.alert_log import AlertLog
+
+
+def test_after_returns_new_alerts_and_cursor():
+    log = AlertLog(capacity=10)
+    for i in range(3):
+        log.append('info', f'alert {i}')
+    alerts, last_seq = log.after(1)
+    assert [a['seq'] for a in alerts] == [2, 3]
+    assert last_seq == 3
+    assert log.after(3) == ([], 3)
+
+
+def test_cursor_ahead_of_log_reads_from_start():
+    log = AlertLog(capacity=10)
+    log.append('info', 'one')
+    alerts, last_seq = log.after(50)
+    assert [a['seq'] for a in alerts] == [1]
+    assert last_seq == 1
+
+
+def test_client_following_last_seq_misses_nothing_under_concurrent_appends():
+    log = AlertLog(capacity=100000)
+    total = 20000
+    done = threading.Event()
+
+    def writer():
+        for i in range(total):
+            log.append('info', str(i))
+        done.set()
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    seen = []
+    cursor = 0
+    while not done.is_set() or cursor < total:
+        alerts, last_seq = log.after(cursor)
+        if alerts:
+            assert alerts[-1]['seq'] == last_seq
+        else:
+            assert last_seq == cursor
+        seen.extend(a['seq'] for a in alerts)
+        cursor = last_seq
+    thread.join()
+    assert seen == list(range(1, total + 1))
@@ -0,0 +1,102 @@
+import json
+
+import pytest
+
+from benchmarks.synthetic import build_controller, make_telemetry
+from core.alert_rules import AlertRuleEngine, AlertRuleError, compile_rule
+from data.settings import SettingsError, SettingsManager
+
+SPEED_RULE = {'id': 'speed', 'field': 'speedOverLimit', 'op': '>', 'threshold': 5,
+              'message': 'Speeding {speed:.0f}'}
+
+BAD_RULES = [
+    dict(SPEED_RULE, cooldown='sixty'),
+    dict(SPEED_RULE, hysteresis='x'),
+    dict(SPEED_RULE, when=5),
+    dict(SPEED_RULE, when='parkBrake'),
+    dict(SPEED_RULE, field=['speed']),
+    dict(SPEED_RULE, message=5),
+    dict(SPEED_RULE, op='~'),
+    {'id': 'nothreshold', 'field': 'speed'},
+    'not a rule',
+]
+
+
+@pytest.mark.parametrize('rule', BAD_RULES)
+def test_compile_rule_rejects_bad_definitions(rule):
+    with pytest.raises(AlertRuleError):
+        compile_rule(rule, 60)
+
+
+def test_engine_skips_bad_rules_and_bad_cooldown():
+    engine = AlertRuleEngine(BAD_RULES + [SPEED_RULE], default_cooldown='sixty')
+    assert engine.rule_count() == 1
+    fired = engine.evaluate(make_telemetry(1.0, speed=95.0), 0.0)
+    assert [alert_type for alert_type, _ in fired] == ['speed']
+
+
+def test_non_numeric_field_does_not_raise():
+    engine = AlertRuleEngine([{'id': 'brand', 'field': 'truckBrand', 'threshold': 1}])
+    assert engine.evaluate(make_telemetry(1.0), 0.0) == []
+
+
+@pytest.mark.parametrize('update', [
+    {'alert_cooldown_seconds': 'sixty'},
+    {'alert_cooldown_seconds': -1},
+    {'alert_cooldown_seconds': True},
+    {'alert_rules': {'speed': SPEED_RULE}},
+    {'alert_rules': [dict(SPEED_RULE, when=5)]},
+    {'alert_rules': [dict(SPEED_RULE, hysteresis='x')]},
+    ['alert_rules'],
+])
+def test_settings_update_rejects_bad_alert_settings(tmp_path, update):
+    settings = SettingsManager(tmp_path / 'settings.json')
+    before = settings.get_all()
+    with pytest.raises(SettingsError):
+        settings.update(update)
+    assert settings.get_all() == before
+    assert settings.version == 0
+
+
+def test_settings_post_rejects_bad_alert_settings_with_400(tmp_path):
+    from web.app import create_app
+    controller, _, _ = build_controller(str(tmp_path), countries=2, per_country=2)
+    controller.settings_manager = SettingsManager(tmp_path / 'settings.json')
+    client = create_app(controller).test_client()
+
+    response = client.post('/api/settings', json={'alert_cooldown_seconds': 'sixty'})
+    assert response.status_code == 400
+    assert client.post('/api/settings', json={'alert_cooldown_seconds': 30}).status_code == 200
+
+
+def test_bad_rules_on_disk_do_not_break_update_telemetry(tmp_path):
+    path = tmp_path / 'settings.json'
+    path.write_text(json.dumps({'alert_cooldown_seconds': 'sixty',
+                                'alert_rules': [dict(SPEED_RULE, when=5), SPEED_RULE]}))
+    controller, _, _ = build_controller(str(tmp_path), countries=2, per_country=2)
+    controller.settings_manager = SettingsManager(path)
+
+    controller.update_telemetry(make_telemetry(1.0, speed=95.0))
+    assert controller.current_coordinates is not None
+    alerts, _ = controller.alert_log.after(0)
+    assert [a['type'] for a in alerts] == ['speed']
+
+
+def test_unrelated_settings_change_keeps_rule_state(tmp_path):
+    controller, _, _ = build_controller(str(tmp_path), countries=2, per_country=2)
+    controller.settings_manager = SettingsManager(tmp_path / 'settings.json')
+    controller.settings_manager.update({'alert_rules': [SPEED_RULE]})
+    speeding = make_telemetry(1.0, speed=95.0)
+
+    controller.update_telemetry(speeding)
+    controller.settings_manager.update({'dashboard_visible': False})
+    controller.update_telemetry(dict(speeding, timestamp=2.0))
+    alerts, _ = controller.alert_log.after(0)
+    assert len(alerts) == 1
+
+    # Editing a different rule keeps the untouched rule's state too
+    other = {'id': 'fuel', 'field': 'fuelRatio', 'op': '<', 'threshold': 0.1}
+    controller.settings_manager.update({'alert_rules': [SPEED_RULE, other]})
+    controller.update_telemetry(dict(speeding, timestamp=3.0))
+    alerts, _ = controller.alert_log.after(0)
+    assert len(alerts) == 1
@@ -0,0 +1,110 @@
+import pytest
+
+import core.background_monitor as background_monitor
+from benchmarks.synthetic import make_telemetry
+from config import Config
+from core.background_monitor import BackgroundMonitor
+from core.poll_policy import PollPolicy
+from core.scheduler import FixedRateScheduler
+
+SWITCH_AT = 10.0  # speed goes from town to highway here
+END_AT = 20.0
+
+
+class FakeClock:
+    """Manual clock that also stands in for the monitor's stop event"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def wait(self, delay=None, timeout=None):
+        self.now += delay if delay is not None else timeout
+        return self.is_set()
+
+    def is_set(self):
+        return self.now >= END_AT
+
+
+class TownThenHighwayReader:
+    """30 km/h until SWITCH_AT, then 88 km/h; notes when each kind of read happens"""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.full_reads = []
+        self.position_reads = []
+
+    def is_connected(self):
+        return True
+
+    def _telemetry(self):
+        now = self.clock.now
+        return make_telemetry(now, speed=88.0 if now >= SWITCH_AT else 30.0)
+
+    def read_telemetry(self):
+        self.full_reads.append(self.clock.now)
+        return self._telemetry()
+
+    def read_coordinates(self):
+        self.position_reads.append(self.clock.now)
+        t = self._telemetry()
+        return {'x': t['coordinateX'], 'y': t['coordinateY'], 'z': t['coordinateZ'], 'timestamp': t['timestamp']}
+
+    def read_frame_marker(self):
+        return None
+
+
+class NullController:
+    def update_telemetry(self, telemetry):
+        pass
+
+    def update_position(self, coordinates):
+        pass
+
+
+def _rate(times, start, end):
+    return sum(start <= t < end for t in times) / (end - start)
+
+
+@pytest.mark.parametrize('position_hz, telemetry_hz, fast_loop_hz', [
+    (20, 10, 30),  # defaults: fast raises the loop to POLL_FAST_HZ
+    (60, 10, 60),  # a normal rate above POLL_FAST_HZ is kept when going fast
+])
+def test_fast_mode_never_slows_the_loop_and_keeps_full_frames(monkeypatch, position_hz, telemetry_hz, fast_loop_hz):
+    monkeypatch.setattr(Config, 'MONITOR_POSITION_HZ', position_hz)
+    monkeypatch.setattr(Config, 'MONITOR_TELEMETRY_HZ', telemetry_hz)
+    monkeypatch.setattr(Config, 'POLL_FAST_HZ', 30)
+    monkeypatch.setattr(Config, 'POLL_FAST_SPEED_KMH', 60)
+    clock = FakeClock()
+    monkeypatch.setattr(background_monitor, 'FixedRateScheduler',
+                        lambda hz, policy: FixedRateScheduler(hz, policy, clock=clock))
+    reader = TownThenHighwayReader(clock)
+    monitor = BackgroundMonitor(reader, NullController())
+    monitor.policy = PollPolicy(clock=clock)
+    monitor._stop_event = clock
+
+    monitor._monitor_loop()
+
+    assert monitor.policy.mode == 'fast'
+    ticks = reader.full_reads + reader.position_reads
+    # Whole seconds well inside each phase
+    assert _rate(ticks, 2, 9) == pytest.approx(max(position_hz, telemetry_hz), abs=0.5)
+    assert _rate(ticks, 12, 19) == pytest.approx(fast_loop_hz, abs=0.5)
+    assert _rate(reader.full_reads, 2, 9) == pytest.approx(telemetry_hz, abs=0.5)
+    assert _rate(reader.full_reads, 12, 19) == pytest.approx(telemetry_hz, abs=0.5)
+
+
+def test_rates_per_mode(monkeypatch):
+    monkeypatch.setattr(Config, 'MONITOR_POSITION_HZ', 60)
+    monkeypatch.setattr(Config, 'MONITOR_TELEMETRY_HZ', 10)
+    monkeypatch.setattr(Config, 'POLL_FAST_HZ', 30)
+    monkeypatch.setattr(Config, 'POLL_WAKE_HZ', 10)
+    monkeypatch.setattr(Config, 'POLL_IDLE_HZ', 1)
+    assert PollPolicy.loop_hz('normal') == 60
+    assert PollPolicy.loop_hz('fast') == 60
+    assert PollPolicy.loop_hz('idle') == 10
+    assert PollPolicy.telemetry_every('normal') == 6
+    assert PollPolicy.telemetry_every('fast') == 6
+    assert PollPolicy.telemetry_every('idle') == 10
@@ -0,0 +1,102 @@
+import pytest
+
+from core.scheduler import FixedRateScheduler
+
+
+class FakeClock:
+    """Manual clock; waiting on it just moves time forward"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.stopped = False
+
+    def __call__(self):
+        return self.now
+
+    # Stands in for the monitor's threading.Event
+    def wait(self, delay):
+        self.now += delay
+        return self.stopped
+
+    def is_set(self):
+        return self.stopped
+
+
+def _scheduler(clock, hz=10, policy='skip', max_catchup=5):
+    return FixedRateScheduler(hz, policy, max_catchup, clock=clock)
+
+
+def test_ticks_stay_on_the_grid_despite_work():
+    clock = FakeClock()
+    scheduler = _scheduler(clock)
+    for _ in range(100):
+        assert scheduler.wait(clock) == pytest.approx(0.0)
+        clock.now += 0.03  # work shorter than the period never stretches it
+    assert clock.now == pytest.approx(99 * 0.1 + 0.03)
+    assert scheduler.overruns == 0
+    assert scheduler.ticks == 100
+
+
+def test_skip_drops_missed_ticks_and_returns_to_the_grid():
+    clock = FakeClock()
+    scheduler = _scheduler(clock, policy='skip')
+    scheduler.wait(clock)
+    clock.now += 0.35  # overran the 0.1, 0.2 and 0.3 deadlines
+
+    assert scheduler.wait(clock) == pytest.approx(0.25)
+    assert scheduler.overruns == 1
+    assert scheduler.skipped == 2
+    assert scheduler.wait(clock) == pytest.approx(0.0)
+    assert clock.now == pytest.approx(0.4)
+
+
+def test_catchup_runs_missed_ticks_back_to_back():
+    clock = FakeClock()
+    scheduler = _scheduler(clock, policy='catchup')
+    scheduler.wait(clock)
+    clock.now += 0.35
+
+    lateness = [scheduler.wait(clock) for _ in range(3)]
+    assert lateness == pytest.approx([0.25, 0.15, 0.05])
+    assert clock.now == pytest.approx(0.35)
+    assert scheduler.skipped == 0
+    assert scheduler.overruns == 3
+    assert scheduler.wait(clock) == pytest.approx(0.0)
+    assert clock.now == pytest.approx(0.4)
+
+
+def test_catchup_falls_back_to_skip_when_too_far_behind():
+    clock = FakeClock()
+    scheduler = _scheduler(clock, policy='catchup', max_catchup=2)
+    scheduler.wait(clock)
+    clock.now += 1.05  # ten periods behind, more than max_catchup
+
+    assert scheduler.wait(clock) == pytest.approx(0.95)
+    assert scheduler.skipped == 9
+    assert scheduler.wait(clock) == pytest.approx(0.0)
+    assert clock.now == pytest.approx(1.1)
+
+
+def test_set_rate_keeps_the_last_deadline_as_anchor():
+    clock = FakeClock()
+    scheduler = _scheduler(clock, hz=10)
+    scheduler.wait(clock)
+    scheduler.wait(clock)
+    assert clock.now == pytest.approx(0.1)
+    scheduler.set_rate(2)
+    scheduler.wait(clock)
+    assert clock.now == pytest.approx(0.6)
+
+
+def test_stop_event_ends_the_wait():
+    clock = FakeClock()
+    scheduler = _scheduler(clock)
+    scheduler.wait(clock)
+    clock.stopped = True
+    assert scheduler.wait(clock) is None
+
+
+@pytest.mark.parametrize('hz, policy', [(0, 'skip'), (-1, 'skip'), (10, 'sometimes')])
+def test_invalid_rate_or_policy(hz, policy):
+    with pytest.raises(ValueError):
+        FixedRateScheduler(hz, policy)
@@ -0,0 +1,30 @@
+import sqlite3
+
+import pytest
+
+from data.sqlite_pool import ConnectionPool
+
+
+@pytest.fixture
+def pool(tmp_path):
+    path = tmp_path / 'pool.db'
+    sqlite3.connect(path).close()
+    pool = ConnectionPool(path, size=1, timeout=0.05)
+    yield pool
+    pool.close()
+
+
+def test_timed_out_acquire_is_not_counted_as_acquired(pool):
+    conn = pool.acquire()
+    with pytest.raises(TimeoutError):
+        pool.acquire()
+    stats = pool.get_stats()
+    assert stats['acquired'] == 1
+    assert stats['waits'] == 1
+    assert stats['timeouts'] == 1
+
+    pool.release(conn)
+    with pool.connection():
+        pass
+    stats = pool.get_stats()
+    assert (stats['acquired'], stats['reused'], stats['timeouts']) == (2, 1, 1)
@@ -0,0 +1,68 @@
+from benchmarks.synthetic import build_controller, make_telemetry
+from core.telemetry_delta import TelemetryDeltaTracker
+
+
+def _controller(tmp_path):
+    controller, _, _ = build_controller(str(tmp_path), countries=2, per_country=2)
+    return controller
+
+
+def test_identical_frame_keeps_revision_and_etag(tmp_path):
+    controller = _controller(tmp_path)
+    frame = make_telemetry(1.0)
+    controller.update_telemetry(frame)
+    revision = controller._revision
+    etag = controller.get_telemetry_payload().etag
+
+    controller.update_telemetry(dict(frame))
+    assert controller._revision == revision
+    assert controller.get_telemetry_payload().etag == etag
+
+
+def test_changed_frame_advances_revision(tmp_path):
+    controller = _controller(tmp_path)
+    frame = make_telemetry(1.0)
+    controller.update_telemetry(frame)
+    revision = controller._revision
+
+    moved = dict(frame, coordinateX=frame['coordinateX'] + 100.0)
+    controller.update_telemetry(moved)
+    assert controller._revision > revision
+
+
+def test_unchanged_position_keeps_revision(tmp_path):
+    controller = _controller(tmp_path)
+    coordinates = {'x': 8500.0, 'y': 45.0, 'z': -25200.0, 'timestamp': 1.0}
+    controller.update_position(coordinates)
+    revision = controller._revision
+    controller.update_position(dict(coordinates, timestamp=2.0))
+    assert controller._revision == revision
+
+
+def test_delta_since_own_token_is_partial():
+    tracker = TelemetryDeltaTracker({'speed': 0.5})
+    tracker.update({'truck': {'speed': 50.0, 'gear': 5}})
+    token = tracker.delta_since('')['revision']
+    tracker.update({'truck': {'speed': 60.0, 'gear': 5}})
+
+    delta = tracker.delta_since(token)
+    assert not delta['full']
+    assert delta['changes'] == {'truck': {'speed': 60.0}}
+    assert tracker.delta_since(delta['revision'])['changes'] == {}
+
+
+def test_delta_since_foreign_or_stale_token_is_full():
+    old = TelemetryDeltaTracker()
+    old.update({'truck': {'speed': 50.0}})
+    old.update({'truck': {'speed': 90.0}})
+    stale = old.token
+
+    # A restarted server with more revisions than the client's token
+    tracker = TelemetryDeltaTracker()
+    for speed in (10.0, 20.0, 30.0):
+        tracker.update({'truck': {'speed': speed, 'gear': 1}})
+
+    for since in (stale, '1', 2, '', None, f'{tracker.epoch}.99', f'{tracker.epoch}.x'):
+        delta = tracker.delta_since(since)
+        assert delta['full'], since
+        assert delta['changes'] == {'truck': {'speed': 30.0, 'gear': 1}}
@@ -0,0 +1,67 @@
+import time
+
+from data import travel_retention
+from data.travel_log import TravelLog
+
+
+def test_writer_survives_non_sqlite_errors(tmp_path, monkeypatch):
+    log = TravelLog(str(tmp_path / 'travel.db'))
+    try:
+        def bad_op(conn):
+            raise TypeError('bad payload')
+
+        log._enqueue(bad_op)
+        log.record_visit('Paris', 'france', 0.0, 0.0, 1.0)
+        assert log.flush(5)
+        assert log.get_stats()['cities_visited'] == 1
+
+        def broken_rollup(*args):
+            raise OSError('disk went away')
+
+        monkeypatch.setattr(travel_retention, 'rollup_visits', broken_rollup)
+        log._next_maintenance = 0
+        log.record_visit('Lyon', 'france', 0.0, 0.0, 1.0)
+        assert log.flush(5)
+        assert log._writer.is_alive()
+        log.record_visit('Calais', 'france', 0.0, 0.0, 1.0)
+        assert log.flush(5)
+        assert log.get_stats()['cities_visited'] == 3
+    finally:
+        log.close()
+
+
+def test_rebuild_stats_after_rollup_keeps_city_and_country_counts(tmp_path):
+    log = TravelLog(str(tmp_path / 'travel.db'))
+    try:
+        old = time.time() - 400 * 86400
+        for i in range(10):
+            log._enqueue(log._write_visit, old + i, f'City {i}', f'country{i % 3}', 0.0, 0.0, 1.0)
+        log._enqueue(log._write_visit, old + 20, None, None, 0.0, 0.0, 0.0)
+        log.record_visit('City 0', 'country0', 0.0, 0.0, 1.0)
+        log.record_visit('Recent', 'country9', 0.0, 0.0, 1.0)
+        assert log.flush(5)
+        before = log.get_stats()
+        assert (before['cities_visited'], before['countries_visited']) == (11, 4)
+
+        log.compact(365)
+        assert log.rolled_up == 11
+        assert log.get_stats() == before
+
+        log.rebuild_stats()
+        assert log.get_stats() == before
+    finally:
+        log.close()
+
+
+def test_analytics_distance_uses_driven_km(tmp_path):
+    log = TravelLog(str(tmp_path / 'travel.db'))
+    try:
+        log.record_job_start('Tractors', 'Paris', 'posped', 'Berlin', 'itcc', 850, 1000)
+        log.record_job_complete(0.0, {'driven_km': 812.5})
+        log.record_job_start('Tractors', 'Berlin', 'posped', 'Paris', 'itcc', 850, 1000)
+        log.record_job_complete(0.0)  # No trip metrics: planned distance
+        assert log.flush(5)
+        _, analytics = log.get_analytics()
+        assert analytics['cargo'][0]['distance'] == 812.5 + 850
+    finally:
+        log.close()
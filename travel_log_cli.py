@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Command-line maintenance tools for the ETS2 Truck Companion travel log
+
+Usage:
+    python travel_log_cli.py rebuild-stats [--db travel_log.db]
+    python travel_log_cli.py export [--format ndjson|csv] [--tables visits,visit_rollups,jobs,fines,sessions,track] [-o FILE]
+    python travel_log_cli.py compact [--retention-days N]
+"""
+
+import argparse
+import os
+import sys
+from config import Config
+from data.travel_export import EXPORT_FORMATS, EXPORT_TABLES, ExportError, iter_export, validate_export
+from data.travel_log import TravelLog
+
+
+def cmd_rebuild_stats(args):
+    log = TravelLog(args.db)
+    try:
+        log.rebuild_stats()
+        stats = log.get_stats()
+    finally:
+        log.close()
+    for key, value in stats.items():
+        print(f"{key}: {value}")
+    return 0
+
+
+def cmd_export(args):
+    tables = [t for t in args.tables.split(',') if t]
+    try:
+        tables = validate_export(tables, args.format)
+    except ExportError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    log = TravelLog(args.db)
+    try:
+        out = open(args.output, 'w', newline='', encoding='utf-8') if args.output else sys.stdout
+        try:
+            for chunk in iter_export(log, tables, args.format):
+                out.write(chunk)
+        finally:
+            if out is not sys.stdout:
+                out.close()
+    finally:
+        log.close()
+    return 0
+
+
+def cmd_compact(args):
+    before = os.path.getsize(args.db) if os.path.exists(args.db) else 0
+    log = TravelLog(args.db)
+    try:
+        log.compact(args.retention_days)
+        rolled_up = log.get_writer_stats()['rolled_up']
+    finally:
+        log.close()
+    after = os.path.getsize(args.db)
+    print(f"Rolled up {rolled_up} visits; {before / 1024:.0f} KB -> {after / 1024:.0f} KB")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ETS2 Truck Companion travel log tools")
+    parser.add_argument('--db', default=str(Config.TRAVEL_LOG_DB), help="Path to travel_log.db")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    rebuild = commands.add_parser('rebuild-stats', help="Recompute aggregate statistics from history")
+    rebuild.set_defaults(func=cmd_rebuild_stats)
+
+    export = commands.add_parser('export', help="Stream tables as NDJSON or CSV")
+    export.add_argument('--format', choices=EXPORT_FORMATS, default='ndjson')
+    export.add_argument('--tables', default='',
+                        help=f"Comma-separated tables ({','.join(EXPORT_TABLES)}); default all")
+    export.add_argument('-o', '--output', help="Output file (default: stdout)")
+    export.set_defaults(func=cmd_export)
+
+    compact = commands.add_parser('compact', help="Roll up old visits and VACUUM the database")
+    compact.add_argument('--retention-days', type=int, default=Config.VISIT_RETENTION_DAYS,
+                         help="Roll up visits older than this many days (0 keeps all)")
+    compact.set_defaults(func=cmd_compact)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
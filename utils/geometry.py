@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Polyline helpers for drawing recorded routes
+"""
+
+
+def simplify_polyline(points, tolerance):
+    """Douglas-Peucker simplification of [(t, x, z), ...] on the x/z plane
+
+    Keeps every point needed so the simplified line never strays further
+    than `tolerance` from the original. Uses an explicit stack instead of
+    recursion, so long routes cannot hit the recursion limit.
+    """
+    count = len(points)
+    if count < 3 or tolerance <= 0:
+        return list(points)
+
+    tolerance_sq = tolerance * tolerance
+    xs = [p[1] for p in points]
+    zs = [p[2] for p in points]
+    keep = bytearray(count)
+    keep[0] = keep[-1] = 1
+    stack = [(0, count - 1)]
+    while stack:
+        first, last = stack.pop()
+        ax, az = xs[first], zs[first]
+        dx, dz = xs[last] - ax, zs[last] - az
+        length_sq = dx * dx + dz * dz
+        worst = 0.0
+        index = 0
+        # Squared distance from point i to segment first-last, inlined
+        # because this loop is the whole cost
+        for i in range(first + 1, last):
+            ex = xs[i] - ax
+            ez = zs[i] - az
+            if length_sq:
+                t = (ex * dx + ez * dz) / length_sq
+                if t > 1.0:
+                    ex -= dx
+                    ez -= dz
+                elif t > 0.0:
+                    ex -= t * dx
+                    ez -= t * dz
+            d = ex * ex + ez * ez
+            if d > worst:
+                worst = d
+                index = i
+        if worst > tolerance_sq:
+            keep[index] = 1
+            if index - first > 1:
+                stack.append((first, index))
+            if last - index > 1:
+                stack.append((index, last))
+    return [p for p, kept in zip(points, keep) if kept]
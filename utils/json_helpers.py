@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Compact JSON encoding, through orjson when it is installed
+
+orjson serializes the API payloads several times faster than the stdlib
+encoder and returns bytes directly. Without it (or for values orjson
+rejects, such as integers beyond 64 bits) the stdlib encoder is used with
+the same compact separators.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_BACKEND = 'orjson' if orjson is not None else 'json'
+
+_stdlib_encoder = json.JSONEncoder(separators=(',', ':'))
+
+if orjson is not None:
+    # Dicts keyed by ints (e.g. per-session maps) are written with string
+    # keys, as the stdlib encoder does
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def dumps(obj, default=None):
+    """Serialize `obj` to compact UTF-8 JSON bytes"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=default, option=_ORJSON_OPTIONS)
+        except TypeError:
+            pass
+    if default is None:
+        return _stdlib_encoder.encode(obj).encode('utf-8')
+    return json.dumps(obj, default=default, separators=(',', ':')).encode('utf-8')
+
+
+def dumps_str(obj, default=None):
+    """Serialize `obj` to a compact JSON string"""
+    return dumps(obj, default).decode('utf-8')
+
+
+def loads(data):
+    """Parse JSON from str or bytes"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
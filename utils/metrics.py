@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Minimal Prometheus-style counters and histograms for the hot paths
+
+Metrics are created once at import time and registered in REGISTRY, which
+renders them in the Prometheus text exposition format for /metrics.
+Histogram buckets are fixed lists allocated up front, so observe() is a
+bisect plus a few in-place increments under a lock, cheap enough to leave
+on permanently at monitor rates (60 Hz and more).
+"""
+
+import threading
+from bisect import bisect_left
+from time import perf_counter_ns
+
+# Seconds; 10 µs .. 2.5 s
+LATENCY_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5,
+)
+# Bytes; 256 B .. 4 MB
+SIZE_BUCKETS = tuple(256 * 4 ** i for i in range(8))
+
+
+class Counter:
+    """Monotonic counter"""
+
+    __slots__ = ('value', '_lock')
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def _samples(self, name, labels):
+        yield f'{name}_total{_format_labels(labels)} {self.value}'
+
+
+class Histogram:
+    """Cumulative histogram over fixed upper bounds (plus +Inf)"""
+
+    __slots__ = ('bounds', 'counts', 'sum', '_lock')
+
+    def __init__(self, buckets):
+        self.bounds = tuple(buckets)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        i = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+
+    def observe_ns(self, nanoseconds):
+        """Record a perf_counter_ns() difference in seconds"""
+        self.observe(nanoseconds * 1e-9)
+
+    def _samples(self, name, labels):
+        with self._lock:
+            counts = list(self.counts)
+            total = self.sum
+        cumulative = 0
+        for bound, count in zip(self.bounds, counts):
+            cumulative += count
+            yield f'{name}_bucket{_format_labels(labels, le=_format_value(bound))} {cumulative}'
+        cumulative += counts[-1]
+        yield f'{name}_bucket{_format_labels(labels, le="+Inf")} {cumulative}'
+        yield f'{name}_sum{_format_labels(labels)} {_format_value(total)}'
+        yield f'{name}_count{_format_labels(labels)} {cumulative}'
+
+
+class MetricFamily:
+    """Metrics of one name, one child per label value tuple"""
+
+    def __init__(self, kind, name, documentation, labelnames, factory):
+        self.kind = kind
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._factory = factory
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values):
+        """Child for these label values, created on first use"""
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._factory())
+        return child
+
+    def render(self):
+        yield f'# HELP {self.name} {self.documentation}'
+        yield f'# TYPE {self.name} {self.kind}'
+        for values, child in sorted(self._children.items()):
+            yield from child._samples(self.name, dict(zip(self.labelnames, values)))
+
+
+class MetricsRegistry:
+    """Named metric families, rendered together for /metrics"""
+
+    def __init__(self):
+        self._families = {}
+        self._lock = threading.Lock()
+
+    def _register(self, kind, name, documentation, labelnames, factory):
+        with self._lock:
+            family = self._families.get(name)
+            if family is None:
+                family = self._families[name] = MetricFamily(kind, name, documentation, labelnames, factory)
+        # Without labels the family has a single child, returned directly
+        return family if labelnames else family.labels()
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register('counter', name, documentation, labelnames, Counter)
+
+    def histogram(self, name, documentation, buckets=LATENCY_BUCKETS, labelnames=()):
+        return self._register('histogram', name, documentation, labelnames, lambda: Histogram(buckets))
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            families = sorted(self._families.items())
+        lines = []
+        for _, family in families:
+            lines.extend(family.render())
+        return '\n'.join(lines) + '\n'
+
+
+class TimedLock:
+    """threading.Lock that records how long each acquisition waited
+
+    The uncontended case is a non-blocking acquire and no clock reads.
+    """
+
+    __slots__ = ('_lock', '_wait')
+
+    def __init__(self, wait_histogram):
+        self._lock = threading.Lock()
+        self._wait = wait_histogram
+
+    def __enter__(self):
+        if self._lock.acquire(False):
+            self._wait.observe(0.0)
+        else:
+            start = perf_counter_ns()
+            self._lock.acquire()
+            self._wait.observe_ns(perf_counter_ns() - start)
+        return self
+
+    def __exit__(self, *exc):
+        self._lock.release()
+
+    def locked(self):
+        return self._lock.locked()
+
+
+def _format_value(value):
+    value = float(value)
+    if value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels, **extra):
+    items = {**labels, **extra}
+    if not items:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in items.items()) + '}'
+
+
+REGISTRY = MetricsRegistry()
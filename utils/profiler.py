@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+On-demand profiling for diagnosing stutters
+
+SamplingProfiler walks every thread's stack (sys._current_frames) at a
+fixed rate for a number of seconds and returns collapsed stacks, one
+"thread;outer;...;inner count" line per distinct stack, ready for
+flamegraph.pl, speedscope or inferno. ScopedProfiler runs cProfile over
+one code path only (the monitor tick) while a capture is active.
+
+Nothing here runs until a capture is requested, and the scoped profiler
+costs one attribute check per monitor tick when idle. Both capture() calls
+run in the caller's thread and block it for the whole capture, so a request
+to /api/debug/profile holds one server thread for up to
+Config.PROFILE_MAX_SECONDS.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+
+
+class ProfilerBusy(RuntimeError):
+    """Raised when a capture is requested while another one is running"""
+
+
+def _frame_label(code):
+    # ';' separates frames in the collapsed format
+    name = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    return name.replace(';', ':')
+
+
+class SamplingProfiler:
+    """Stack sampler over all threads, one capture at a time"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def capture(self, seconds, hz=100):
+        """Sample for `seconds` at `hz` and return (collapsed_text, samples)"""
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusy("A sampling capture is already running")
+        try:
+            return self._capture(seconds, hz)
+        finally:
+            self._lock.release()
+
+    def _capture(self, seconds, hz):
+        stacks = Counter()
+        labels = {}  # code object -> label, so each function is formatted once
+        own = threading.get_ident()
+        interval = 1.0 / hz
+        samples = 0
+        deadline = time.perf_counter() + seconds
+        next_sample = time.perf_counter()
+        while next_sample < deadline:
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    label = labels.get(code)
+                    if label is None:
+                        label = labels[code] = _frame_label(code)
+                    stack.append(label)
+                    frame = frame.f_back
+                stack.append(names.get(ident, f'thread-{ident}').replace(';', ':'))
+                stacks[';'.join(reversed(stack))] += 1
+            samples += 1
+            next_sample += interval
+            delay = next_sample - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                # Fell behind (slow walk or GIL contention): skip missed samples
+                next_sample = time.perf_counter()
+        text = ''.join(f'{stack} {count}\n' for stack, count in stacks.most_common())
+        return text, samples
+
+
+class ScopedProfiler:
+    """cProfile over calls routed through run() while a capture is active"""
+
+    def __init__(self):
+        self.active = False
+        self._profile = None
+        self._calls = 0
+        self._capture_lock = threading.Lock()
+        self._run_lock = threading.Lock()
+
+    def run(self, fn, *args):
+        """Call fn(*args), profiled if a capture is running (call only when active)"""
+        with self._run_lock:
+            profile = self._profile
+            if profile is None:
+                return fn(*args)
+            self._calls += 1
+            profile.enable()
+            try:
+                return fn(*args)
+            finally:
+                profile.disable()
+
+    def capture(self, seconds, limit=40, sort='cumulative'):
+        """Profile run() calls for `seconds`; returns pstats text"""
+        if not self._capture_lock.acquire(blocking=False):
+            raise ProfilerBusy("A cProfile capture is already running")
+        try:
+            with self._run_lock:
+                self._profile = cProfile.Profile()
+                self._calls = 0
+            self.active = True
+            time.sleep(seconds)
+            self.active = False
+            # Waits for a profiled call still in progress
+            with self._run_lock:
+                profile, self._profile = self._profile, None
+                calls = self._calls
+        finally:
+            self._capture_lock.release()
+
+        out = io.StringIO()
+        out.write(f"{calls} profiled calls in {seconds:g} s\n")
+        if calls:
+            stats = pstats.Stats(profile, stream=out)
+            stats.strip_dirs().sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+
+SAMPLER = SamplingProfiler()
+# Wraps each BackgroundMonitor tick
+MONITOR_PROFILER = ScopedProfiler()
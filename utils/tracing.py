@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Always-on span tracing into a fixed ring, exported as Chrome trace JSON
+
+Spans are (name id, start, end, thread) tuples written into preallocated
+array('q') columns, so recording one is a few in-place stores with no
+allocation beyond the clock readings. Names are interned once, up front,
+with Tracer.name(). The ring keeps the most recent `capacity` spans; dump()
+turns them into the Trace Event Format understood by Perfetto and
+chrome://tracing.
+"""
+
+import os
+import threading
+from array import array
+from time import perf_counter_ns, time_ns
+from config import Config
+from utils.json_helpers import dumps
+
+
+class Tracer:
+    """Bounded ring of completed spans"""
+
+    def __init__(self, capacity=None, enabled=None):
+        self.capacity = capacity or Config.TRACE_BUFFER_SPANS
+        self.enabled = Config.TRACING_ENABLED if enabled is None else enabled
+        zeros = bytes(8 * self.capacity)
+        self._names = array('q', zeros)
+        self._starts = array('q', zeros)
+        self._ends = array('q', zeros)
+        self._threads = array('Q', zeros)
+        self._head = 0
+        self._count = 0
+        self._lock = threading.Lock()
+        self._name_ids = {}
+        self._name_list = []
+        self._name_lock = threading.Lock()
+        # perf_counter_ns has an arbitrary origin; anchor it to wall time for the dump
+        self._epoch_offset_ns = time_ns() - perf_counter_ns()
+
+    @property
+    def memory_bytes(self):
+        return 4 * 8 * self.capacity
+
+    def name(self, label, category):
+        """Id for a span name in a category (e.g. 'monitor', 'http'), interned on first use"""
+        key = (label, category)
+        name_id = self._name_ids.get(key)
+        if name_id is None:
+            with self._name_lock:
+                name_id = self._name_ids.get(key)
+                if name_id is None:
+                    name_id = len(self._name_list)
+                    self._name_list.append(key)
+                    self._name_ids[key] = name_id
+        return name_id
+
+    def record(self, name_id, start_ns, end_ns=None):
+        """Store a span that started at `start_ns` (perf_counter_ns) and ends now or at `end_ns`"""
+        if not self.enabled:
+            return
+        if end_ns is None:
+            end_ns = perf_counter_ns()
+        thread = threading.get_ident()
+        with self._lock:
+            i = self._head
+            self._names[i] = name_id
+            self._starts[i] = start_ns
+            self._ends[i] = end_ns
+            self._threads[i] = thread
+            self._head = i + 1 if i + 1 < self.capacity else 0
+            if self._count < self.capacity:
+                self._count += 1
+
+    def clear(self):
+        with self._lock:
+            self._head = 0
+            self._count = 0
+
+    def _snapshot(self):
+        with self._lock:
+            count, head = self._count, self._head
+            start = head - count
+            if start >= 0:
+                ranges = [(start, head)]
+            else:
+                ranges = [(self.capacity + start, self.capacity), (0, head)]
+            columns = ([], [], [], [])
+            for lo, hi in ranges:
+                for column, source in zip(columns, (self._names, self._starts, self._ends, self._threads)):
+                    column.extend(source[lo:hi])
+        return columns
+
+    def events(self, seconds=None):
+        """Spans as Trace Event Format dicts, oldest first"""
+        names, starts, ends, threads = self._snapshot()
+        cutoff = perf_counter_ns() - int(seconds * 1e9) if seconds else None
+        thread_names = {t.ident: t.name for t in threading.enumerate()}
+        pid = os.getpid()
+        offset = self._epoch_offset_ns
+        labels = list(self._name_list)
+        events = []
+        seen_threads = set()
+        for name_id, start, end, thread in zip(names, starts, ends, threads):
+            if cutoff is not None and end < cutoff:
+                continue
+            seen_threads.add(thread)
+            label, category = labels[name_id]
+            events.append({
+                'name': label,
+                'cat': category,
+                'ph': 'X',
+                'ts': (start + offset) / 1000,
+                'dur': (end - start) / 1000,
+                'pid': pid,
+                'tid': thread,
+            })
+        for thread in seen_threads:
+            events.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': thread,
+                           'args': {'name': thread_names.get(thread, f'thread-{thread}')}})
+        return events
+
+    def dump(self, seconds=None):
+        """Chrome trace JSON (bytes) of the buffered spans, optionally only the last `seconds`"""
+        return dumps({'traceEvents': self.events(seconds), 'displayTimeUnit': 'ms'})
+
+
+TRACER = Tracer()
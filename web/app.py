@@ -7,6 +7,7 @@ import os
 from flask import Flask
 from flask_cors import CORS
 from config import Config
+from web.json_provider import FastJSONProvider
 
 
 def create_app(radio_controller):
@@ -17,6 +18,7 @@ def create_app(radio_controller):
         static_folder=os.path.join(os.path.dirname(__file__), 'static'),
         template_folder=os.path.join(os.path.dirname(__file__), 'templates'),
     )
+    app.json = FastJSONProvider(app)
     CORS(app)
 
     app.config.update(
@@ -28,6 +30,16 @@ def create_app(radio_controller):
     routes = create_routes(radio_controller)
     app.register_blueprint(routes)
 
+    from web.assets import init_assets
+    init_assets(app)
+
+    # Registered before compression so its timings and sizes include it
+    from web.instrumentation import init_instrumentation
+    init_instrumentation(app)
+
+    from web.compression import init_compression
+    init_compression(app)
+
     @app.errorhandler(404)
     def not_found(error):
         return {'error': 'Not found'}, 404
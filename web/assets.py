@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Serving of the bundles written by web/build_assets.py
+
+Templates call asset_urls('app.js') for the URLs to load: the hashed
+bundle when dist/manifest.json is present and up to date, otherwise the
+individual source files (so the app works without a build step and never
+serves a bundle older than the sources). Bundles are served from
+/static/dist with the best precompressed variant the client accepts and a
+one-year immutable Cache-Control, since a changed bundle gets a new name.
+"""
+
+import json
+import os
+from flask import abort, request, send_file
+from web.build_assets import ASSET_BUNDLES, DIST_DIR, MANIFEST_NAME, STATIC_DIR
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+# Content-Encoding -> file suffix, in order of preference
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def load_manifest(dist_dir=DIST_DIR, static_dir=STATIC_DIR):
+    """Return the build manifest, or None if missing or older than the sources"""
+    try:
+        with open(os.path.join(dist_dir, MANIFEST_NAME), encoding='utf-8') as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Ignoring asset manifest: {e}")
+        return None
+
+    for rel in (rel for sources in ASSET_BUNDLES.values() for rel in sources):
+        built = manifest['sources'].get(rel)
+        try:
+            current = os.path.getmtime(os.path.join(static_dir, rel))
+        except OSError:
+            continue
+        if built is None or current > built:
+            print(f"⚠️ {rel} changed since the last asset build, serving unbundled files "
+                  f"(run: python -m web.build_assets)")
+            return None
+    return manifest
+
+
+def init_assets(app, dist_dir=DIST_DIR):
+    """Register asset_urls() for templates and the /static/dist route"""
+    manifest = load_manifest(dist_dir)
+    bundles = manifest['bundles'] if manifest else {}
+    served = set(bundles.values())
+
+    def asset_urls(bundle):
+        if bundle in bundles:
+            return [f'/static/dist/{bundles[bundle]}']
+        return [f'/static/{rel}' for rel in ASSET_BUNDLES[bundle]]
+
+    app.jinja_env.globals['asset_urls'] = asset_urls
+
+    @app.route('/static/dist/<path:filename>')
+    def dist_asset(filename):
+        # Only names from the manifest, so nothing else under dist is reachable
+        if filename not in served:
+            abort(404)
+        path = os.path.join(dist_dir, filename)
+        encoding = None
+        accepted = request.accept_encodings
+        for name, suffix in ENCODINGS:
+            if accepted[name] and os.path.exists(path + suffix):
+                path, encoding = path + suffix, name
+                break
+
+        response = send_file(path, download_name=filename, conditional=True)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        response.headers['Cache-Control'] = f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+        response.vary.add('Accept-Encoding')
+        return response
+
+    if manifest:
+        print(f"📦 Serving built assets: {', '.join(sorted(served))}")
+    return manifest
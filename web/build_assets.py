@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Static asset build for ETS2 Truck Companion (pure Python, no node)
+
+Concatenates and minifies the JS and CSS bundles listed in ASSET_BUNDLES,
+writes them to web/static/dist under content-hashed names with gzip (and
+brotli, if the module is installed) variants next to them, and records the
+mapping in dist/manifest.json for web/assets.py.
+
+    python -m web.build_assets
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import sys
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+STATIC_DIR = os.path.join(os.path.dirname(__file__), 'static')
+DIST_DIR = os.path.join(STATIC_DIR, 'dist')
+MANIFEST_NAME = 'manifest.json'
+
+# Bundle name -> source files (relative to web/static), in load order
+ASSET_BUNDLES = {
+    'app.js': ['js/app.js', 'js/dashboard.js', 'js/audio.js', 'js/gamepad.js', 'js/travel-log.js'],
+    'main.css': ['css/main.css'],
+}
+
+# A '/' after one of these (or at the start) begins a regex literal, not a division
+_REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+
+
+def minify_js(source):
+    """Drop comments, indentation and blank lines
+
+    Conservative on purpose: line breaks are kept so automatic semicolon
+    insertion behaves exactly as in the source, and strings, template
+    literals and regex literals are copied verbatim.
+    """
+    out = []
+    i = 0
+    n = len(source)
+    last_significant = ''
+    while i < n:
+        c = source[i]
+        nxt = source[i + 1] if i + 1 < n else ''
+        if c in '"\'`':
+            end = i + 1
+            while end < n and source[end] != c:
+                end += 2 if source[end] == '\\' else 1
+            out.append(source[i:end + 1])
+            i = end + 1
+            last_significant = c
+        elif c == '/' and nxt == '/':
+            while i < n and source[i] != '\n':
+                i += 1
+        elif c == '/' and nxt == '*':
+            end = source.find('*/', i + 2)
+            i = n if end < 0 else end + 2
+            out.append(' ')
+        elif c == '/' and (not last_significant or last_significant in _REGEX_PRECEDERS):
+            end = i + 1
+            in_class = False
+            while end < n and (in_class or source[end] != '/') and source[end] != '\n':
+                if source[end] == '\\':
+                    end += 1
+                elif source[end] == '[':
+                    in_class = True
+                elif source[end] == ']':
+                    in_class = False
+                end += 1
+            out.append(source[i:end + 1])
+            i = end + 1
+            last_significant = '/'
+        else:
+            out.append(c)
+            if not c.isspace():
+                last_significant = c
+            i += 1
+
+    lines = (line.strip() for line in ''.join(out).split('\n'))
+    return '\n'.join(line for line in lines if line) + '\n'
+
+
+def minify_css(source):
+    """Drop comments and collapse whitespace around punctuation"""
+    source = re.sub(r'/\*.*?\*/', '', source, flags=re.S)
+    source = re.sub(r'\s+', ' ', source)
+    # Not around ':' on its left, which is significant in selectors ("a :hover")
+    source = re.sub(r'\s*([{};,>])\s*', r'\1', source)
+    source = re.sub(r':\s+', ':', source)
+    source = source.replace(';}', '}')
+    return source.strip() + '\n'
+
+
+MINIFIERS = {'.js': minify_js, '.css': minify_css}
+
+
+def _write(path, data):
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def build(static_dir=STATIC_DIR, dist_dir=DIST_DIR):
+    """Build every bundle; returns the manifest"""
+    os.makedirs(dist_dir, exist_ok=True)
+    manifest = {'bundles': {}, 'sources': {}}
+    keep = {MANIFEST_NAME}
+
+    for bundle, sources in ASSET_BUNDLES.items():
+        stem, ext = os.path.splitext(bundle)
+        parts = []
+        for rel in sources:
+            with open(os.path.join(static_dir, rel), encoding='utf-8') as f:
+                parts.append(f.read())
+            manifest['sources'][rel] = os.path.getmtime(os.path.join(static_dir, rel))
+        body = MINIFIERS[ext]('\n'.join(parts)).encode('utf-8')
+
+        digest = hashlib.sha256(body).hexdigest()[:12]
+        name = f'{stem}.{digest}{ext}'
+        path = os.path.join(dist_dir, name)
+        _write(path, body)
+        _write(path + '.gz', gzip.compress(body, compresslevel=9, mtime=0))
+        keep.update((name, name + '.gz'))
+        if brotli is not None:
+            _write(path + '.br', brotli.compress(body, quality=11))
+            keep.add(name + '.br')
+        manifest['bundles'][bundle] = name
+
+    # Drop bundles from previous builds
+    for old in os.listdir(dist_dir):
+        if old not in keep:
+            os.remove(os.path.join(dist_dir, old))
+
+    with open(os.path.join(dist_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def main():
+    manifest = build()
+    for bundle, name in manifest['bundles'].items():
+        source_bytes = sum(os.path.getsize(os.path.join(STATIC_DIR, rel)) for rel in ASSET_BUNDLES[bundle])
+        path = os.path.join(DIST_DIR, name)
+        sizes = [f"{os.path.getsize(path):,} B"]
+        for suffix in ('.gz', '.br'):
+            if os.path.exists(path + suffix):
+                sizes.append(f"{suffix[1:]} {os.path.getsize(path + suffix):,} B")
+        print(f"{bundle:<9} -> dist/{name}: {source_bytes:,} B source, {', '.join(sizes)}")
+    if brotli is None:
+        print("(install the 'brotli' module to also write .br variants)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Negotiated gzip for API responses
+
+Buffered JSON, HTML and text responses of at least
+Config.RESPONSE_GZIP_MIN_SIZE bytes are gzipped when the client accepts it,
+at Config.RESPONSE_GZIP_LEVEL (level 1 by default: nearly the ratio of the
+default level 6 on JSON at a fraction of the CPU time). Responses that are
+already encoded (shared payloads, precompressed bundles), streamed (exports,
+routes) or served from files are left alone.
+"""
+
+import gzip
+from flask import request
+from config import Config
+
+COMPRESSIBLE_MIMETYPES = {'application/json', 'text/html', 'text/plain', 'text/css',
+                          'text/javascript', 'application/javascript'}
+
+
+def _should_compress(response):
+    if (response.status_code < 200 or response.status_code == 204
+            or response.status_code == 304
+            or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return False
+    length = response.content_length
+    return length is not None and length >= Config.RESPONSE_GZIP_MIN_SIZE
+
+
+def compress_response(response):
+    """after_request hook: gzip the body if worthwhile and accepted"""
+    if not _should_compress(response):
+        return response
+    response.vary.add('Accept-Encoding')
+    if not request.accept_encodings['gzip']:
+        return response
+    response.set_data(gzip.compress(response.get_data(), compresslevel=Config.RESPONSE_GZIP_LEVEL, mtime=0))
+    response.headers['Content-Encoding'] = 'gzip'
+    if response.headers.get('ETag'):
+        # A different representation of the same resource
+        response.set_etag(response.get_etag()[0], weak=True)
+    return response
+
+
+def init_compression(app):
+    """Register the gzip hook on `app` (unless disabled by ETS2_RESPONSE_GZIP)"""
+    if Config.RESPONSE_GZIP:
+        app.after_request(compress_response)
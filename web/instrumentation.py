@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Per-route request latency and response size for /metrics, and a trace
+span per request for /api/debug/trace
+
+Routes are labelled by their URL rule (e.g. /api/stations/<country>), so
+the number of series stays bounded however clients fill in the URLs.
+"""
+
+from time import perf_counter_ns
+from flask import g, request
+from utils.metrics import REGISTRY, SIZE_BUCKETS
+from utils.tracing import TRACER
+
+REQUEST_SECONDS = REGISTRY.histogram(
+    'ets2_http_request_seconds', 'Time from routing a request to its response being ready',
+    labelnames=('route',))
+RESPONSE_BYTES = REGISTRY.histogram(
+    'ets2_http_response_bytes', 'Response body size as sent (after compression)',
+    SIZE_BUCKETS, labelnames=('route',))
+
+
+def _start_timer():
+    g.request_start_ns = perf_counter_ns()
+
+
+def _record(response):
+    start = g.pop('request_start_ns', None)
+    if start is None:
+        return response
+    end = perf_counter_ns()
+    route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+    REQUEST_SECONDS.labels(route).observe_ns(end - start)
+    TRACER.record(TRACER.name(f'{request.method} {route}', 'http'), start, end)
+    length = response.content_length
+    if length is not None:
+        RESPONSE_BYTES.labels(route).observe(length)
+    return response
+
+
+def init_instrumentation(app):
+    """Register the timing hooks on `app`
+
+    Call before registering other after_request hooks (Flask runs them in
+    reverse order), so the figures include their work, e.g. compression.
+    """
+    app.before_request(_start_timer)
+    app.after_request(_record)
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Flask JSON provider backed by utils.json_helpers (orjson when installed)
+
+jsonify() and request.get_json() go through the app's JSON provider, so
+installing this one moves every API route to the fast encoder. Output is
+compact and keys keep their insertion order; debug mode keeps Flask's
+indented output.
+"""
+
+from flask.json.provider import DefaultJSONProvider
+from utils.json_helpers import dumps, dumps_str, loads
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """DefaultJSONProvider with the encoding done by utils.json_helpers"""
+
+    sort_keys = False
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return dumps_str(obj, self.default)
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        if self._app.debug:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        # Encode straight to bytes, skipping the str round trip
+        return self._app.response_class(dumps(obj, self.default), mimetype=self.mimetype)
@@ -3,13 +3,65 @@
 Flask API routes for ETS2 Truck Companion web interface
 """
 
-from flask import Blueprint, jsonify, request, render_template
+import time
+from flask import Blueprint, Response, jsonify, request, render_template
+from config import Config
+from core.poll_policy import POLL_POLICY
+from core.telemetry_history import DOWNSAMPLERS
+from core.payload_cache import PayloadCache
+from data.settings import DEFAULTS as DEFAULT_SETTINGS, SettingsError
+from data.travel_export import EXPORT_TABLES, ExportError, iter_export, validate_export
+from data.travel_heatmap import HeatmapError, validate_heatmap
+from data.travel_log import EMPTY_STATS
+from utils.metrics import REGISTRY
+from utils.profiler import MONITOR_PROFILER, SAMPLER, ProfilerBusy
+from utils.tracing import TRACER
+
+
+def _payload_response(payload):
+    """Serve a shared SerializedPayload, reusing its (gzipped) bytes"""
+    if request.if_none_match.contains(payload.etag.strip('"')):
+        response = Response(status=304)
+    elif request.accept_encodings['gzip']:
+        response = Response(payload.gzip_body(), mimetype='application/json')
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = Response(payload.body, mimetype='application/json')
+    response.headers['ETag'] = payload.etag
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+def _page_limit(default):
+    """Page size from ?limit=, clamped to Config.MAX_PAGE_SIZE"""
+    limit = request.args.get('limit', default=default, type=int)
+    return max(1, min(limit, Config.MAX_PAGE_SIZE))
+
+
+def _iter_route(route, chunk=1000):
+    """Stream a simplified route as JSON, `chunk` vertices at a time"""
+    yield (f'{{"session":{route["session"]},"tolerance":{route["tolerance"]},'
+           f'"raw_points":{route["raw_points"]},"points":[')
+    points = route['points']
+    for start in range(0, len(points), chunk):
+        body = ','.join(f'[{t:.1f},{x:.1f},{z:.1f}]' for t, x, z in points[start:start + chunk])
+        yield body if start == 0 else ',' + body
+    yield ']}'
 
 
 def create_routes(radio_controller):
     """Create Flask routes with radio controller dependency"""
 
     routes = Blueprint('radio_routes', __name__)
+    travel_caches = {}  # (TravelLog, view...) -> PayloadCache keyed on its write_seq
+
+    def _travel_payload(travel_log, key, builder):
+        """Serve a travel log view, rebuilt only after new writes"""
+        cache = travel_caches.get((travel_log, *key))
+        if cache is None:
+            cache = travel_caches.setdefault((travel_log, *key), PayloadCache(builder))
+        return _payload_response(cache.get(travel_log.write_seq))
 
     # ---- Pages ----
 
@@ -21,7 +73,8 @@ def create_routes(radio_controller):
 
     @routes.route('/api/status')
     def get_status():
-        return jsonify(radio_controller.get_status())
+        POLL_POLICY.note_viewer()
+        return _payload_response(radio_controller.get_status_payload())
 
     @routes.route('/api/stations/<country>')
     def get_stations(country):
@@ -61,61 +114,205 @@ def create_routes(radio_controller):
     @routes.route('/api/telemetry')
     def get_telemetry():
         """Full truck state"""
-        status = radio_controller.get_status()
-        return jsonify({
-            'truck': status.get('truck', {}),
-            'job': status.get('job', {}),
-            'damage': status.get('damage', {}),
-            'coordinates': status.get('coordinates'),
-            'signal_strength': status.get('signal_strength', 0),
-        })
+        POLL_POLICY.note_viewer()
+        return _payload_response(radio_controller.get_telemetry_payload())
+
+    @routes.route('/api/telemetry/delta')
+    def get_telemetry_delta():
+        """Telemetry fields changed since a revision"""
+        POLL_POLICY.note_viewer()
+        since = request.args.get('since', default='')
+        return jsonify(radio_controller.get_telemetry_delta(since))
+
+    @routes.route('/api/telemetry/history')
+    def get_telemetry_history():
+        """Recent telemetry channels downsampled to ?points= per channel"""
+        args = request.args
+        channels = [c for c in args.get('channels', '').split(',') if c]
+        method = args.get('method', 'lttb')
+        if method not in DOWNSAMPLERS:
+            return jsonify({'status': 'error', 'message': f"Unknown method: {method}"}), 400
+        points = args.get('points', default=300, type=int)
+        points = max(3, min(points, Config.TELEMETRY_HISTORY_MAX_POINTS))
+        seconds = args.get('seconds', type=float)
+        since = time.time() - seconds if seconds else None
+        try:
+            return jsonify(radio_controller.get_telemetry_history(channels, points, since, method))
+        except KeyError as e:
+            return jsonify({'status': 'error', 'message': f"Unknown channel(s): {e.args[0]}"}), 400
 
     @routes.route('/api/alerts')
     def get_alerts():
-        """Consume pending alerts"""
-        return jsonify(radio_controller.consume_alerts())
+        """Alerts newer than the client's cursor"""
+        after = request.args.get('after', default=0, type=int)
+        return jsonify(radio_controller.get_alerts_after(after))
 
     @routes.route('/api/travel/stats')
     def get_travel_stats():
         if radio_controller.travel_log:
             return jsonify(radio_controller.travel_log.get_stats())
-        return jsonify({
-            'total_distance': 0, 'cities_visited': 0,
-            'jobs_completed': 0, 'total_income': 0, 'total_fines': 0
-        })
+        return jsonify(EMPTY_STATS)
 
     @routes.route('/api/travel/recent')
     def get_travel_recent():
+        """Visits newest first; page with ?before=<last id>"""
         if radio_controller.travel_log:
-            return jsonify(radio_controller.travel_log.get_recent_visits())
+            args = request.args
+            return jsonify(radio_controller.travel_log.get_recent_visits(
+                limit=_page_limit(50),
+                before=args.get('before', type=int),
+                country=args.get('country'),
+                city=args.get('city'),
+                from_ts=args.get('from', type=float),
+                to_ts=args.get('to', type=float),
+            ))
         return jsonify([])
 
     @routes.route('/api/travel/jobs')
     def get_travel_jobs():
+        """Completed jobs newest first; page with ?before=<last id>"""
         if radio_controller.travel_log:
-            return jsonify(radio_controller.travel_log.get_job_history())
+            args = request.args
+            return jsonify(radio_controller.travel_log.get_job_history(
+                limit=_page_limit(20),
+                before=args.get('before', type=int),
+                city=args.get('city'),
+                cargo=args.get('cargo'),
+                from_ts=args.get('from', type=float),
+                to_ts=args.get('to', type=float),
+            ))
         return jsonify([])
 
+    @routes.route('/api/travel/analytics')
+    def get_travel_analytics():
+        """Income, distance, damage and fines per country, cargo, company and week"""
+        travel_log = radio_controller.travel_log
+        if not travel_log:
+            return jsonify({'countries': [], 'cargo': [], 'companies': [], 'weeks': []})
+        return _travel_payload(travel_log, ('analytics',), travel_log.get_analytics)
+
+    @routes.route('/api/travel/heatmap')
+    def get_travel_heatmap():
+        """Visit (or breadcrumb) counts per grid cell at ?zoom=0..N-1"""
+        source = request.args.get('source', 'visits')
+        zoom = request.args.get('zoom', default=Config.HEATMAP_ZOOM_LEVELS - 1, type=int)
+        try:
+            validate_heatmap(source, zoom)
+        except HeatmapError as e:
+            return jsonify({'status': 'error', 'message': str(e)}), 400
+        travel_log = radio_controller.travel_log
+        if not travel_log:
+            return jsonify({'source': source, 'zoom': zoom, 'cell': 0, 'max': 0, 'cells': []})
+        return _travel_payload(travel_log, ('heatmap', source, zoom),
+                               lambda: travel_log.get_heatmap(source, zoom))
+
+    @routes.route('/api/travel/route')
+    def get_travel_route():
+        """Simplified route of ?session= (default: latest) for map ?zoom=0..N-1"""
+        zoom = request.args.get('zoom', default=Config.HEATMAP_ZOOM_LEVELS - 1, type=int)
+        if not 0 <= zoom < Config.HEATMAP_ZOOM_LEVELS:
+            return jsonify({'status': 'error',
+                            'message': f"Zoom must be between 0 and {Config.HEATMAP_ZOOM_LEVELS - 1}"}), 400
+        route = None
+        if radio_controller.travel_log:
+            tolerance = Config.ROUTE_TOLERANCE * 2 ** (Config.HEATMAP_ZOOM_LEVELS - 1 - zoom)
+            route = radio_controller.travel_log.get_route(
+                request.args.get('session', type=int), tolerance)
+        if route is None:
+            return jsonify({'status': 'error', 'message': 'Session not found'}), 404
+        return Response(_iter_route(route), mimetype='application/json')
+
+    @routes.route('/api/travel/track')
+    def get_travel_track():
+        """Breadcrumb track points [t, x, z] between two timestamps (default: last hour)"""
+        now = time.time()
+        to_ts = request.args.get('to', default=now, type=float)
+        from_ts = request.args.get('from', default=to_ts - 3600, type=float)
+        points = []
+        if radio_controller.travel_log:
+            points = radio_controller.travel_log.get_track(from_ts, to_ts)
+        return jsonify({'from': from_ts, 'to': to_ts, 'points': points})
+
+    @routes.route('/api/travel/export')
+    def export_travel_log():
+        """Stream the travel log as NDJSON (any tables) or CSV (one table)"""
+        if not radio_controller.travel_log:
+            return jsonify({'status': 'error', 'message': 'Travel log not available'}), 404
+        fmt = request.args.get('format', 'ndjson')
+        tables = [t for t in request.args.get('tables', '').split(',') if t]
+        try:
+            tables = validate_export(tables, fmt)
+        except ExportError as e:
+            return jsonify({'status': 'error', 'message': str(e)}), 400
+
+        mimetype = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+        name = 'all' if set(tables) == set(EXPORT_TABLES) else '-'.join(tables)
+        filename = f"travel_log-{name}.{fmt}"
+        return Response(
+            iter_export(radio_controller.travel_log, tables, fmt),
+            mimetype=mimetype,
+            headers={'Content-Disposition': f'attachment; filename="{filename}"'},
+        )
+
+    @routes.route('/api/travel/db')
+    def get_travel_db():
+        """Travel log writer queue depth and read pool counters"""
+        if radio_controller.travel_log:
+            return jsonify(radio_controller.travel_log.get_db_stats())
+        return jsonify({})
+
+    @routes.route('/api/debug/trace')
+    def debug_trace():
+        """Buffered spans (optionally the last ?seconds=) as Chrome trace JSON for Perfetto"""
+        seconds = request.args.get('seconds', type=float)
+        return Response(
+            TRACER.dump(seconds),
+            mimetype='application/json',
+            headers={'Content-Disposition': f'attachment; filename="ets2-trace-{int(time.time())}.json"'},
+        )
+
+    @routes.route('/metrics')
+    def get_metrics():
+        """Hot-path counters and histograms in the Prometheus text format"""
+        return Response(REGISTRY.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+    @routes.route('/api/debug/profile')
+    def debug_profile():
+        """Profile for ?seconds=: mode=sample (all threads, collapsed stacks) or cprofile (monitor tick)"""
+        if not Config.PROFILING_ENABLED:
+            return jsonify({'status': 'error', 'message': 'Profiling is disabled (set ETS2_PROFILING=true)'}), 404
+        mode = request.args.get('mode', 'sample')
+        if mode not in ('sample', 'cprofile'):
+            return jsonify({'status': 'error', 'message': f"Unknown mode: {mode}"}), 400
+        seconds = request.args.get('seconds', default=5.0, type=float)
+        seconds = max(0.1, min(seconds, Config.PROFILE_MAX_SECONDS))
+        headers = {}
+        try:
+            if mode == 'cprofile':
+                body = MONITOR_PROFILER.capture(seconds)
+            else:
+                hz = request.args.get('hz', default=Config.PROFILE_SAMPLE_HZ, type=float)
+                body, samples = SAMPLER.capture(seconds, max(1.0, min(hz, Config.PROFILE_MAX_SAMPLE_HZ)))
+                headers['X-Profile-Samples'] = str(samples)
+        except ProfilerBusy as e:
+            return jsonify({'status': 'error', 'message': str(e)}), 409
+        return Response(body, mimetype='text/plain', headers=headers)
+
     @routes.route('/api/settings', methods=['GET', 'POST'])
     def handle_settings():
         if not radio_controller.settings_manager:
             # Return defaults if no settings manager
-            defaults = {
-                'audio_alerts_enabled': False,
-                'static_interference_enabled': True,
-                'auto_switch_enabled': True,
-                'gamepad_enabled': True,
-                'dashboard_visible': True,
-                'alert_cooldown_seconds': 60,
-            }
             if request.method == 'POST':
                 return jsonify({'status': 'success'})
-            return jsonify(defaults)
+            return jsonify(DEFAULT_SETTINGS)
 
         if request.method == 'POST':
             data = request.get_json()
             if data:
-                radio_controller.settings_manager.update(data)
+                try:
+                    radio_controller.settings_manager.update(data)
+                except SettingsError as e:
+                    return jsonify({'status': 'error', 'message': str(e)}), 400
                 return jsonify({'status': 'success'})
             return jsonify({'status': 'error', 'message': 'Invalid data'}), 400
 
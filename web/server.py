@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+WSGI serving modes for ETS2 Truck Companion
+
+'dev' is Flask's development server. 'production' uses waitress (a
+multi-threaded server with HTTP/1.1 keep-alive) when it is installed, and
+otherwise a werkzeug server that handles connections on a fixed thread
+pool without per-request logging. werkzeug always closes the connection
+after a response, so keep-alive needs waitress.
+
+Both production servers stop on KeyboardInterrupt (SIGINT, or SIGTERM as
+translated by main.py), finish in-flight requests and return, so the
+caller can stop the monitor and clean up afterwards.
+"""
+
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+from config import Config
+
+try:
+    import waitress
+except ImportError:
+    waitress = None
+
+SERVER_MODES = ('dev', 'production')
+
+
+class _QuietHandler(WSGIRequestHandler):
+    """HTTP/1.1 (chunked streaming) handler that only logs errors"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        # A slow or silent client gives its pool thread back after this
+        self.timeout = Config.SERVER_IDLE_TIMEOUT
+        super().setup()
+
+    def log_request(self, code='-', size='-'):
+        pass
+
+
+class ThreadPoolWSGIServer(BaseWSGIServer):
+    """werkzeug server running each connection on a bounded thread pool
+
+    The dev server starts a new thread per connection without limit; here
+    at most `threads` connections are served at once and the rest wait in
+    the listen backlog.
+    """
+
+    multithread = True
+    request_queue_size = 128
+
+    def __init__(self, host, port, app, threads=None):
+        super().__init__(host, port, app, handler=_QuietHandler)
+        self.threads = threads or Config.SERVER_THREADS
+        self._pool = ThreadPoolExecutor(self.threads, thread_name_prefix='http')
+        self._connections = set()
+        self._connections_lock = threading.Lock()
+
+    def process_request(self, request, client_address):
+        with self._connections_lock:
+            self._connections.add(request)
+        self._pool.submit(self._process_request_worker, request, client_address)
+
+    def _process_request_worker(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            with self._connections_lock:
+                self._connections.discard(request)
+            self.shutdown_request(request)
+
+    def serve_forever(self, poll_interval=0.5):
+        try:
+            super().serve_forever(poll_interval)
+        finally:
+            self.drain()
+
+    def drain(self):
+        """Wake handlers still waiting on a request and let in-flight ones finish"""
+        with self._connections_lock:
+            connections = list(self._connections)
+        for conn in connections:
+            # Unblocks a handler reading from a silent client; a response
+            # being written is unaffected
+            try:
+                conn.shutdown(socket.SHUT_RD)
+            except OSError:
+                pass
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _serve_waitress(app, host, port):
+    print(f"Serving on http://{host}:{port} (waitress, {Config.SERVER_THREADS} threads)")
+    server = waitress.create_server(
+        app, host=host, port=port,
+        threads=Config.SERVER_THREADS,
+        channel_timeout=Config.SERVER_IDLE_TIMEOUT,
+        connection_limit=Config.SERVER_CONNECTION_LIMIT,
+    )
+    # run() shuts the task threads down on KeyboardInterrupt/SystemExit
+    server.run()
+
+
+def _serve_threadpool(app, host, port):
+    server = ThreadPoolWSGIServer(host, port, app)
+    print(f"Serving on http://{host}:{port} (thread pool, {server.threads} threads)")
+    server.serve_forever()
+
+
+def serve(app, host=None, port=None, mode=None):
+    """Run `app` until interrupted, using the configured serving mode"""
+    host = host or Config.HOST
+    port = port or Config.PORT
+    mode = mode or Config.SERVER_MODE
+    if mode not in SERVER_MODES:
+        print(f"⚠️ Unknown server mode '{mode}', using production")
+        mode = 'production'
+
+    if mode == 'dev' or Config.DEBUG:
+        app.run(host=host, port=port, debug=Config.DEBUG, use_reloader=False)
+        return
+    if waitress is not None:
+        _serve_waitress(app, host, port)
+    else:
+        _serve_threadpool(app, host, port)
@@ -11,6 +11,8 @@ const ETS2App = (function() {
     let updateInterval = null;
     let hlsInstance = null;
     let lastSuggestedStation = null;
+    let lastAlertSeq = null;
+    let alertFetchPending = false;
     let autoSwitchEnabled = true;
     let settings = {};
 
@@ -103,15 +105,18 @@ const ETS2App = (function() {
                     ETS2Audio.updateSignal(data.signal_strength || 0);
                 }
 
-                // Process alerts from backend
-                if (data.alerts && data.alerts.length > 0) {
-                    // Consume alerts
-                    fetch('/api/alerts').then(r => r.json()).then(alerts => {
-                        alerts.forEach(a => showAlert(a));
+                // Process alerts from backend (only those newer than our cursor)
+                if (lastAlertSeq === null) {
+                    lastAlertSeq = data.alert_seq || 0;
+                } else if (data.alert_seq !== lastAlertSeq && !alertFetchPending) {
+                    alertFetchPending = true;
+                    fetch('/api/alerts?after=' + lastAlertSeq).then(r => r.json()).then(result => {
+                        lastAlertSeq = result.last_seq;
+                        result.alerts.forEach(a => showAlert(a));
                         if (typeof ETS2Audio !== 'undefined') {
-                            alerts.forEach(a => ETS2Audio.playAlertTone(a.type));
+                            result.alerts.forEach(a => ETS2Audio.playAlertTone(a.type));
                         }
-                    });
+                    }).catch(() => {}).finally(() => { alertFetchPending = false; });
                 }
 
                 // Auto-switching
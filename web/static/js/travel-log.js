@@ -15,7 +15,9 @@ const ETS2TravelLog = (function() {
         fetch('/api/travel/stats')
             .then(r => r.json())
             .then(data => {
-                setText('stat-distance', Math.round(data.total_distance || 0).toLocaleString());
+                // Odometer-measured distance; planned job distance for logs recorded before it existed
+                const distance = data.driven_distance || data.total_distance || 0;
+                setText('stat-distance', Math.round(distance).toLocaleString());
                 setText('stat-cities', data.cities_visited || 0);
                 setText('stat-jobs', data.jobs_completed || 0);
                 setText('stat-income', (data.total_income || 0).toLocaleString());